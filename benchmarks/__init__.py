@@ -0,0 +1 @@
+"""Benchmarks for the LIMS client and stand-in; run each with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,98 @@
+"""Per-delete cost of ``DELETE /samples/{n}?mode=cascade``: reverse indexes vs. scanning every collection.
+
+    python -m benchmarks.cascade [--sizes 1000,10000,100000] [--deletes 200]
+
+Fills a fresh store per size with samples that each have one analysis,
+result and trial, then cascades deletes of random samples through
+:meth:`Store.delete` (which follows the reverse references) and through a
+scan of every dependent collection. The indexed cost should not grow with
+the store; the scan grows linearly.
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from lims.standin.store import CASCADE, Store
+
+
+def fill(size: int) -> Store:
+    store = Store()
+    client_code = store.create_client({"name": "ACME"})["client_code"]
+    id_user = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})["id"]
+    for i in range(size):
+        sample = store.create_sample({
+            "client_code": client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": f"Muestra {i}",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1,
+        })
+        analysis = store.create_analysis({
+            "id_user": id_user,
+            "sample_number": sample["sample_number"],
+            "client_code": client_code,
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico",
+        })
+        result = store.create_result({
+            "analysis_number": analysis["analysis_number"],
+            "sample_number": sample["sample_number"],
+            "id_user": id_user,
+            "client_code": client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo",
+        })
+        store.create_trial({
+            "analysis_number": analysis["analysis_number"],
+            "sample_number": sample["sample_number"],
+            "result_number": result["result_number"],
+            "emission_date": "2025-12-19T10:00:00Z",
+        })
+    return store
+
+
+def scan_cascade(store: Store, sample_number: int) -> Dict[str, List[Any]]:
+    """The same cascade, finding each level's dependents by scanning the child collection."""
+    with store.locks.hold([("samples", sample_number)]):
+        analyses = [n for n, a in store.analysis.items() if a["sample_number"] == sample_number]
+        results = [n for n, r in store.results.items() if r["analysis_number"] in set(analyses)]
+        trials = [n for n, t in store.trials.items() if t["result_number"] in set(results)]
+        for number in trials:
+            store.delete_trial(number)
+        for number in results:
+            store.delete_result(number)
+        for number in analyses:
+            store.delete_analysis(number)
+        store.delete_sample(sample_number)
+    return {"analysis": analyses, "results": results, "trials": trials}
+
+
+def per_delete(store: Store, victims: List[int], delete: Callable[[int], Any]) -> float:
+    started = time.perf_counter()
+    for number in victims:
+        delete(number)
+    return (time.perf_counter() - started) / len(victims) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--deletes", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    print(f"{'samples':>8} {'rows':>8} {'indexed ms':>11} {'scan ms':>9}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        store = fill(size)
+        rows = sum(len(table) for table in (store.samples, store.analysis, store.results, store.trials))
+        victims = rng.sample(list(store.samples), min(2 * args.deletes, size))
+        indexed = per_delete(store, victims[::2], lambda number: store.delete("samples", number, CASCADE))
+        scanned = per_delete(store, victims[1::2], lambda number: scan_cascade(store, number))
+        print(f"{size:>8} {rows:>8} {indexed:>11.3f} {scanned:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
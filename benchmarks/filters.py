@@ -0,0 +1,86 @@
+"""Filtered ``/samples`` queries against store size: secondary indexes vs. a full scan.
+
+    python -m benchmarks.filters [--sizes 10000,100000,1000000] [--clients 1000] [--queries 200]
+
+Fills a fresh store per size, with samples spread evenly over ``--clients``
+clients and one entry date per minute, then times the same queries
+through :meth:`Store.query` (hash and sorted indexes) and through a scan of
+every record. The indexed times should stay nearly flat as the store
+grows (O(log n + k)); the scan grows linearly.
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from lims.standin.store import DateRange, Store, timestamp
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def fill(size: int, clients: int) -> Store:
+    store = Store()
+    codes = [store.create_client({"name": f"Cliente {i}"})["client_code"] for i in range(clients)]
+    for i in range(size):
+        entry = (START + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        store.create_sample({
+            "client_code": codes[i % clients],
+            "entry_date": entry,
+            "description": f"Muestra {i}",
+            "sampling_date": entry,
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1,
+        })
+    return store
+
+
+def scan(store: Store, equal: Dict[str, Any], ranges: Dict[str, DateRange]) -> List[Dict[str, Any]]:
+    return [
+        sample for sample in store.samples.values()
+        if all(sample[field] == value for field, value in equal.items())
+        and all(low <= timestamp(sample[field]) < high for field, (low, high) in ranges.items())
+    ]
+
+
+def timed(queries: List[Callable[[], List[Any]]]) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        query()
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'rows':>9} {'query':>12} {'matches':>8} {'indexed ms':>11} {'scan ms':>9}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        store = fill(size, args.clients)
+        codes = list(store.clients)
+        # A one-day window (1440 rows) and one client's samples, at random places.
+        windows = []
+        for _ in range(args.queries):
+            low = (START + timedelta(minutes=rng.randrange(size))).timestamp()
+            windows.append((rng.choice(codes), low, low + 86400))
+        cases = {
+            "client": lambda code, low, high: ({"client_code": code}, {}),
+            "date range": lambda code, low, high: ({}, {"entry_date": (low, high)}),
+            "both": lambda code, low, high: ({"client_code": code}, {"entry_date": (low, high)}),
+        }
+        for name, case in cases.items():
+            filters = [case(*window) for window in windows]
+            matches = sum(len(store.query("samples", *f)[0]) for f in filters) // len(filters)
+            indexed = timed([lambda f=f: store.query("samples", *f)[0] for f in filters])
+            # The scan is the same for every query; a few repetitions are enough.
+            scanned = timed([lambda f=f: scan(store, *f) for f in filters[:3]])
+            print(f"{size:>9} {name:>12} {matches:>8} {indexed:>11.3f} {scanned:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Retained memory of decoded sample records: plain dicts vs. :mod:`lims.models`.
+
+    python -m benchmarks.models [--sizes 10000,100000,1000000] [--clients 200]
+
+Records are decoded from a JSON body, as a client would receive them, so
+their string values are distinct objects just like in a real response. For
+each size the benchmark reports the memory still held once the list of
+records is built (the input body and any intermediate dicts released) and
+the time to convert to and from the model.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from lims.models import Sample
+
+
+def payload(n: int, clients: int) -> bytes:
+    return json.dumps({"data": [
+        {
+            "sample_number": i + 1,
+            "client_code": f"C-{i % clients + 1:03d}",
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": f"Muestra de agua {i % 1000}",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": i % 5 + 1,
+        }
+        for i in range(n)
+    ]}).encode()
+
+
+def as_dicts(body: bytes) -> List[Any]:
+    return json.loads(body)["data"]
+
+
+def as_models(body: bytes) -> List[Any]:
+    return Sample.from_json_many(json.loads(body)["data"])
+
+
+def retained(build: Callable[[bytes], List[Any]], body: bytes) -> Tuple[List[Any], float]:
+    """Build the records under tracemalloc and return them with the MiB still held."""
+    gc.collect()
+    tracemalloc.start()
+    records = build(body)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, current / 2 ** 20
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--clients", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'dict MiB':>10} {'model MiB':>10} {'ratio':>6} {'from_json s':>12} {'to_json s':>10}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        body = payload(n, args.clients)
+        dicts, dict_mib = retained(as_dicts, body)
+        models, model_mib = retained(as_models, body)
+        assert [model.to_json() for model in models[:100]] == dicts[:100]
+        from_json = timed(lambda: Sample.from_json_many(dicts))
+        to_json = timed(lambda: [model.to_json() for model in models])
+        print(
+            f"{n:>10} {dict_mib:>10.1f} {model_mib:>10.1f} {dict_mib / model_mib:>6.2f}"
+            f" {from_json:>12.3f} {to_json:>10.3f}"
+        )
+        del dicts, models
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Rejected calls and wall time of a ``/trials`` backfill against a quota: retries alone vs. :class:`RateLimiter`.
+
+    python -m benchmarks.ratelimit [--trials 400] [--quota 100] [--threads 8]
+
+Runs against the HTTP stand-in with a per-user quota of ``--quota``
+requests per second. Both modes retry 429s (honouring ``Retry-After``);
+``retry`` sends as fast as its threads allow and pays for every rejected
+call, ``limiter`` paces the same threads with a shared token bucket set
+to the quota.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from benchmarks.resolver import seed
+from lims import LimsClient
+from lims.ratelimit import RateLimiter
+from lims.retry import Retrier, RetryPolicy
+from lims.standin import LimsApp
+from lims.standin.quotas import Quotas
+from lims.standin.server import StandInServer
+
+
+def backfill(client: LimsClient, trials: List[Dict[str, Any]], threads: int) -> List[int]:
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(lambda trial: client.create_trial(trial).status_code, trials))
+
+
+def run(url: str, trials: List[Dict[str, Any]], threads: int, limiter: Optional[RateLimiter]) -> List[int]:
+    retrier = Retrier(RetryPolicy(max_attempts=20, statuses=(429, 503)))
+    with LimsClient(url, pool_maxsize=threads, retrier=retrier, ratelimiter=limiter) as client:
+        return backfill(client, trials, threads)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=400)
+    parser.add_argument("--quota", type=float, default=100.0)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    app = LimsApp()
+    rows = [
+        {key: trial[key] for key in ("analysis_number", "sample_number", "result_number", "emission_date")}
+        for trial in seed(app, args.trials, 50)
+    ]
+    print(f"{'mode':>8} {'requests':>9} {'429':>6} {'failed':>7} {'seconds':>8}")
+    with StandInServer(app) as server:
+        for mode in ("retry", "limiter"):
+            app.quotas = Quotas(rate=args.quota, burst=args.quota / 10)
+            limiter = RateLimiter(rate=args.quota, burst=args.quota / 10) if mode == "limiter" else None
+            started = time.perf_counter()
+            statuses = run(server.url, rows, args.threads, limiter)
+            elapsed = time.perf_counter() - started
+            rejected = sum(app.quotas.rejected.values())
+            failed = sum(status != 201 for status in statuses)
+            print(f"{mode:>8} {app.quotas.admitted + rejected:>9} {rejected:>6} {failed:>7} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
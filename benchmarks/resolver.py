@@ -0,0 +1,123 @@
+"""Requests and wall time to hydrate a list of trials: per-row fetches vs. :class:`TrialResolver`.
+
+    python -m benchmarks.resolver [--trials 500] [--samples 50] [--latency-ms 2] [--concurrency 16]
+
+Runs against the HTTP stand-in. ``--latency-ms`` adds a fixed server-side
+delay to every request to stand in for the network round trip, which is
+what the per-row approach pays for once per reference.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from lims import LimsClient
+from lims.aio import AsyncLimsClient
+from lims.resolver import TrialResolver
+from lims.standin import LimsApp
+from lims.standin.server import StandInServer
+
+
+class DelayedApp(LimsApp):
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+        self.requests = 0
+
+    def handle(self, *args, **kwargs):
+        self.requests += 1
+        time.sleep(self.latency)
+        return super().handle(*args, **kwargs)
+
+
+def seed(app: LimsApp, trials: int, samples: int) -> List[Dict[str, Any]]:
+    """``trials`` trials spread over ``samples`` samples, each with one analysis and result."""
+    store = app.store
+    users = [
+        store.create_user({"name": f"Analista {i}", "username": f"analista{i}", "password": "pw", "roles": ["lab"]})
+        for i in range(5)
+    ]
+    clients = [store.create_client({"name": f"Cliente {i}"}) for i in range(10)]
+    results = []
+    for i in range(samples):
+        client_code = clients[i % len(clients)]["client_code"]
+        id_user = users[i % len(users)]["id"]
+        sample = store.create_sample({
+            "client_code": client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": f"Muestra {i}",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1,
+        })
+        analysis = store.create_analysis({
+            "id_user": id_user,
+            "sample_number": sample["sample_number"],
+            "client_code": client_code,
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico",
+        })
+        results.append(store.create_result({
+            "analysis_number": analysis["analysis_number"],
+            "sample_number": sample["sample_number"],
+            "id_user": id_user,
+            "client_code": client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo",
+        }))
+    return [
+        store.create_trial({
+            "analysis_number": result["analysis_number"],
+            "sample_number": result["sample_number"],
+            "result_number": result["result_number"],
+            "emission_date": "2025-12-19T10:00:00Z",
+        })
+        for result in (results[i % len(results)] for i in range(trials))
+    ]
+
+
+def naive(client: LimsClient, trials: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "trial": trial,
+            "analysis": client.get_analysis(trial["analysis_number"]).json(),
+            "sample": client.get_sample(trial["sample_number"]).json(),
+            "result": client.get_result(trial["result_number"]).json(),
+            "user": client.get_user(trial["id_user"]).json(),
+            "client": client.get_client(trial["client_code"]).json(),
+        }
+        for trial in trials
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    app = DelayedApp(args.latency_ms / 1000)
+    trials = seed(app, args.trials, args.samples)
+    print(f"{'mode':>10} {'requests':>9} {'seconds':>9}")
+    with StandInServer(app) as server:
+        client = LimsClient(server.url, pool_maxsize=args.concurrency)
+
+        app.requests = 0
+        started = time.perf_counter()
+        naive(client, trials)
+        print(f"{'per-row':>10} {app.requests:>9} {time.perf_counter() - started:>9.2f}")
+
+        aclient = AsyncLimsClient(client, concurrency=args.concurrency)
+        app.requests = 0
+        started = time.perf_counter()
+        resolved = asyncio.run(TrialResolver(aclient).resolve(trials))
+        print(f"{'resolver':>10} {app.requests:>9} {time.perf_counter() - started:>9.2f}")
+        assert all(None not in row for row in resolved)
+        aclient.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Peak memory of streaming vs. whole-body parsing of ``GET /results``.
+
+    python -m benchmarks.streaming [--sizes 10000,100000,1000000] [--baseline-max 100000]
+
+The body is produced lazily by the stand-in's list encoder from records that
+are generated on demand, so the numbers reflect the client-side parse only:
+:class:`~lims.streaming.DataStream` against ``json.loads`` of the joined
+body. The whole-body baseline is skipped above ``--baseline-max`` records.
+Times include generating the body, which dominates at every size.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Iterator, Sequence, Tuple
+
+from lims.standin.app import Listing, encode_listing
+from lims.streaming import DataStream
+
+CHUNK_SIZE = 64 * 1024
+
+
+class SyntheticResults(Sequence):
+    """``n`` result records, built only when sliced."""
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self.n))]
+        return self._record(index)
+
+    @staticmethod
+    def _record(i: int) -> dict:
+        return {
+            "result_number": i + 1,
+            "analysis_number": i + 1,
+            "sample_number": i // 3 + 1,
+            "id_user": i % 50 + 1,
+            "client_code": f"C-{i % 200:03d}",
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo",
+        }
+
+
+def body(n: int) -> Iterator[bytes]:
+    """The encoded list re-cut into fixed-size network-like chunks."""
+    pending = b""
+    for piece in encode_listing(Listing(SyntheticResults(n))):
+        pending += piece
+        while len(pending) >= CHUNK_SIZE:
+            yield pending[:CHUNK_SIZE]
+            pending = pending[CHUNK_SIZE:]
+    if pending:
+        yield pending
+
+
+def streamed(n: int) -> int:
+    return sum(1 for _ in DataStream(body(n)))
+
+
+def whole(n: int) -> int:
+    return len(json.loads(b"".join(body(n)))["data"])
+
+
+def measure(fn: Callable[[int], int], n: int) -> Tuple[int, float, float]:
+    """Return (records, peak MiB, seconds); timed on a separate run without tracemalloc."""
+    started = time.perf_counter()
+    count = fn(n)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    fn(n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak / 2 ** 20, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--baseline-max", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'mode':>10} {'peak MiB':>10} {'seconds':>9}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        modes = [("stream", streamed)] + ([("json", whole)] if n <= args.baseline_max else [])
+        for name, fn in modes:
+            count, peak, elapsed = measure(fn, n)
+            assert count == n
+            print(f"{n:>10} {name:>10} {peak:>10.2f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Client toolkit for the LIMS API exercised by the suites under ``tests/``."""
+
+from lims.aio import AsyncLimsClient
+from lims.auth import AuthenticationError, TokenProvider
+from lims.client import LimsClient
+
+__all__ = ["AsyncLimsClient", "AuthenticationError", "LimsClient", "TokenProvider"]
@@ -0,0 +1,94 @@
+"""Transport adapter that serves requests from an in-process stand-in.
+
+Mounted on a :class:`requests.Session`, :class:`InProcessAdapter` hands each
+prepared request straight to :meth:`LimsApp.handle` and wraps the reply in a
+regular :class:`requests.Response` whose raw stream is an in-memory buffer
+over the reply body (or, for streamed list replies, a reader that pulls the
+encoded chunks on demand). No socket, no HTTP serialisation, but the full
+``requests`` request/response pipeline (hooks, ``json()``, ``iter_content``)
+still applies.
+"""
+
+import io
+from typing import TYPE_CHECKING, Iterator, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from lims.standin.app import REASONS
+
+if TYPE_CHECKING:
+    from lims.standin.app import LimsApp
+
+
+class ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks, consumed lazily."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        super().__init__()
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._pending + b"".join(self._chunks)
+            self._pending = b""
+            return data
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self._pending = chunk
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+class InProcessAdapter(BaseAdapter):
+    def __init__(self, app: "LimsApp"):
+        super().__init__()
+        self.app = app
+
+    def send(self, request: requests.PreparedRequest, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        url = urlsplit(request.url)
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        try:
+            reply = self.app.handle(request.method, url.path, dict(parse_qsl(url.query)), request.headers, body)
+        except ConnectionResetError as exc:
+            raise requests.ConnectionError(exc, request=request)
+
+        response = requests.Response()
+        response.status_code = reply.status
+        response.reason = REASONS.get(reply.status, "")
+        response.headers = CaseInsensitiveDict(reply.headers)
+        if isinstance(reply.body, bytes):
+            response.raw = io.BytesIO(reply.body)
+        else:
+            response.raw = ChunkReader(iter(reply.body))
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def mount(session: requests.Session, app: "LimsApp", base_url: str) -> InProcessAdapter:
+    """Route every request under ``base_url`` on ``session`` into ``app``.
+
+    Also turns off ``trust_env`` on the session: with it on, ``requests``
+    re-reads the proxy and netrc settings from the environment on every call,
+    which costs more than the in-process dispatch itself.
+    """
+    session.trust_env = False
+    adapter = InProcessAdapter(app)
+    session.mount(base_url, adapter)
+    return adapter
@@ -0,0 +1,155 @@
+"""asyncio front end for :class:`~lims.client.LimsClient`.
+
+:class:`AsyncLimsClient` exposes every endpoint method of the synchronous
+client as a coroutine. Calls run on a private thread pool sized to
+``concurrency`` and share the wrapped client's connection pool, so the pool
+should hold at least ``concurrency`` connections per host.
+
+Each by-number resource also gets a fan-out helper, e.g.::
+
+    gathered = await aclient.samples.gather_many([1, 2, 3])
+    gathered.values   # records in input order, None where the lookup failed
+    gathered.errors   # {id: Outcome} for the failed ids
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import requests
+
+from lims.client import LimsClient
+from lims.singleflight import AsyncSingleFlight
+
+
+class Outcome(NamedTuple):
+    """Result of one lookup in a fan-out: ``data`` on success, else ``status``/``error``."""
+
+    id: Any
+    status: Optional[int]
+    data: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+
+class Gathered(NamedTuple):
+    outcomes: List[Outcome]
+
+    @property
+    def values(self) -> List[Any]:
+        return [outcome.data if outcome.ok else None for outcome in self.outcomes]
+
+    @property
+    def errors(self) -> Dict[Any, Outcome]:
+        return {outcome.id: outcome for outcome in self.outcomes if not outcome.ok}
+
+
+def _data(body: Any) -> Any:
+    return body["data"]
+
+
+def _bare(body: Any) -> Any:
+    return body
+
+
+def _first(body: Any) -> Any:
+    return body["data"][0]
+
+
+class Resource:
+    """Fan-out lookups of one resource by id through an :class:`AsyncLimsClient`."""
+
+    def __init__(self, aclient: "AsyncLimsClient", getter: str, unwrap: Callable[[Any], Any]):
+        self.aclient = aclient
+        self.getter = getter
+        self.unwrap = unwrap
+
+    async def get(self, key: Any) -> Outcome:
+        try:
+            response = await getattr(self.aclient, self.getter)(key)
+        except Exception as exc:
+            return Outcome(key, None, error=exc)
+        if not 200 <= response.status_code < 300:
+            return Outcome(key, response.status_code)
+        return Outcome(key, response.status_code, self.unwrap(response.json()))
+
+    async def gather_many(self, ids: Iterable[Any], limit: Optional[int] = None) -> Gathered:
+        """Fetch every id with at most ``limit`` (default: the client's concurrency) in flight.
+
+        Never raises for a single id: HTTP errors and exceptions are reported
+        in that id's :class:`Outcome`. Outcomes keep the order of ``ids``.
+        """
+        semaphore = asyncio.Semaphore(limit or self.aclient.concurrency)
+
+        async def bounded(key: Any) -> Outcome:
+            async with semaphore:
+                return await self.get(key)
+
+        return Gathered(list(await asyncio.gather(*(bounded(key) for key in ids))))
+
+
+class AsyncLimsClient:
+    """Coroutine wrappers over ``client``; see the module docstring.
+
+    With an :class:`~lims.singleflight.AsyncSingleFlight` as ``singleflight``,
+    concurrent identical ``get_*`` calls await a single executor job and
+    share its response.
+    """
+
+    def __init__(self, client: LimsClient, concurrency: int = 16, singleflight: Optional[AsyncSingleFlight] = None):
+        self.client = client
+        self.concurrency = concurrency
+        self.singleflight = singleflight
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="lims-aio")
+        self.users = Resource(self, "get_user", _bare)
+        self.clients = Resource(self, "get_client", _first)
+        self.samples = Resource(self, "get_sample", _data)
+        self.analysis = Resource(self, "get_analysis", _data)
+        self.results = Resource(self, "get_result", _data)
+        self.trials = Resource(self, "get_trial", _data)
+
+    async def call(self, fn: Callable[..., requests.Response], *args, **kwargs) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    async def __aenter__(self) -> "AsyncLimsClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Generators (``pages``) are left out: run on the loop, their fetches would block it.
+ENDPOINT_METHODS = [
+    name
+    for name, value in vars(LimsClient).items()
+    if callable(value)
+    and not inspect.isgeneratorfunction(value)
+    and not name.startswith(("_", "iter_"))
+    and name not in ("authenticate", "close")
+]
+
+
+def _coroutine(name: str):
+    async def method(self: AsyncLimsClient, *args, **kwargs) -> requests.Response:
+        fn = getattr(self.client, name)
+        if self.singleflight is not None and name.startswith("get_"):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return await self.singleflight.do(key, lambda: self.call(fn, *args, **kwargs))
+        return await self.call(fn, *args, **kwargs)
+
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = f"Coroutine version of :meth:`LimsClient.{name}`."
+    return method
+
+
+for _name in ENDPOINT_METHODS:
+    setattr(AsyncLimsClient, _name, _coroutine(_name))
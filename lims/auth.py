@@ -0,0 +1,146 @@
+"""Cached access tokens for the LIMS API.
+
+:class:`TokenProvider` logs in once, hands the same token to every caller
+and renews it on a background timer shortly before the ``expires_in``
+announced by ``/login`` elapses, so callers normally never wait for a login.
+"""
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from lims.client import LimsClient
+
+
+class AuthenticationError(Exception):
+    """``/login`` did not return a token."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"login failed with HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TokenProvider:
+    """Thread- and asyncio-safe bearer token cache with proactive refresh.
+
+    The token is renewed ``refresh_margin`` seconds before it expires (but
+    never earlier than half-way through its lifetime). Callers that find no
+    valid token queue up on one lock, so a burst of them triggers a single
+    ``/login``; the rest pick up the token it produced.
+    """
+
+    def __init__(
+        self,
+        client: "LimsClient",
+        username: str,
+        password: str,
+        refresh_margin: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.username = username
+        self.password = password
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._async_login: Optional[asyncio.Future] = None
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.logins = 0
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _valid_token(self) -> Optional[str]:
+        token = self._token
+        if token is not None and self.clock() < self._expires_at:
+            return token
+        return None
+
+    def get_token(self) -> str:
+        token = self._valid_token()
+        if token is None:
+            with self._lock:
+                token = self._valid_token()
+                if token is None:
+                    self._count("misses")
+                    return self._login()
+        self._count("hits")
+        return token
+
+    async def aget_token(self) -> str:
+        """Like :meth:`get_token`, without blocking the event loop on a login.
+
+        Tasks of one loop that miss together share a single executor call.
+        """
+        token = self._valid_token()
+        if token is not None:
+            self._count("hits")
+            return token
+        loop = asyncio.get_running_loop()
+        pending = self._async_login
+        if pending is None or pending.done() or pending.get_loop() is not loop:
+            pending = self._async_login = loop.run_in_executor(None, self.get_token)
+        return await asyncio.shield(pending)
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop the cached token (only if it is still ``token``, when given)."""
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0.0
+
+    def _login(self) -> str:
+        # Called with self._lock held.
+        started = self.clock()
+        response = self.client.login(self.username, self.password)
+        self._count("logins")
+        if response.status_code != 200:
+            raise AuthenticationError(response.status_code)
+        data = response.json()["data"]
+        expires_in = float(data["expires_in"])
+        self._token = data["access_token"]
+        self._expires_at = started + expires_in
+        self._schedule_refresh(max(expires_in - self.refresh_margin, expires_in / 2))
+        return self._token
+
+    def _schedule_refresh(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._closed:
+            return
+        self._timer = threading.Timer(delay, self._refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._count("refreshes")
+            try:
+                self._login()
+            except Exception:
+                # Leave the current token in place; callers log in on demand
+                # once it expires.
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses, "refreshes": self.refreshes, "logins": self.logins}
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
@@ -0,0 +1,120 @@
+"""Background auto-batching of creates through the ``:batch`` endpoints.
+
+:class:`BatchWriter` buffers submitted records and sends them as one
+request once ``max_batch`` are waiting or the oldest has waited
+``max_delay`` seconds, whichever comes first::
+
+    with BatchWriter(client.create_samples) as writer:
+        futures = [writer.submit(sample) for sample in samples]
+    outcomes = [future.result() for future in futures]
+
+Each :meth:`~BatchWriter.submit` returns a :class:`~concurrent.futures.Future`
+for that record's outcome, ``{"status": 201, "data": {...}}`` or
+``{"status": 400 | 409, "error": "..."}``. A batch that fails as a whole
+(transport error or non-2xx reply) fails every future in it with the
+exception; items a reply has no outcome for fail with :class:`RuntimeError`.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, List, Tuple
+
+import requests
+
+Pending = Tuple[Any, Future, float]
+
+
+class BatchWriter:
+    """Size- and time-bounded batching on a background thread; ``submit`` is thread-safe."""
+
+    def __init__(
+        self,
+        send: Callable[[List[Any]], requests.Response],
+        max_batch: int = 500,
+        max_delay: float = 0.05,
+    ):
+        self.send = send
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: List[Pending] = []
+        self._in_flight: List[Future] = []
+        self._cond = threading.Condition()
+        self._flushing = False
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+        self._thread = threading.Thread(target=self._run, name="lims-batch", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchWriter is closed")
+            self._pending.append((item, future, time.monotonic()))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        return future
+
+    def flush(self) -> None:
+        """Send everything submitted so far without waiting for ``max_delay``, and wait for it."""
+        with self._cond:
+            futures = [future for _, future, _ in self._pending] + self._in_flight
+            self._flushing = True
+            self._cond.notify()
+        wait(futures)
+
+    def close(self) -> None:
+        """Send what is still buffered and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._flushing = False
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = self._pending[0][2] + self.max_delay
+                while len(self._pending) < self.max_batch and not (self._closed or self._flushing):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+                self._in_flight = [future for _, future, _ in batch]
+            self._send(batch)
+            with self._cond:
+                self._in_flight = []
+
+    def _send(self, batch: List[Pending]) -> None:
+        # Futures cancelled while buffered are dropped from the request.
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            response = self.send([item for item, _, _ in batch])
+            response.raise_for_status()
+            outcomes: List[Dict[str, Any]] = response.json()["data"]
+        except Exception as exc:
+            for _, future, _ in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future, _), outcome in zip(batch, outcomes):
+            future.set_result(outcome)
+        # A short reply must not leave the rest of the batch waiting forever.
+        for _, future, _ in batch[len(outcomes):]:
+            future.set_exception(RuntimeError(f"batch reply has {len(outcomes)} outcomes for {len(batch)} items"))
@@ -0,0 +1,159 @@
+"""Per-endpoint circuit breakers.
+
+A :class:`CircuitBreaker` watches the outcomes of the last ``window`` calls
+to one route template. When at least ``minimum_calls`` have been seen and
+the share of failures (5xx replies, connection errors, timeouts) reaches
+``failure_rate_threshold``, or the share of calls slower than
+``slow_call_duration`` reaches ``slow_call_rate_threshold``, the circuit
+opens: calls fail immediately with :class:`CircuitOpenError` instead of
+tying up a worker on a backend that is not answering.
+
+After ``open_duration`` seconds the circuit goes half-open and lets
+``half_open_calls`` trial calls through. If they clear both thresholds it
+closes again; otherwise it re-opens for another ``open_duration``.
+
+:class:`CircuitBreakers` keeps one breaker per route template and plugs
+into :class:`~lims.client.LimsClient` as ``breakers``. Listeners added with
+:meth:`CircuitBreakers.on_transition` see every state change.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+Listener = Callable[[str, str, str], None]
+
+
+class CircuitOpenError(Exception):
+    """A call was rejected because the circuit for its route is open."""
+
+    def __init__(self, route: str, retry_in: float):
+        super().__init__(f"circuit for {route} is open, retry in {retry_in:.1f}s")
+        self.route = route
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        route: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 1.0,
+        slow_call_duration: float = 5.0,
+        window: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_calls: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        listeners: Optional[List[Listener]] = None,
+    ):
+        self.route = route
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self.listeners = listeners if listeners is not None else []
+        self.state = CLOSED
+        self.rejected = 0
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._permits = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._window.clear()
+        if state == OPEN:
+            self._opened_at = self.clock()
+        elif state == HALF_OPEN:
+            self._permits = self.half_open_calls
+        for listener in self.listeners:
+            listener(self.route, previous, state)
+
+    def _tripped(self) -> bool:
+        calls = len(self._window)
+        failures = sum(failed for failed, _ in self._window)
+        slow = sum(slow for _, slow in self._window)
+        return (
+            failures / calls >= self.failure_rate_threshold
+            or slow / calls >= self.slow_call_rate_threshold
+        )
+
+    def acquire(self) -> None:
+        """Admit a call or raise :class:`CircuitOpenError`."""
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.open_duration - self.clock()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.route, remaining)
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._permits <= 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.route, 0.0)
+                self._permits -= 1
+
+    def record(self, failed: bool, duration: float) -> None:
+        with self._lock:
+            self._window.append((failed, duration >= self.slow_call_duration))
+            if self.state == HALF_OPEN:
+                if len(self._window) >= self.half_open_calls:
+                    self._transition(OPEN if self._tripped() else CLOSED)
+            elif self.state == CLOSED and len(self._window) >= self.minimum_calls and self._tripped():
+                self._transition(OPEN)
+
+
+def _failed(response: requests.Response) -> bool:
+    return response.status_code >= 500
+
+
+class CircuitBreakers:
+    """One :class:`CircuitBreaker` per route template, created on first use with ``config``."""
+
+    def __init__(self, **config: Any):
+        self.config = config
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.listeners: List[Listener] = []
+        self._lock = threading.Lock()
+
+    def on_transition(self, listener: Listener) -> None:
+        """Call ``listener(route, old_state, new_state)`` on every state change."""
+        self.listeners.append(listener)
+
+    def get(self, route: str) -> CircuitBreaker:
+        breaker = self.breakers.get(route)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.get(route)
+                if breaker is None:
+                    breaker = self.breakers[route] = CircuitBreaker(route, listeners=self.listeners, **self.config)
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        return {route: breaker.state for route, breaker in self.breakers.items()}
+
+    def call(
+        self, send: Callable[..., requests.Response], method: str, route: str, path: str, **kwargs: Any
+    ) -> requests.Response:
+        """``send(method, route, path, **kwargs)`` guarded by ``route``'s breaker."""
+        breaker = self.get(route)
+        breaker.acquire()
+        started = breaker.clock()
+        try:
+            response = send(method, route, path, **kwargs)
+        except Exception:
+            breaker.record(True, breaker.clock() - started)
+            raise
+        breaker.record(_failed(response), breaker.clock() - started)
+        return response
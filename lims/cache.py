@@ -0,0 +1,291 @@
+"""Client-side caches of GET responses.
+
+:class:`EntityCache` keeps the last responses of ``GET /samples/{n}``,
+``GET /results/{n}`` and ``GET /trials/{n}`` keyed by route template and
+id, bounded both in entries (least recently used evicted first) and in age
+(``ttl``). It is write-through: a successful ``PATCH`` of a cached route
+replaces the entry with the record it returned and a ``DELETE`` evicts it.
+A ``404`` is kept as a negative entry for the shorter ``negative_ttl``, and a
+successful ``POST`` to the collection (or its ``:batch`` variant) drops any
+negative entry for the ids it created.
+
+:class:`ConditionalCache` instead revalidates on every call: it remembers
+the ``ETag`` and body of ``GET /clients`` and ``GET /client/{client_code}``
+per URL, sends ``If-None-Match`` and, on ``304 Not Modified``, replays the
+stored body, decoded once and reused from then on.
+
+Hits are served as :class:`CachedResponse` objects, fresh per hit, so
+callers keep the usual :class:`requests.Response` interface.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from lims import routes
+
+# Cached route template -> (collection route, primary key field).
+CACHED_ROUTES: Dict[str, Tuple[str, str]] = {
+    routes.SAMPLE: (routes.SAMPLES, "sample_number"),
+    routes.RESULT: (routes.RESULTS, "result_number"),
+    routes.TRIAL: (routes.TRIALS, "trial_number"),
+}
+_BY_COLLECTION = {collection: (route, field) for route, (collection, field) in CACHED_ROUTES.items()}
+# Stand-in table names, as listed in a cascading DELETE's ``cascaded`` report.
+_BY_TABLE = {collection.lstrip("/"): route for route, (collection, _) in CACHED_ROUTES.items()}
+_BATCHES = {
+    routes.SAMPLES_BATCH: (routes.SAMPLE, "sample_number"),
+    routes.RESULTS_BATCH: (routes.RESULT, "result_number"),
+}
+
+
+class DecodedResponse(requests.Response):
+    """A :class:`requests.Response` whose body has already been decoded.
+
+    :meth:`json` returns the ``decoded`` object itself, shared with the
+    cache that decoded it, so it must be treated as read-only.
+    """
+
+    decoded: Any = None
+
+    def json(self, **kwargs) -> Any:
+        if self.decoded is not None and not kwargs:
+            return self.decoded
+        return super().json(**kwargs)
+
+
+class CachedResponse(DecodedResponse):
+    """A :class:`requests.Response` rebuilt from a cache entry (``from_cache`` is ``True``)."""
+
+    from_cache = True
+
+
+def _rebuild(status: int, headers: Dict[str, str], content: bytes, url: str, decoded: Any = None) -> CachedResponse:
+    response = CachedResponse()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.encoding = "utf-8"
+    response.url = url
+    response.decoded = decoded
+    return response
+
+
+class _Entry(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    content: bytes
+    url: str
+    expires_at: float
+
+
+class EntityCache:
+    """Size- and TTL-bounded LRU of entity responses; safe to share across threads."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 30.0,
+        negative_ttl: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def caches(route: str) -> bool:
+        return route in CACHED_ROUTES
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def get(self, route: str, key: Any) -> Optional[CachedResponse]:
+        cache_key = (route, str(key))
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry.expires_at <= self.clock():
+                del self._entries[cache_key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            if entry.status == 404:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        return _rebuild(entry.status, entry.headers, entry.content, entry.url)
+
+    def put(self, route: str, key: Any, response: requests.Response) -> None:
+        """Store a ``200`` (for ``ttl``) or a ``404`` (for ``negative_ttl``); other statuses are ignored."""
+        if response.status_code == 200:
+            ttl = self.ttl
+        elif response.status_code == 404:
+            ttl = self.negative_ttl
+        else:
+            return
+        entry = _Entry(
+            response.status_code, dict(response.headers), response.content, response.url, self.clock() + ttl
+        )
+        cache_key = (route, str(key))
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, route: str, key: Any) -> None:
+        with self._lock:
+            if self._entries.pop((route, str(key)), None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def lookup(self, method: str, route: str, key: Any) -> Optional[CachedResponse]:
+        """The cached reply for a request, if it can be answered without a round trip."""
+        if method != "GET" or route not in CACHED_ROUTES:
+            return None
+        return self.get(route, key)
+
+    def observe(self, method: str, route: str, key: Any, response: requests.Response) -> None:
+        """Update the cache from the reply to a request that went to the server."""
+        if route in _BY_COLLECTION:
+            if method == "POST" and 200 <= response.status_code < 300:
+                item_route, field = _BY_COLLECTION[route]
+                data = response.json().get("data")
+                if isinstance(data, dict) and field in data:
+                    self.invalidate(item_route, data[field])
+            return
+        if route in _BATCHES:
+            if response.status_code == 200:
+                item_route, field = _BATCHES[route]
+                for outcome in response.json()["data"]:
+                    if outcome["status"] == 201:
+                        self.invalidate(item_route, outcome["data"][field])
+            return
+        if method == "DELETE" and response.status_code == 200:
+            self._invalidate_cascaded(response)
+        if route not in CACHED_ROUTES:
+            return
+        if method == "GET":
+            self.put(route, key, response)
+        elif method == "PATCH" and response.status_code == 200:
+            # PATCH answers with the updated record in the same shape as GET.
+            self.put(route, key, response)
+        elif method in ("PATCH", "DELETE"):
+            self.invalidate(route, key)
+
+    def _invalidate_cascaded(self, response: requests.Response) -> None:
+        """Drop the rows a ``?mode=cascade`` delete removed along with its target."""
+        body = response.json()
+        data = body.get("data") if isinstance(body, dict) else None
+        cascaded = body.get("cascaded") or (data.get("cascaded") if isinstance(data, dict) else None)
+        for table, keys in (cascaded or {}).items():
+            if table in _BY_TABLE:
+                for key in keys:
+                    self.invalidate(_BY_TABLE[table], key)
+
+
+class _Validated:
+    __slots__ = ("etag", "headers", "content", "url", "decoded")
+
+    def __init__(self, response: requests.Response, decoded: Any):
+        self.etag = response.headers["ETag"]
+        self.headers = dict(response.headers)
+        self.content = response.content
+        self.url = response.url
+        self.decoded = decoded
+
+
+class ConditionalCache:
+    """Per-URL ``ETag`` validators and bodies of the last ``200`` replies, LRU-bounded.
+
+    Every call still reaches the server; what a ``304`` saves is the body
+    transfer and the JSON decode, since bodies are parsed once, when their
+    ``200`` arrives.
+    """
+
+    routes = frozenset((routes.CLIENTS, routes.CLIENT))
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, Tuple], _Validated]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.modified = 0
+        self.decodes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def send(
+        self, send: Callable[..., requests.Response], method: str, route: str, path: str, **kwargs
+    ) -> requests.Response:
+        """Call ``send(method, route, path, **kwargs)`` as a conditional request when a validator is known."""
+        if method != "GET" or route not in self.routes or kwargs.get("stream"):
+            return send(method, route, path, **kwargs)
+        key = (path, tuple(sorted((kwargs.get("params") or {}).items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "If-None-Match": entry.etag}
+        response = send(method, route, path, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.not_modified += 1
+            return _rebuild(200, entry.headers, entry.content, entry.url, entry.decoded)
+        if response.status_code == 200 and "ETag" in response.headers:
+            try:
+                decoded = json.loads(response.content)
+            except ValueError:
+                return response
+            with self._lock:
+                self.modified += 1
+                self.decodes += 1
+                self._entries[key] = _Validated(response, decoded)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            # Hand the caller the same decoded body, so a cold fetch decodes once too.
+            response.__class__ = DecodedResponse
+            response.decoded = decoded
+        return response
@@ -0,0 +1,391 @@
+"""Synchronous client for the LIMS API.
+
+Every call goes through a single :class:`requests.Session` whose HTTP
+adapters keep a pool of keep-alive connections, so consecutive calls reuse
+the same TCP (and TLS) connection instead of reconnecting each time.
+"""
+
+import functools
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from lims import routes
+from lims.auth import TokenProvider
+from lims.breaker import CircuitBreakers
+from lims.cache import ConditionalCache, EntityCache
+from lims.ratelimit import RateLimiter
+from lims.retry import Retrier
+from lims.singleflight import SingleFlight
+from lims.streaming import DataStream
+
+DEFAULT_BASE_URL = os.environ.get("LIMS_BASE_URL", "http://localhost:8000")
+
+Timeout = Union[float, Tuple[float, float]]
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class LimsClient:
+    """One method per LIMS endpoint, all sharing a pooled session.
+
+    ``pool_connections`` is the number of distinct hosts kept in the pool and
+    ``pool_maxsize`` the number of connections kept alive per host; size the
+    latter to the number of threads sharing the client. ``timeout`` is either
+    a single number or a ``(connect, read)`` tuple and applies to every call.
+
+    Once :meth:`authenticate` has been called every request except ``/login``
+    carries a cached bearer token (see :class:`~lims.auth.TokenProvider`).
+
+    Passing an :class:`~lims.cache.EntityCache` as ``cache`` serves repeated
+    ``get_sample``/``get_result``/``get_trial`` calls from memory and keeps
+    the cache in step with this client's own writes. A
+    :class:`~lims.cache.ConditionalCache` as ``conditional`` turns
+    ``get_clients``/``get_client`` into conditional requests. With a
+    :class:`~lims.singleflight.SingleFlight` as ``singleflight``, concurrent
+    identical GETs from different threads share one request and one
+    (read-only) response. A :class:`~lims.retry.Retrier` as ``retrier``
+    re-sends calls that failed with a 5xx or a connection error when they
+    are safe to repeat; with ``idempotency_keys`` (the default) every POST
+    to a route the server deduplicates (``routes.IDEMPOTENT_ROUTES``)
+    carries a fresh ``Idempotency-Key``, which makes those creates safe to
+    repeat too. :class:`~lims.breaker.CircuitBreakers` as
+    ``breakers`` fail calls to a failing route fast with
+    :class:`~lims.breaker.CircuitOpenError`. A
+    :class:`~lims.ratelimit.RateLimiter` as ``ratelimiter`` paces every
+    attempt to the configured quotas and slows down when the server
+    answers 429.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        timeout: Timeout = (3.05, 30.0),
+        session: Optional[requests.Session] = None,
+        cache: Optional[EntityCache] = None,
+        conditional: Optional[ConditionalCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        retrier: Optional[Retrier] = None,
+        idempotency_keys: bool = True,
+        breakers: Optional[CircuitBreakers] = None,
+        ratelimiter: Optional[RateLimiter] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.token_provider: Optional[TokenProvider] = None
+        self.cache = cache
+        self.conditional = conditional
+        self.singleflight = singleflight
+        self.retrier = retrier
+        self.idempotency_keys = idempotency_keys
+        self.breakers = breakers
+        self.ratelimiter = ratelimiter
+
+    def authenticate(self, username: str, password: str, refresh_margin: float = 60.0) -> TokenProvider:
+        if self.token_provider is not None:
+            self.token_provider.close()
+        self.token_provider = TokenProvider(self, username, password, refresh_margin=refresh_margin)
+        return self.token_provider
+
+    def close(self) -> None:
+        if self.token_provider is not None:
+            self.token_provider.close()
+        self.session.close()
+
+    def __enter__(self) -> "LimsClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _request(
+        self,
+        method: str,
+        route: str,
+        path_args: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        path = route.format(**path_args) if path_args else route
+        if method == "POST" and self.idempotency_keys and route in routes.IDEMPOTENT_ROUTES:
+            # One key per logical call, shared by all of its retries.
+            kwargs["headers"] = {routes.IDEMPOTENCY_HEADER: uuid.uuid4().hex, **(kwargs.get("headers") or {})}
+        entity_id = next(iter(path_args.values())) if path_args else None
+        if self.cache is not None:
+            cached = self.cache.lookup(method, route, entity_id)
+            if cached is not None:
+                return cached
+        fetch = functools.partial(self._fetch, method, route, path, entity_id, **kwargs)
+        if self.singleflight is not None and method == "GET" and not kwargs.get("stream"):
+            params = kwargs.get("params") or {}
+            return self.singleflight.do((path, tuple(sorted(params.items()))), fetch)
+        return fetch()
+
+    def _fetch(self, method: str, route: str, path: str, entity_id: Any, **kwargs) -> requests.Response:
+        if self.conditional is not None:
+            response = self.conditional.send(self._transmit, method, route, path, **kwargs)
+        else:
+            response = self._transmit(method, route, path, **kwargs)
+        if self.cache is not None:
+            self.cache.observe(method, route, entity_id, response)
+        return response
+
+    def _transmit(self, method: str, route: str, path: str, **kwargs) -> requests.Response:
+        # Each retry attempt passes through the limiter and the breaker on its own.
+        send = self._send if self.breakers is None else functools.partial(self.breakers.call, self._send)
+        if self.ratelimiter is not None:
+            send = functools.partial(self.ratelimiter.call, send)
+        if self.retrier is None:
+            return send(method, route, path, **kwargs)
+        return self.retrier.call(send, method, route, path, **kwargs)
+
+    def _send(self, method: str, route: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        if self.token_provider is None or route == routes.LOGIN:
+            return self.session.request(method, self.base_url + path, **kwargs)
+
+        headers = kwargs.pop("headers", None) or {}
+        token = self.token_provider.get_token()
+        response = self.session.request(
+            method, self.base_url + path, headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs
+        )
+        if response.status_code == 401:
+            # Revoked or expired early: log in again once and replay.
+            self.token_provider.invalidate(token)
+            token = self.token_provider.get_token()
+            response = self.session.request(
+                method, self.base_url + path, headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs
+            )
+        return response
+
+    def _list(
+        self, route: str, limit: Optional[int], cursor: Optional[str], filters: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        params = _filter_params(filters)
+        if limit is not None:
+            params["limit"] = limit
+        if cursor is not None:
+            params["cursor"] = cursor
+        return self._request("GET", route, params=params or None)
+
+    def pages(
+        self, route: str, limit: int = 500, prefetch: bool = True, **filters: Any
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield a list endpoint (e.g. ``routes.RESULTS``) one page at a time.
+
+        With ``prefetch`` the request for the next page is already in flight
+        while the caller works on the current one, overlapping network wait
+        with processing. ``filters`` are passed on as in :meth:`get_samples`.
+        Raises :class:`requests.HTTPError` for a non-2xx page.
+        """
+
+        def fetch(cursor: Optional[str]) -> Dict[str, Any]:
+            response = self._list(route, limit, cursor, filters)
+            response.raise_for_status()
+            return response.json()
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lims-pages") if prefetch else None
+        try:
+            body = fetch(None)
+            while True:
+                cursor = body.get("next_cursor")
+                upcoming = executor.submit(fetch, cursor) if executor and cursor else None
+                yield body["data"]
+                if not cursor:
+                    return
+                body = upcoming.result() if upcoming else fetch(cursor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_list(self, route: str, filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the records of a list endpoint while its body is still arriving.
+
+        Only the unparsed tail of the body is held in memory, so this is the
+        way to walk collections too large for ``response.json()``. Raises
+        :class:`requests.HTTPError` for a non-2xx reply.
+        """
+        response = self._request("GET", route, params=_filter_params(filters) or None, stream=True)
+        try:
+            response.raise_for_status()
+            yield from DataStream(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        finally:
+            response.close()
+
+    # Login
+
+    def login(self, username: str, password: str) -> requests.Response:
+        return self._request("POST", routes.LOGIN, json={"username": username, "password": password})
+
+    # Users
+
+    def get_users(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> requests.Response:
+        return self._list(routes.USERS, limit, cursor)
+
+    def iter_users(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_list(routes.USERS)
+
+    def create_user(self, user: Dict[str, Any]) -> requests.Response:
+        return self._request("POST", routes.USERS, json=user)
+
+    def get_user(self, user_id: int) -> requests.Response:
+        return self._request("GET", routes.USER, {"id": user_id})
+
+    def update_user(self, user_id: int, changes: Dict[str, Any]) -> requests.Response:
+        return self._request("PATCH", routes.USER, {"id": user_id}, json=changes)
+
+    def set_user_roles(self, user_id: int, roles: List[str]) -> requests.Response:
+        return self.update_user(user_id, {"roles": roles})
+
+    def delete_user(self, user_id: int, mode: Optional[str] = None) -> requests.Response:
+        """``mode``: ``"cascade"`` or ``"restrict"``, as in :meth:`delete_sample`."""
+        return self._request("DELETE", routes.USER, {"id": user_id}, params=_mode_params(mode))
+
+    # Clients
+
+    def get_clients(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> requests.Response:
+        return self._list(routes.CLIENTS, limit, cursor)
+
+    def iter_clients(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_list(routes.CLIENTS)
+
+    def create_client(self, client: Dict[str, Any]) -> requests.Response:
+        return self._request("POST", routes.CLIENTS, json=client)
+
+    def get_client(self, client_code: str) -> requests.Response:
+        return self._request("GET", routes.CLIENT, {"client_code": client_code})
+
+    # Samples
+
+    def get_samples(self, limit: Optional[int] = None, cursor: Optional[str] = None, **filters: Any) -> requests.Response:
+        """``filters``: ``client_code`` and ``entry_date``/``sampling_date`` ranges.
+
+        A range is given as ``<field>_from`` (inclusive) and/or ``<field>_to``
+        (exclusive), as ISO 8601 strings or :class:`~datetime.date` objects,
+        e.g. ``get_samples(client_code="C-001", entry_date_from="2025-12-01")``.
+        """
+        return self._list(routes.SAMPLES, limit, cursor, filters)
+
+    def iter_samples(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        return self._iter_list(routes.SAMPLES, filters)
+
+    def create_sample(self, sample: Dict[str, Any]) -> requests.Response:
+        return self._request("POST", routes.SAMPLES, json=sample)
+
+    def create_samples(self, samples: List[Dict[str, Any]]) -> requests.Response:
+        """``POST /samples:batch``: the reply lists one ``{"status", "data" | "error"}`` per sample."""
+        return self._request("POST", routes.SAMPLES_BATCH, json=samples)
+
+    def get_sample(self, sample_number: int) -> requests.Response:
+        return self._request("GET", routes.SAMPLE, {"sample_number": sample_number})
+
+    def update_sample(self, sample_number: int, changes: Dict[str, Any]) -> requests.Response:
+        return self._request("PATCH", routes.SAMPLE, {"sample_number": sample_number}, json=changes)
+
+    def delete_sample(self, sample_number: int, mode: Optional[str] = None) -> requests.Response:
+        """Delete a sample; ``mode`` decides what happens to the rows that reference it.
+
+        ``"cascade"`` deletes its analyses, results and trials too (listed in
+        the reply's ``cascaded``); ``"restrict"`` answers 409 while any exist.
+        """
+        return self._request("DELETE", routes.SAMPLE, {"sample_number": sample_number}, params=_mode_params(mode))
+
+    # Analysis
+
+    def get_analysis_list(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> requests.Response:
+        return self._list(routes.ANALYSIS_LIST, limit, cursor)
+
+    def iter_analysis(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_list(routes.ANALYSIS_LIST)
+
+    def create_analysis(self, analysis: Dict[str, Any]) -> requests.Response:
+        return self._request("POST", routes.ANALYSIS_LIST, json=analysis)
+
+    def get_analysis(self, analysis_number: int) -> requests.Response:
+        return self._request("GET", routes.ANALYSIS, {"analysis_number": analysis_number})
+
+    # Results
+
+    def get_results(self, limit: Optional[int] = None, cursor: Optional[str] = None, **filters: Any) -> requests.Response:
+        """``filters``: ``client_code``, ``analysis_number`` and a ``result_date`` range (see :meth:`get_samples`)."""
+        return self._list(routes.RESULTS, limit, cursor, filters)
+
+    def iter_results(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        return self._iter_list(routes.RESULTS, filters)
+
+    def create_result(self, result: Dict[str, Any]) -> requests.Response:
+        return self._request("POST", routes.RESULTS, json=result)
+
+    def create_results(self, results: List[Dict[str, Any]]) -> requests.Response:
+        """``POST /results:batch``: the reply lists one ``{"status", "data" | "error"}`` per result."""
+        return self._request("POST", routes.RESULTS_BATCH, json=results)
+
+    def get_result(self, result_number: int) -> requests.Response:
+        return self._request("GET", routes.RESULT, {"result_number": result_number})
+
+    def update_result(self, result_number: int, changes: Dict[str, Any]) -> requests.Response:
+        return self._request("PATCH", routes.RESULT, {"result_number": result_number}, json=changes)
+
+    def delete_result(self, result_number: int, mode: Optional[str] = None) -> requests.Response:
+        """``mode``: ``"cascade"`` or ``"restrict"``, as in :meth:`delete_sample`."""
+        return self._request("DELETE", routes.RESULT, {"result_number": result_number}, params=_mode_params(mode))
+
+    # Trials
+
+    def get_trials(self, limit: Optional[int] = None, cursor: Optional[str] = None, **filters: Any) -> requests.Response:
+        """``filters``: ``client_code``, ``analysis_number`` and an ``emission_date`` range (see :meth:`get_samples`)."""
+        return self._list(routes.TRIALS, limit, cursor, filters)
+
+    def iter_trials(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        return self._iter_list(routes.TRIALS, filters)
+
+    def create_trial(self, trial: Dict[str, Any]) -> requests.Response:
+        return self._request("POST", routes.TRIALS, json=trial)
+
+    def get_trial(self, trial_number: int) -> requests.Response:
+        return self._request("GET", routes.TRIAL, {"trial_number": trial_number})
+
+    def update_trial(self, trial_number: int, changes: Dict[str, Any]) -> requests.Response:
+        return self._request("PATCH", routes.TRIAL, {"trial_number": trial_number}, json=changes)
+
+    def delete_trial(self, trial_number: int) -> requests.Response:
+        return self._request("DELETE", routes.TRIAL, {"trial_number": trial_number})
+
+    # Search
+
+    def search(self, query: str, limit: Optional[int] = None, types: Optional[List[str]] = None) -> requests.Response:
+        """``GET /search``: samples (description, observations) and results ranked against ``query``.
+
+        Words are matched accent- and case-insensitively; ``micro*`` matches
+        every word starting with ``micro``. ``types`` narrows the search to
+        ``"samples"`` or ``"results"``.
+        """
+        params: Dict[str, Any] = {"q": query}
+        if limit is not None:
+            params["limit"] = limit
+        if types is not None:
+            params["in"] = ",".join(types)
+        return self._request("GET", routes.SEARCH, params=params)
+
+
+def _filter_params(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Query parameters for list filters; dates become ISO 8601 strings and ``None`` values are dropped."""
+    return {
+        name: value.isoformat() if isinstance(value, date) else value
+        for name, value in (filters or {}).items()
+        if value is not None
+    }
+
+
+def _mode_params(mode: Optional[str]) -> Optional[Dict[str, str]]:
+    return None if mode is None else {"mode": mode}
@@ -0,0 +1,83 @@
+"""Mergeable latency histogram with HDR-style log-linear buckets.
+
+Values (integers, e.g. microseconds) below ``2 ** precision_bits`` get a
+bucket each; above that every power-of-two range is split into
+``2 ** (precision_bits - 1)`` equal buckets. With the default 11 bits any
+recorded value is reported within 0.1% of its true value, whatever its
+magnitude, using a few thousand buckets at most. Counts live in a sparse
+dict, so histograms are cheap to pickle and to merge across processes.
+"""
+
+from typing import Dict, Iterable, Optional
+
+
+class Histogram:
+    def __init__(self, precision_bits: int = 11):
+        self.precision_bits = precision_bits
+        self._linear = 1 << precision_bits
+        self._half = self._linear >> 1
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        if value < self._linear:
+            return value
+        shift = value.bit_length() - self.precision_bits
+        return self._linear + (shift - 1) * self._half + ((value >> shift) - self._half)
+
+    def _value(self, index: int) -> int:
+        """Highest value that falls into bucket ``index``."""
+        if index < self._linear:
+            return index
+        shift, offset = divmod(index - self._linear, self._half)
+        shift += 1
+        return (((offset + self._half) + 1) << shift) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(0, int(value))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("cannot merge histograms of different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for attr, pick in (("min", min), ("max", max)):
+            theirs = getattr(other, attr)
+            if theirs is not None:
+                mine = getattr(self, attr)
+                setattr(self, attr, theirs if mine is None else pick(mine, theirs))
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable["Histogram"], precision_bits: int = 11) -> "Histogram":
+        result = cls(precision_bits)
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def percentile(self, percent: float) -> int:
+        """Smallest recorded bucket value with at least ``percent`` of the samples at or below it."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
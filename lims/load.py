@@ -0,0 +1,496 @@
+"""Load generation against the LIMS API.
+
+A workload is a weighted mix of operations, e.g.
+``get_sample=60,create_result=20,update_trial=10,login=10``. It is driven
+either by a fixed number of virtual users (closed model: each user fires
+its next call as soon as the previous one returns) or at a target request
+rate (open model: calls start on a fixed schedule whether or not earlier
+ones have finished). In rate mode latency is measured from each call's
+scheduled start, so a stalled server shows up in the percentiles instead
+of silently lowering the offered load.
+"""
+
+import asyncio
+import collections
+import itertools
+import math
+import multiprocessing
+import pickle
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from lims.aio import AsyncLimsClient
+from lims.client import LimsClient
+from lims.histogram import Histogram
+
+DATE = "2025-12-16T10:00:00Z"
+PERCENTILES = (50, 90, 99, 99.9)
+# Headroom on the spare analyses a run is expected to consume.
+SPARE_MARGIN = 1.25
+
+
+class Fixture:
+    """Ids created by :func:`seed` that operations read, update and build on."""
+
+    def __init__(self, username: str, password: str, client_code: str, user_id: int):
+        self.username = username
+        self.password = password
+        self.client_code = client_code
+        self.user_id = user_id
+        self.sample_numbers: List[int] = []
+        self.result_numbers: List[int] = []
+        self.trial_numbers: List[int] = []
+        # Analyses without a result yet; POST /results consumes them.
+        self.spare_analysis: Deque[Tuple[int, int]] = collections.deque()
+        # Requests per second a single caller achieved while seeding.
+        self.seed_rate = 0.0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def split(self, parts: int) -> List["Fixture"]:
+        """Copies sharing every id except the spare analyses, which are dealt out."""
+        copies = []
+        for part in range(parts):
+            copy = pickle.loads(pickle.dumps(self))
+            copy.spare_analysis = collections.deque(itertools.islice(self.spare_analysis, part, None, parts))
+            copies.append(copy)
+        return copies
+
+    def take_spare_analysis(self) -> Optional[Tuple[int, int]]:
+        """An ``(analysis_number, sample_number)`` without a result, or ``None`` once they ran out."""
+        with self._lock:
+            return self.spare_analysis.popleft() if self.spare_analysis else None
+
+
+def _check(response: requests.Response) -> dict:
+    if response.status_code not in (200, 201):
+        raise RuntimeError(f"seeding failed: {response.request.method} {response.url} -> {response.status_code}")
+    return response.json()["data"]
+
+
+def _analysis(fixture: Fixture, sample_number: int) -> Dict[str, Any]:
+    return {
+        "id_user": fixture.user_id,
+        "sample_number": sample_number,
+        "client_code": fixture.client_code,
+        "sow_date": DATE,
+        "type_analysis": "Microbiológico",
+    }
+
+
+def create_analysis(client: LimsClient, fixture: Fixture, sample_number: int) -> int:
+    return _check(client.create_analysis(_analysis(fixture, sample_number)))["analysis_number"]
+
+
+def add_spare_analysis(client: LimsClient, fixture: Fixture, count: int) -> None:
+    """Create ``count`` more analyses without a result, spread over the seeded samples."""
+    for i in range(count):
+        sample_number = fixture.sample_numbers[i % len(fixture.sample_numbers)]
+        analysis_number = create_analysis(client, fixture, sample_number)
+        with fixture._lock:
+            fixture.spare_analysis.append((analysis_number, sample_number))
+
+
+def expected_rate(fixture: Fixture, users: Optional[int] = None, rps: Optional[float] = None, shared_cpu: bool = True) -> float:
+    """Requests per second a run is likely to issue.
+
+    In rate mode that is ``rps``. Closed-model users are estimated from the
+    seeding rate: they only add up when the server runs elsewhere; against
+    an in-process stand-in (``shared_cpu``) they share one interpreter.
+    """
+    if rps is not None:
+        return rps
+    return fixture.seed_rate * (1 if shared_cpu else max(users or 1, 1))
+
+
+def spare_for(mix: List[Tuple["Operation", float]], duration: float, rate: float) -> int:
+    """Spare analyses a run of ``duration`` seconds at ``rate`` is expected to consume, with headroom."""
+    total = sum(weight for _, weight in mix)
+    share = sum(weight for operation, weight in mix if operation is OPERATIONS["create_result"]) / total if total else 0.0
+    return math.ceil(rate * duration * share * SPARE_MARGIN)
+
+
+def seed(client: LimsClient, size: int = 100, spare: int = 1000, tag: str = "") -> Fixture:
+    """Create one client and user plus ``size`` samples with an analysis, result and trial each.
+
+    ``spare`` extra analyses are left without a result for POST /results
+    (see :func:`spare_for` to size them to a run). ``tag`` keeps the names
+    unique when seeding a shared server repeatedly.
+    """
+    tag = tag or f"{time.time_ns():x}"
+    started = time.perf_counter()
+    username, password = f"load-{tag}", "load"
+    user = _check(client.create_user({"name": "Load", "username": username, "password": password, "roles": ["Admin"]}))
+    client_code = _check(client.create_client({"name": f"Load {tag}", "contact": "load"}))[0]["client_code"]
+    fixture = Fixture(username, password, client_code, user["id"])
+    for i in range(size):
+        sample_number = _check(client.create_sample({
+            "client_code": client_code,
+            "entry_date": DATE,
+            "description": f"Muestra de carga {i}",
+            "sampling_date": DATE,
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1,
+        }))["sample_number"]
+        analysis_number = create_analysis(client, fixture, sample_number)
+        result_number = _check(client.create_result({
+            "analysis_number": analysis_number,
+            "sample_number": sample_number,
+            "id_user": fixture.user_id,
+            "client_code": client_code,
+            "result_date": DATE,
+            "result": "Apto para consumo",
+        }))["result_number"]
+        trial_number = _check(client.create_trial({
+            "analysis_number": analysis_number,
+            "sample_number": sample_number,
+            "result_number": result_number,
+            "emission_date": DATE,
+        }))["trial_number"]
+        fixture.sample_numbers.append(sample_number)
+        fixture.result_numbers.append(result_number)
+        fixture.trial_numbers.append(trial_number)
+    # Two setup requests, then four per sample.
+    fixture.seed_rate = (2 + 4 * size) / (time.perf_counter() - started)
+    add_spare_analysis(client, fixture, spare)
+    return fixture
+
+
+Run = Callable[[LimsClient, Fixture, random.Random], requests.Response]
+
+
+class Operation(NamedTuple):
+    endpoint: str
+    run: Run
+
+
+def _create_result(client: LimsClient, fixture: Fixture, rng: random.Random) -> requests.Response:
+    spare = fixture.take_spare_analysis()
+    if spare is None:
+        # Out of spares: the call creates its analysis first, and a failure
+        # there is this call's outcome.
+        sample_number = rng.choice(fixture.sample_numbers)
+        response = client.create_analysis(_analysis(fixture, sample_number))
+        if response.status_code != 201:
+            return response
+        spare = response.json()["data"]["analysis_number"], sample_number
+    analysis_number, sample_number = spare
+    return client.create_result({
+        "analysis_number": analysis_number,
+        "sample_number": sample_number,
+        "id_user": fixture.user_id,
+        "client_code": fixture.client_code,
+        "result_date": DATE,
+        "result": "Apto para consumo",
+    })
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "login": Operation("POST /login", lambda c, f, r: c.login(f.username, f.password)),
+    "get_users": Operation("GET /users", lambda c, f, r: c.get_users()),
+    "get_user": Operation("GET /users/{id}", lambda c, f, r: c.get_user(f.user_id)),
+    "get_client": Operation("GET /client/{client_code}", lambda c, f, r: c.get_client(f.client_code)),
+    "get_sample": Operation("GET /samples/{sample_number}", lambda c, f, r: c.get_sample(r.choice(f.sample_numbers))),
+    "update_sample": Operation(
+        "PATCH /samples/{sample_number}",
+        lambda c, f, r: c.update_sample(r.choice(f.sample_numbers), {"observations": f"Revisada {r.random():.6f}"}),
+    ),
+    "get_result": Operation("GET /results/{result_number}", lambda c, f, r: c.get_result(r.choice(f.result_numbers))),
+    "create_result": Operation("POST /results", _create_result),
+    "get_trial": Operation("GET /trials/{trial_number}", lambda c, f, r: c.get_trial(r.choice(f.trial_numbers))),
+    "update_trial": Operation(
+        "PATCH /trials/{trial_number}",
+        lambda c, f, r: c.update_trial(r.choice(f.trial_numbers), {"emission_date": DATE}),
+    ),
+}
+
+
+def parse_mix(spec: str) -> List[Tuple[Operation, float]]:
+    """Parse ``name=weight,...`` into operations and their weights."""
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r}; choose from {', '.join(sorted(OPERATIONS))}")
+        mix.append((OPERATIONS[name], float(weight or 1)))
+    return mix
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses: Dict[str, int] = {}
+
+    def record(self, status: str, micros: int) -> None:
+        self.latency.record(micros)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def merge(self, other: "EndpointStats") -> "EndpointStats":
+        self.latency.merge(other.latency)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        return self
+
+    @property
+    def errors(self) -> Dict[str, int]:
+        return {status: count for status, count in self.statuses.items() if not status.startswith("2")}
+
+
+class LoadStats:
+    """Per-endpoint latency histograms and status counts; mergeable and picklable."""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.elapsed = 0.0
+
+    def record(self, endpoint: str, status: str, micros: int) -> None:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        stats.record(status, micros)
+
+    def merge(self, other: "LoadStats") -> "LoadStats":
+        for endpoint, stats in other.endpoints.items():
+            self.endpoints.setdefault(endpoint, EndpointStats()).merge(stats)
+        self.elapsed = max(self.elapsed, other.elapsed)
+        return self
+
+    @classmethod
+    def merged(cls, stats: Iterable["LoadStats"]) -> "LoadStats":
+        result = cls()
+        for item in stats:
+            result.merge(item)
+        return result
+
+    def total(self) -> EndpointStats:
+        total = EndpointStats()
+        for stats in self.endpoints.values():
+            total.merge(stats)
+        return total
+
+    def report(self) -> str:
+        header = f"{'endpoint':<32} {'reqs':>8} {'req/s':>9} {'err%':>6} " + " ".join(
+            f"{'p' + format(p, 'g'):>8}" for p in PERCENTILES
+        ) + "  errors"
+        lines = [header, "-" * len(header)]
+        rows = sorted(self.endpoints.items()) + [("TOTAL", self.total())]
+        for endpoint, stats in rows:
+            count = stats.latency.count
+            errors = sum(stats.errors.values())
+            rate = count / self.elapsed if self.elapsed else 0.0
+            percentiles = " ".join(f"{stats.latency.percentile(p) / 1000:>8.2f}" for p in PERCENTILES)
+            by_status = ", ".join(f"{status}: {n}" for status, n in sorted(stats.errors.items()))
+            lines.append(
+                f"{endpoint:<32} {count:>8} {rate:>9.1f} {100 * errors / max(count, 1):>6.2f} {percentiles}  {by_status}"
+            )
+        lines.append(f"elapsed {self.elapsed:.2f}s, latencies in ms")
+        return "\n".join(lines)
+
+
+def _call(client: LimsClient, fixture: Fixture, operation: Operation, rng: random.Random) -> str:
+    try:
+        return str(operation.run(client, fixture, rng).status_code)
+    except (requests.RequestException, ValueError) as exc:
+        # ValueError: a 2xx whose body is not the JSON expected.
+        return type(exc).__name__
+
+
+async def run_load(
+    aclient: AsyncLimsClient,
+    fixture: Fixture,
+    mix: List[Tuple[Operation, float]],
+    duration: float,
+    users: Optional[int] = None,
+    rps: Optional[float] = None,
+    seed_value: Optional[int] = None,
+    stats: Optional[LoadStats] = None,
+    interval: Optional[float] = None,
+    on_interval: Optional[Callable[[LoadStats], None]] = None,
+) -> LoadStats:
+    """Drive ``mix`` for ``duration`` seconds with ``users`` virtual users or at ``rps``.
+
+    Exactly one of ``users`` and ``rps`` must be given. In rate mode at most
+    ``aclient.concurrency`` calls are in flight; beyond that calls queue and
+    their queueing time counts towards latency. With ``on_interval`` the
+    cumulative stats so far are passed to it every ``interval`` seconds.
+    """
+    if (users is None) == (rps is None):
+        raise ValueError("give either users or rps")
+    stats = stats or LoadStats()
+    rng = random.Random(seed_value)
+    operations = [operation for operation, _ in mix]
+    weights = list(itertools.accumulate(weight for _, weight in mix))
+    client = aclient.client
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def snapshots() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            stats.elapsed = time.perf_counter() - started
+            on_interval(stats)
+
+    reporter = asyncio.ensure_future(snapshots()) if on_interval and interval else None
+
+    async def fire(intended: float) -> None:
+        operation = rng.choices(operations, cum_weights=weights)[0]
+        status = await aclient.call(_call, client, fixture, operation, rng)
+        stats.record(operation.endpoint, status, int((time.perf_counter() - intended) * 1_000_000))
+
+    if users is not None:
+        async def user() -> None:
+            while time.perf_counter() < deadline:
+                await fire(time.perf_counter())
+
+        await asyncio.gather(*(user() for _ in range(users)))
+    else:
+        period = 1.0 / rps
+        pending = set()
+        for tick in itertools.count():
+            intended = started + tick * period
+            if intended >= deadline:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.ensure_future(fire(intended))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    if reporter is not None:
+        reporter.cancel()
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+class WorkerSpec(NamedTuple):
+    """Everything a load worker process needs; must stay picklable."""
+
+    url: Optional[str]
+    mix: str
+    duration: float
+    users: Optional[int]
+    rps: Optional[float]
+    concurrency: int
+    interval: Optional[float]
+    seed_size: int
+    # ``None`` sizes each worker's spare analyses to its share of the run.
+    spare: Optional[int]
+    # Worker ``i`` draws its operations from ``random_seed + i``.
+    random_seed: Optional[int] = None
+
+
+def _worker(worker_id: int, spec: WorkerSpec, fixture: Optional[Fixture], results: "multiprocessing.Queue") -> None:
+    # Imported here so the stand-in is only loaded by workers that use it.
+    from lims.adapter import mount
+    from lims.standin import LimsApp
+
+    try:
+        if spec.url:
+            client = LimsClient(spec.url, pool_maxsize=spec.concurrency)
+        else:
+            url = "http://lims.in-process"
+            client = LimsClient(url, pool_maxsize=spec.concurrency)
+            mount(client.session, LimsApp(), url)
+        if fixture is None:
+            fixture = seed(client, spec.seed_size, spec.spare or 0, tag=f"w{worker_id}-{time.time_ns():x}")
+            if spec.spare is None:
+                rate = expected_rate(fixture, spec.users, spec.rps, shared_cpu=not spec.url)
+                add_spare_analysis(client, fixture, spare_for(parse_mix(spec.mix), spec.duration, rate))
+        aclient = AsyncLimsClient(client, concurrency=spec.concurrency)
+        try:
+            # Stats are pickled here, on the event loop thread, so a snapshot
+            # never races with the calls still recording into them.
+            stats = asyncio.run(run_load(
+                aclient, fixture, parse_mix(spec.mix), spec.duration, users=spec.users, rps=spec.rps,
+                seed_value=None if spec.random_seed is None else spec.random_seed + worker_id,
+                interval=spec.interval,
+                on_interval=lambda snapshot: results.put(("interim", worker_id, pickle.dumps(snapshot))),
+            ))
+        finally:
+            aclient.close()
+        results.put(("final", worker_id, pickle.dumps(stats)))
+    except BaseException as exc:
+        results.put(("error", worker_id, repr(exc)))
+        raise
+
+
+def _share(total: Optional[float], parts: int, part: int, integral: bool) -> Optional[float]:
+    if total is None:
+        return None
+    if integral:
+        return int(total) // parts + (1 if part < int(total) % parts else 0)
+    return total / parts
+
+
+def run_distributed(
+    spec: WorkerSpec,
+    processes: int,
+    fixture: Optional[Fixture] = None,
+    on_snapshot: Optional[Callable[[LoadStats], None]] = None,
+) -> LoadStats:
+    """Run the load from ``processes`` worker processes and merge their stats.
+
+    Virtual users and the target rate are divided between the workers. With
+    a shared server (``spec.url``) pass the parent's ``fixture`` so workers
+    reuse it, each taking its own slice of the spare analyses; otherwise every
+    worker seeds its own in-process stand-in. Every ``spec.interval`` seconds
+    ``on_snapshot`` receives the merged cumulative stats reported so far.
+    """
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    fixtures = fixture.split(processes) if fixture is not None else [None] * processes
+    workers = []
+    for worker_id in range(processes):
+        worker_spec = spec._replace(
+            users=_share(spec.users, processes, worker_id, integral=True),
+            rps=_share(spec.rps, processes, worker_id, integral=False),
+        )
+        if worker_spec.users == 0:
+            continue
+        process = context.Process(target=_worker, args=(worker_id, worker_spec, fixtures[worker_id], results), daemon=True)
+        process.start()
+        workers.append(process)
+
+    latest: Dict[int, LoadStats] = {}
+    finals: Dict[int, LoadStats] = {}
+    errors: Dict[int, str] = {}
+    next_snapshot = time.monotonic() + (spec.interval or 0)
+    while len(finals) + len(errors) < len(workers):
+        try:
+            kind, worker_id, payload = results.get(timeout=0.1)
+        except queue.Empty:
+            if not any(process.is_alive() for process in workers) and results.empty():
+                break
+            continue
+        if kind == "error":
+            errors[worker_id] = payload
+            continue
+        stats = pickle.loads(payload)
+        latest[worker_id] = stats
+        if kind == "final":
+            finals[worker_id] = stats
+        elif on_snapshot is not None and time.monotonic() >= next_snapshot:
+            next_snapshot += spec.interval
+            on_snapshot(LoadStats.merged(latest.values()))
+
+    for process in workers:
+        process.join()
+    if errors or len(finals) < len(workers):
+        raise RuntimeError(f"load workers failed: {errors or 'exited without reporting'}")
+    return LoadStats.merged(finals.values())
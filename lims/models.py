@@ -0,0 +1,167 @@
+"""Compact, immutable record types for the six LIMS resources.
+
+Each model is a ``__slots__`` class: no per-instance ``__dict__``, so a
+record costs one small fixed-size object instead of a dict sized for its
+keys. Instances cannot be changed after construction; :meth:`Record.replace`
+returns an updated copy, mirroring how the stand-in store treats its dicts.
+
+:meth:`Record.from_json` takes a decoded JSON object (missing fields become
+``None``, unknown keys are dropped) and :meth:`Record.to_json` returns a dict
+ready for ``json.dumps``. Short strings that repeat across many records
+(roles, ``type_analysis``, ``client_code``) are interned on the way in, so a
+million samples of the same client share a single ``client_code`` string.
+"""
+
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_all(values: Any) -> Any:
+    if values is None:
+        return None
+    return tuple(_intern(value) for value in values)
+
+
+class Record:
+    """Base class; subclasses list their fields in ``__slots__``.
+
+    ``INTERNED`` names the string fields to intern and ``SEQUENCES`` the
+    list-valued fields, which are held as tuples (of interned strings) and
+    written back out as lists.
+    """
+
+    __slots__ = ()
+    INTERNED: Tuple[str, ...] = ()
+    SEQUENCES: Tuple[str, ...] = ()
+    _setters: Tuple[Tuple[str, Callable[[Any, Any], None], Callable[[Any], Any]], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Slot descriptors set directly: the fastest way to fill a slotted
+        # object without going through the blocked __setattr__.
+        cls._setters = tuple(
+            (
+                field,
+                getattr(cls, field).__set__,
+                _intern_all if field in cls.SEQUENCES else _intern if field in cls.INTERNED else None,
+            )
+            for field in cls.__slots__
+        )
+
+    def __init__(self, **fields: Any):
+        unknown = set(fields) - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} has no fields {', '.join(sorted(unknown))}")
+        self._fill(fields)
+
+    def _fill(self, data: Dict[str, Any]) -> None:
+        get = data.get
+        for field, setter, convert in self._setters:
+            value = get(field)
+            setter(self, value if convert is None else convert(value))
+
+    @classmethod
+    def from_json(cls: Type[R], data: Dict[str, Any]) -> R:
+        record = cls.__new__(cls)
+        record._fill(data)
+        return record
+
+    @classmethod
+    def from_json_many(cls: Type[R], items: Iterable[Dict[str, Any]]) -> List[R]:
+        return [cls.from_json(item) for item in items]
+
+    def to_json(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in self.__slots__}
+        for field in self.SEQUENCES:
+            if data[field] is not None:
+                data[field] = list(data[field])
+        return data
+
+    def replace(self: R, **changes: Any) -> R:
+        return type(self)(**{**{field: getattr(self, field) for field in self.__slots__}, **changes})
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._values()))
+
+    def __reduce__(self):
+        return type(self).from_json, (self.to_json(),)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class User(Record):
+    __slots__ = ("id", "name", "username", "roles")
+    SEQUENCES = ("roles",)
+
+
+class Client(Record):
+    __slots__ = ("client_code", "name", "phoneNumber", "email", "addres")
+    INTERNED = ("client_code",)
+
+
+class Sample(Record):
+    __slots__ = (
+        "sample_number",
+        "client_code",
+        "entry_date",
+        "description",
+        "sampling_date",
+        "observations",
+        "analysis_quantity",
+    )
+    INTERNED = ("client_code",)
+
+
+class Analysis(Record):
+    __slots__ = ("analysis_number", "id_user", "sample_number", "client_code", "sow_date", "type_analysis")
+    INTERNED = ("client_code", "type_analysis")
+
+
+class Result(Record):
+    __slots__ = (
+        "result_number",
+        "analysis_number",
+        "sample_number",
+        "id_user",
+        "client_code",
+        "result_date",
+        "result",
+    )
+    INTERNED = ("client_code",)
+
+
+class Trial(Record):
+    __slots__ = (
+        "trial_number",
+        "analysis_number",
+        "sample_number",
+        "result_number",
+        "id_role",
+        "id_user",
+        "client_code",
+        "emission_date",
+    )
+    INTERNED = ("client_code",)
+
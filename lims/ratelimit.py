@@ -0,0 +1,170 @@
+"""Token-bucket rate limiting shared by threads and asyncio tasks.
+
+A :class:`TokenBucket` admits ``rate`` calls per second on average with
+bursts of up to ``burst``. Callers take a reservation and wait it out, so
+a burst of callers is admitted in order at the configured rate instead of
+spinning: :meth:`TokenBucket.acquire` sleeps, :meth:`TokenBucket.acquire_async`
+awaits.
+
+Buckets adapt to the server: :meth:`TokenBucket.penalize` (on a 429)
+blocks the bucket for the ``Retry-After`` period and halves its rate,
+and every successful call then restores a small step of the configured
+rate (additive increase, multiplicative decrease).
+
+:class:`RateLimiter` combines an optional global bucket with per-route
+buckets and plugs into :class:`~lims.client.LimsClient` as ``ratelimiter``.
+The stand-in uses the same buckets to enforce quotas
+(:class:`lims.standin.quotas.Quotas`).
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Limit = Tuple[float, Optional[float]]
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``burst`` defaults to one second's worth of tokens."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        decrease: float = 0.5,
+        increase: float = 0.02,
+        min_rate: Optional[float] = None,
+    ):
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.clock = clock
+        self.decrease = decrease
+        self.increase = increase
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> float:
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` now, possibly on credit; return how long to wait before using them."""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def available_in(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` could be taken without waiting."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def acquire(self, tokens: float = 1.0, sleep: Callable[[float], None] = time.sleep) -> float:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, retry_after: float) -> None:
+        """React to a 429: cut the rate and push the next admission ``retry_after`` seconds out."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, -retry_after * self.rate)
+
+    def reward(self) -> None:
+        if self.rate < self.configured_rate:
+            with self._lock:
+                self.rate = min(self.configured_rate, self.rate + self.configured_rate * self.increase)
+
+
+class RateLimiter:
+    """A global bucket (``rate``/``burst``) and/or one bucket per route template.
+
+    ``limits`` maps route templates to ``(rate, burst)``; a call waits for
+    every bucket that applies to it.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        limits: Optional[Dict[str, Limit]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.clock = clock
+        self.sleep = sleep
+        self.global_bucket = None if rate is None else TokenBucket(rate, burst, clock)
+        self.route_buckets: Dict[str, TokenBucket] = {
+            route: TokenBucket(route_rate, route_burst, clock) for route, (route_rate, route_burst) in (limits or {}).items()
+        }
+        self.throttled: Dict[str, int] = {}
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def buckets(self, route: str) -> List[TokenBucket]:
+        buckets = [self.global_bucket] if self.global_bucket is not None else []
+        if route in self.route_buckets:
+            buckets.append(self.route_buckets[route])
+        return buckets
+
+    def _reserve(self, route: str) -> float:
+        delay = max((bucket.reserve() for bucket in self.buckets(route)), default=0.0)
+        with self._lock:
+            self.waited += delay
+        return delay
+
+    def wait(self, route: str) -> None:
+        delay = self._reserve(route)
+        if delay > 0:
+            self.sleep(delay)
+
+    async def wait_async(self, route: str) -> None:
+        delay = self._reserve(route)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def observe(self, route: str, status: int, retry_after: Optional[str]) -> None:
+        """Adapt the buckets of ``route`` to a reply's status and ``Retry-After``."""
+        if status == 429:
+            with self._lock:
+                self.throttled[route] = self.throttled.get(route, 0) + 1
+            try:
+                delay = float(retry_after) if retry_after else 1.0
+            except ValueError:
+                delay = 1.0
+            for bucket in self.buckets(route):
+                bucket.penalize(delay)
+        else:
+            for bucket in self.buckets(route):
+                bucket.reward()
+
+    def call(self, send: Callable[..., Any], method: str, route: str, path: str, **kwargs: Any) -> Any:
+        """``send(method, route, path, **kwargs)`` once ``route``'s buckets admit it."""
+        self.wait(route)
+        response = send(method, route, path, **kwargs)
+        self.observe(route, response.status_code, response.headers.get("Retry-After"))
+        return response
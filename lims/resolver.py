@@ -0,0 +1,86 @@
+"""Batched resolution of the records a list of trials refers to.
+
+Rendering trials naively costs one ``GET`` per reference per row. A
+:class:`TrialResolver` instead collects the references of the whole list,
+deduplicates them per resource, fetches each distinct key once (all
+resources concurrently, each through :meth:`~lims.aio.Resource.gather_many`)
+and hands back :class:`ResolvedTrial` objects built from :mod:`lims.models`.
+
+Fetched records are memoised for the life of the resolver, DataLoader
+style, so resolving a second page only fetches what the first did not.
+``id_role`` is kept as a plain number: the API has no roles endpoint.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, Union
+
+from lims.aio import AsyncLimsClient, Resource
+from lims.models import Analysis, Client, Record, Result, Sample, Trial, User
+
+
+class ResolvedTrial(NamedTuple):
+    """A trial with its references; a reference is ``None`` when its lookup failed."""
+
+    trial: Trial
+    analysis: Optional[Analysis]
+    sample: Optional[Sample]
+    result: Optional[Result]
+    user: Optional[User]
+    client: Optional[Client]
+
+
+# Trial field -> (AsyncLimsClient resource attribute, model).
+RELATIONS: Dict[str, Tuple[str, Type[Record]]] = {
+    "analysis_number": ("analysis", Analysis),
+    "sample_number": ("samples", Sample),
+    "result_number": ("results", Result),
+    "id_user": ("users", User),
+    "client_code": ("clients", Client),
+}
+
+
+class TrialResolver:
+    """Hydrate trials with at most one fetch per distinct referenced record.
+
+    ``limit`` bounds the lookups in flight per resource (default: the async
+    client's concurrency). ``fetches`` counts the lookups issued so far.
+    """
+
+    def __init__(self, aclient: AsyncLimsClient, limit: Optional[int] = None):
+        self.aclient = aclient
+        self.limit = limit
+        self.fetches = 0
+        self._memo: Dict[str, Dict[Any, Optional[Record]]] = {field: {} for field in RELATIONS}
+
+    async def _load(self, field: str, keys: List[Any]) -> None:
+        attr, model = RELATIONS[field]
+        resource: Resource = getattr(self.aclient, attr)
+        self.fetches += len(keys)
+        gathered = await resource.gather_many(keys, self.limit)
+        memo = self._memo[field]
+        for key, value in zip(keys, gathered.values):
+            memo[key] = None if value is None else model.from_json(value)
+
+    async def resolve(self, trials: Iterable[Union[Dict[str, Any], Trial]]) -> List[ResolvedTrial]:
+        trials = [trial if isinstance(trial, Trial) else Trial.from_json(trial) for trial in trials]
+        pending = []
+        for field, memo in self._memo.items():
+            keys = list(dict.fromkeys(
+                key for key in (getattr(trial, field) for trial in trials) if key is not None and key not in memo
+            ))
+            if keys:
+                pending.append(self._load(field, keys))
+        await asyncio.gather(*pending)
+
+        analysis, samples, results, users, clients = (self._memo[field] for field in RELATIONS)
+        return [
+            ResolvedTrial(
+                trial,
+                analysis.get(trial.analysis_number),
+                samples.get(trial.sample_number),
+                results.get(trial.result_number),
+                users.get(trial.id_user),
+                clients.get(trial.client_code),
+            )
+            for trial in trials
+        ]
@@ -0,0 +1,213 @@
+"""Retries of failed calls with decorrelated-jitter backoff and a retry budget.
+
+A :class:`Retrier` re-sends a call that failed with a retryable status
+(500/502/503/504 by default) or a connection error/timeout, as long as
+the call is safe to repeat. ``GET`` and ``DELETE`` are retried by default;
+``POST`` only when it carries an ``Idempotency-Key`` header. Policies are
+per route template, with one default for the rest.
+
+Delays follow decorrelated jitter: each one is drawn uniformly between
+``base`` and three times the previous delay, capped at ``cap``, so retrying
+clients spread out instead of hammering the server in lockstep. A
+``Retry-After`` header, when present, is honoured as a lower bound.
+
+Every retry also spends a token from a shared :class:`RetryBudget`, which
+is refilled by a fraction of the first attempts. When the server is
+failing everything the budget runs dry and calls fail fast, so retries
+add at most ``ratio`` extra load instead of multiplying it.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional
+
+import requests
+
+from lims.routes import IDEMPOTENCY_HEADER
+
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+class RetryPolicy:
+    """When and how often one class of endpoint is retried.
+
+    ``max_attempts`` counts the first attempt too; ``base`` and ``cap``
+    bound the backoff in seconds.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base: float = 0.05,
+        cap: float = 2.0,
+        statuses: Iterable[int] = (500, 502, 503, 504),
+        methods: Iterable[str] = ("GET", "DELETE"),
+        keyed_methods: Iterable[str] = ("POST", "PATCH"),
+    ):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+        self.statuses: FrozenSet[int] = frozenset(statuses)
+        self.methods: FrozenSet[str] = frozenset(methods)
+        self.keyed_methods: FrozenSet[str] = frozenset(keyed_methods)
+
+    def allows(self, method: str, headers: Optional[Dict[str, str]]) -> bool:
+        """Whether a request may be sent more than once at all."""
+        if method in self.methods:
+            return True
+        return method in self.keyed_methods and bool(headers) and IDEMPOTENCY_HEADER in headers
+
+    def backoff(self, previous: float, rng: random.Random) -> float:
+        return min(self.cap, rng.uniform(self.base, max(self.base, previous * 3)))
+
+
+class RetryBudget:
+    """Token bucket shared by every retry of a client (or of several).
+
+    Each first attempt deposits ``ratio`` tokens and each retry withdraws
+    one, so sustained retries stay below ``ratio`` times the request rate.
+    ``min_per_second`` tokens trickle in regardless, so a quiet client can
+    still retry; the balance never exceeds ``capacity``.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 10.0,
+        capacity: float = 100.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount: float) -> None:
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + amount + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill(self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill(0.0)
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(0.0)
+            return self._tokens
+
+
+class RetryStats:
+    """Counters for one route template."""
+
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.recovered = 0
+        self.exhausted = 0
+        self.budget_denied = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+class Retrier:
+    """Apply per-route :class:`RetryPolicy` objects around a send function.
+
+    ``policies`` maps route templates (see :mod:`lims.routes`) to policies;
+    other routes use ``default``. ``stats`` holds a :class:`RetryStats` per
+    route template that has seen a call.
+    """
+
+    def __init__(
+        self,
+        default: Optional[RetryPolicy] = None,
+        policies: Optional[Dict[str, RetryPolicy]] = None,
+        budget: Optional[RetryBudget] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.default = default or RetryPolicy()
+        self.policies = dict(policies or {})
+        self.budget = budget or RetryBudget()
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.stats: Dict[str, RetryStats] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, route: str, counter: str) -> None:
+        with self._lock:
+            stats = self.stats.get(route)
+            if stats is None:
+                stats = self.stats[route] = RetryStats()
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def policy(self, route: str) -> RetryPolicy:
+        return self.policies.get(route, self.default)
+
+    def call(
+        self, send: Callable[..., requests.Response], method: str, route: str, path: str, **kwargs: Any
+    ) -> requests.Response:
+        """``send(method, route, path, **kwargs)``, retried according to ``route``'s policy."""
+        policy = self.policy(route)
+        self._count(route, "calls")
+        self.budget.deposit()
+        if not policy.allows(method, kwargs.get("headers")):
+            return send(method, route, path, **kwargs)
+
+        delay = policy.base
+        attempt = 1
+        while True:
+            try:
+                response: Optional[requests.Response] = send(method, route, path, **kwargs)
+                error: Optional[Exception] = None
+                retryable = response.status_code in policy.statuses
+            except TRANSIENT_ERRORS as exc:
+                response, error, retryable = None, exc, True
+
+            if not retryable:
+                if attempt > 1:
+                    self._count(route, "recovered")
+                return response
+            if attempt >= policy.max_attempts:
+                self._count(route, "exhausted")
+                return self._fail(response, error)
+            if not self.budget.withdraw():
+                self._count(route, "budget_denied")
+                return self._fail(response, error)
+
+            delay = policy.backoff(delay, self.rng)
+            retry_after = _retry_after(response)
+            if response is not None:
+                response.close()
+            self._count(route, "retries")
+            self.sleep(max(delay, min(retry_after, policy.cap)) if retry_after else delay)
+            attempt += 1
+
+    @staticmethod
+    def _fail(response: Optional[requests.Response], error: Optional[Exception]) -> requests.Response:
+        if error is not None:
+            raise error
+        return response
+
+
+def _retry_after(response: Optional[requests.Response]) -> float:
+    if response is None:
+        return 0.0
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0.0
@@ -0,0 +1,34 @@
+"""Route templates of the LIMS API.
+
+The templates double as stable keys for per-endpoint bookkeeping (metrics,
+policies) so that ``/samples/1`` and ``/samples/2`` are accounted together.
+"""
+
+LOGIN = "/login"
+
+USERS = "/users"
+USER = "/users/{id}"
+
+CLIENTS = "/clients"
+CLIENT = "/client/{client_code}"
+
+SAMPLES = "/samples"
+SAMPLE = "/samples/{sample_number}"
+SAMPLES_BATCH = "/samples:batch"
+
+ANALYSIS_LIST = "/analysis"
+ANALYSIS = "/analysis/{analysis_number}"
+
+RESULTS = "/results"
+RESULT = "/results/{result_number}"
+RESULTS_BATCH = "/results:batch"
+
+TRIALS = "/trials"
+TRIAL = "/trials/{trial_number}"
+
+SEARCH = "/search"
+
+# POST routes the server deduplicates by ``Idempotency-Key``: a repeated
+# key replays the first reply instead of creating the row again.
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENT_ROUTES = frozenset((SAMPLES, SAMPLES_BATCH, ANALYSIS_LIST, RESULTS, RESULTS_BATCH, TRIALS))
@@ -0,0 +1,104 @@
+"""Coalescing of concurrent identical calls.
+
+While a call for a given key is in flight, further calls for the same key
+do not start their own: they wait for the first one and receive its result,
+or its exception. Once it completes the key is free again, so nothing is
+cached beyond the lifetime of the call itself.
+
+:class:`SingleFlight` coordinates threads and :class:`AsyncSingleFlight`
+coroutines on one event loop. Waiters share the very object the call
+returned (for the clients, a single :class:`requests.Response`), so it must
+be treated as read-only.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Counters:
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "executions": self.executions, "collapsed": self.collapsed}
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(_Counters):
+    """Thread-safe single-flight group."""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+            else:
+                self.collapsed += 1
+                leader = False
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class AsyncSingleFlight(_Counters):
+    """Single-flight group for coroutines running on one event loop.
+
+    The shared call runs as its own task, so cancelling one waiter does not
+    cancel it for the others.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._tasks: Dict[Hashable, "asyncio.Task"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.executions += 1
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter was cancelled.
+            task.exception()
@@ -0,0 +1,20 @@
+"""Dependency-free, in-memory stand-in for the LIMS API."""
+
+from lims.standin.app import LimsApp, Reply, Request
+from lims.standin.server import LimsHTTPServer, StandInServer
+from lims.standin.store import BadRequest, Conflict, NotFound, Store, StoreError, Unauthorized, Unprocessable
+
+__all__ = [
+    "BadRequest",
+    "Conflict",
+    "LimsApp",
+    "LimsHTTPServer",
+    "NotFound",
+    "Reply",
+    "Request",
+    "StandInServer",
+    "Store",
+    "StoreError",
+    "Unauthorized",
+    "Unprocessable",
+]
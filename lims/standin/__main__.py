@@ -0,0 +1,48 @@
+"""Run the stand-in LIMS server: ``python -m lims.standin --port 8000 [--faults faults.json] [--quotas quotas.json]``."""
+
+import argparse
+import json
+
+from lims.standin.app import LimsApp
+from lims.standin.faults import Faults
+from lims.standin.quotas import Quotas
+from lims.standin.server import LimsHTTPServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--faults", help="JSON file of per-route fault profiles (see lims.standin.faults)")
+    parser.add_argument("--fault-seed", type=int, help="make injected faults reproducible")
+    parser.add_argument("--quotas", help="JSON file of per-user request quotas (see lims.standin.quotas)")
+    args = parser.parse_args()
+
+    faults = None
+    if args.faults:
+        with open(args.faults) as spec:
+            try:
+                faults = Faults.from_spec(json.load(spec), seed=args.fault_seed)
+            except (TypeError, ValueError) as exc:
+                parser.error(f"--faults: {exc}")
+    quotas = None
+    if args.quotas:
+        with open(args.quotas) as spec:
+            try:
+                quotas = Quotas.from_spec(json.load(spec))
+            except (TypeError, ValueError, IndexError) as exc:
+                parser.error(f"--quotas: {exc}")
+    app = LimsApp(faults=faults, quotas=quotas)
+    httpd = LimsHTTPServer((args.host, args.port), app, verbose=args.verbose)
+    print(f"LIMS stand-in listening on http://{args.host}:{args.port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
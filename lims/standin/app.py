@@ -0,0 +1,615 @@
+"""Request handling for the stand-in LIMS server.
+
+:class:`LimsApp` is transport-agnostic: :meth:`LimsApp.handle` takes the
+parts of an HTTP request and returns a :class:`Reply`, so the same handlers
+serve real sockets (:mod:`lims.standin.server`) and anything that can call
+a Python function.
+"""
+
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import re
+import time
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Pattern, Tuple, Union
+
+from lims import routes
+from lims.standin.faults import FaultProfile, Faults, drip
+from lims.standin.idempotency import IdempotencyTable
+from lims.standin.quotas import ANONYMOUS, Quotas
+from lims.standin.store import (
+    DATE_FILTERS,
+    KEY_FILTERS,
+    CASCADE,
+    TEXT_FIELDS,
+    BadRequest,
+    DateRange,
+    NotFound,
+    Store,
+    StoreError,
+    Unauthorized,
+    timestamp,
+)
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    args: Dict[str, str]
+    query: Dict[str, str]
+    headers: Mapping[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        if not self.body:
+            return None
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            raise BadRequest("body is not valid JSON")
+
+
+class Reply(NamedTuple):
+    """A response; ``body`` is either complete or an iterator of chunks of unknown total length."""
+
+    status: int
+    headers: Dict[str, str]
+    body: Union[bytes, Iterator[bytes]]
+
+
+class Listing(NamedTuple):
+    """Handler payload for list endpoints: ``{"data": [...records], **meta}``, encoded incrementally."""
+
+    records: List[Any]
+    meta: Dict[str, Any] = {}
+
+
+# Handlers return ``(status, payload)`` or ``(status, payload, extra_headers)``.
+Handler = Callable[["LimsApp", Request], Tuple]
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    304: "Not Modified",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    422: "Unprocessable Entity",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+def encode(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def encode_listing(listing: Listing, batch: int = 256) -> Iterator[bytes]:
+    """Encode a :class:`Listing` a batch of records at a time, so the full body never exists at once."""
+    records = listing.records
+    yield b'{"data":['
+    for start in range(0, len(records), batch):
+        chunk = b",".join(encode(record) for record in records[start:start + batch])
+        yield chunk if start == 0 else b"," + chunk
+    yield b"]"
+    for key, value in listing.meta.items():
+        yield b"," + encode(key) + b":" + encode(value)
+    yield b"}"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _compile(route: str) -> Pattern:
+    return re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", route) + "$")
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_SIZE = 1000
+
+
+def encode_cursor(position: Optional[int]) -> Optional[str]:
+    return None if position is None else _b64(str(position).encode())
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise BadRequest("invalid cursor")
+
+
+def _page_size(request: Request) -> int:
+    try:
+        limit = int(request.query.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest("limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise BadRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def _filters(request: Request, table: str) -> Tuple[Dict[str, Any], Dict[str, DateRange]]:
+    """Parse ``?client_code=&analysis_number=`` and ``?<date>_from=&<date>_to=`` (``to`` exclusive)."""
+    equal: Dict[str, Any] = {}
+    for field in KEY_FILTERS.get(table, ()):
+        value = request.query.get(field)
+        if value is None:
+            continue
+        if field.endswith("_number"):
+            try:
+                value = int(value)
+            except ValueError:
+                raise BadRequest(f"{field} must be an integer")
+        equal[field] = value
+    ranges: Dict[str, DateRange] = {}
+    for field in DATE_FILTERS.get(table, ()):
+        bounds = []
+        for name in (f"{field}_from", f"{field}_to"):
+            value = request.query.get(name)
+            try:
+                bounds.append(None if value is None else timestamp(value))
+            except ValueError:
+                raise BadRequest(f"{name} must be an ISO 8601 date")
+        if bounds != [None, None]:
+            ranges[field] = (bounds[0], bounds[1])
+    return equal, ranges
+
+
+def _listing(app: "LimsApp", request: Request, table: str, everything: Callable[[], List[Any]]):
+    """Reply with the whole collection, or with one page when ``limit``/``cursor`` is given.
+
+    Filters (see :func:`_filters`) narrow either through the store's
+    secondary indexes. Pages carry ``next_cursor`` (``null`` on the last page).
+    """
+    equal, ranges = _filters(request, table)
+    paged = "limit" in request.query or "cursor" in request.query
+    limit = _page_size(request) if paged else None
+    cursor = request.query.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+    if equal or ranges:
+        records, resume = app.store.query(table, equal, ranges, limit, after)
+    elif not paged:
+        return 200, Listing(everything())
+    else:
+        records, resume = app.store.page(table, limit, after)
+    if not paged:
+        return 200, Listing(records)
+    return 200, Listing(records, {"next_cursor": encode_cursor(resume)})
+
+
+def _batch(request: Request) -> List[Any]:
+    items = request.json()
+    if not isinstance(items, list) or not items:
+        raise BadRequest("body must be a non-empty JSON array")
+    if len(items) > MAX_BATCH_SIZE:
+        raise BadRequest(f"at most {MAX_BATCH_SIZE} items per batch")
+    return items
+
+
+def _int_arg(request: Request, name: str) -> int:
+    try:
+        return int(request.args[name])
+    except ValueError:
+        raise NotFound(f"{request.path} not found")
+
+
+class LimsApp:
+    """Routes requests for every endpoint the suites exercise onto a :class:`Store`.
+
+    ``token_ttl`` is the ``expires_in`` (seconds) handed out by ``/login``.
+    With ``require_auth`` every other route answers 401 unless the request
+    carries a valid, unexpired ``Authorization: Bearer`` token.
+
+    A create (see ``routes.IDEMPOTENT_ROUTES``) sent with an ``Idempotency-Key``
+    header runs once: its reply is kept in ``idempotency`` and replayed,
+    marked ``Idempotent-Replayed: true``, to any request reusing the key.
+
+    ``faults`` (see :mod:`lims.standin.faults`) injects latency, errors,
+    connection resets and slow bodies per route.
+
+    ``quotas`` (see :mod:`lims.standin.quotas`) rate-limits each caller,
+    answering 429 with ``Retry-After`` once its buckets run dry.
+    """
+
+    def __init__(
+        self,
+        store: Optional[Store] = None,
+        token_ttl: int = 3600,
+        secret: bytes = b"stand-in",
+        require_auth: bool = False,
+        idempotency: Optional[IdempotencyTable] = None,
+        faults: Optional[Faults] = None,
+        quotas: Optional[Quotas] = None,
+    ):
+        self.store = store or Store()
+        self.token_ttl = token_ttl
+        self.secret = secret
+        self.require_auth = require_auth
+        self.idempotency: IdempotencyTable[Reply] = IdempotencyTable() if idempotency is None else idempotency
+        self.faults = Faults() if faults is None else faults
+        self.quotas = quotas
+        self.routes: List[Tuple[str, str, Pattern, Handler]] = []
+        for method, route, handler in ROUTES:
+            self.routes.append((method, route, _compile(route), handler))
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        body: bytes = b"",
+    ) -> Reply:
+        """Route one request; raises :class:`ConnectionResetError` when a fault profile drops it."""
+        method = method.upper()
+        path_matched = False
+        for route_method, route, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            path_matched = True
+            if route_method != method:
+                continue
+            if self.quotas is not None:
+                retry_after = self.quotas.check(self._caller(headers or {}), route)
+                if retry_after is not None:
+                    return self._reply(429, {"error": "quota exceeded"}, {"Retry-After": str(retry_after)})
+            profile = self.faults.match(method, route) if self.faults.profiles else None
+            reply = None if profile is None else self._inject(profile)
+            if reply is None:
+                request = Request(method, path, match.groupdict(), query or {}, headers or {}, body)
+                key = request.headers.get(routes.IDEMPOTENCY_HEADER)
+                if key and method == "POST" and route in routes.IDEMPOTENT_ROUTES:
+                    reply = self._idempotent(key, handler, request)
+                else:
+                    reply = self._dispatch(handler, request)
+            if profile is not None and profile.drip:
+                reply = self._drip(reply, *profile.drip)
+            return reply
+        if path_matched:
+            return self._reply(405, {"error": f"{method} not allowed on {path}"})
+        return self._reply(404, {"error": f"{path} not found"})
+
+    def _caller(self, headers: Mapping[str, str]) -> str:
+        try:
+            return str(self.verify_token(headers.get("Authorization", ""))["sub"])
+        except Unauthorized:
+            return ANONYMOUS
+
+    def _inject(self, profile: FaultProfile) -> Optional[Reply]:
+        """Apply a fault profile's delay and draw; a reply here replaces the handler's."""
+        delay, outcome = self.faults.draw(profile)
+        if delay > 0:
+            time.sleep(delay)
+        if outcome == 0:
+            raise ConnectionResetError("injected connection reset")
+        if outcome is None:
+            return None
+        headers = {"Retry-After": str(profile.retry_after)} if outcome in (429, 503) else None
+        return self._reply(outcome, {"error": "injected fault"}, headers)
+
+    @staticmethod
+    def _drip(reply: Reply, size: int, interval: float) -> Reply:
+        chunks = [reply.body] if isinstance(reply.body, bytes) else reply.body
+        headers = {name: value for name, value in reply.headers.items() if name != "Content-Length"}
+        return Reply(reply.status, headers, drip(chunks, size, interval))
+
+    def _dispatch(self, handler: Handler, request: Request) -> Reply:
+        try:
+            if self.require_auth and handler is not login:
+                self.verify_token(request.headers.get("Authorization", ""))
+            status, payload, *extra = handler(self, request)
+        except StoreError as exc:
+            status, payload, extra = exc.status, {"error": str(exc)}, []
+        except Exception:
+            status, payload, extra = 500, {"error": "internal server error"}, []
+        return self._reply(status, payload, *extra)
+
+    def _idempotent(self, key: str, handler: Handler, request: Request) -> Reply:
+        # Server errors are not kept, so the client's retry runs for real.
+        try:
+            if self.require_auth:
+                self.verify_token(request.headers.get("Authorization", ""))
+            reply, replayed = self.idempotency.run(
+                (request.path, key),
+                hashlib.sha256(request.body).digest(),
+                lambda: self._dispatch(handler, request),
+                keep=lambda reply: reply.status < 500,
+            )
+        except StoreError as exc:
+            return self._reply(exc.status, {"error": str(exc)})
+        if replayed:
+            return reply._replace(headers={**reply.headers, "Idempotent-Replayed": "true"})
+        return reply
+
+    @staticmethod
+    def _reply(status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> Reply:
+        headers = headers or {}
+        if status == 304:
+            return Reply(status, headers, b"")
+        if isinstance(payload, Listing):
+            return Reply(status, {"Content-Type": "application/json", **headers}, encode_listing(payload))
+        body = encode(payload)
+        return Reply(
+            status, {"Content-Type": "application/json", "Content-Length": str(len(body)), **headers}, body
+        )
+
+    def etag(self, table: str) -> str:
+        """Strong validator for everything served from ``table``: changes on every write to it."""
+        return f'"{self.store.epoch}-{table}-{self.store.versions[table]}"'
+
+    def issue_token(self, user: Dict[str, Any]) -> str:
+        """Return an HS256-signed JWT for ``user`` valid for ``token_ttl`` seconds."""
+        now = int(time.time())
+        header = _b64(encode({"alg": "HS256", "typ": "JWT"}))
+        claims = _b64(encode({"sub": user["id"], "iat": now, "exp": now + self.token_ttl}))
+        signing_input = f"{header}.{claims}".encode()
+        signature = _b64(hmac.new(self.secret, signing_input, hashlib.sha256).digest())
+        return f"{header}.{claims}.{signature}"
+
+    def verify_token(self, authorization: str) -> Dict[str, Any]:
+        """Return the claims of a ``Bearer`` token issued by this app, or raise :class:`Unauthorized`."""
+        scheme, _, token = authorization.partition(" ")
+        parts = token.split(".")
+        if scheme != "Bearer" or len(parts) != 3:
+            raise Unauthorized("missing bearer token")
+        signing_input = f"{parts[0]}.{parts[1]}".encode()
+        expected = _b64(hmac.new(self.secret, signing_input, hashlib.sha256).digest())
+        # Compared as bytes: compare_digest refuses non-ASCII str.
+        if not hmac.compare_digest(expected.encode(), parts[2].encode()):
+            raise Unauthorized("invalid token")
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        if claims["exp"] <= time.time():
+            raise Unauthorized("token expired")
+        return claims
+
+
+def _none_match(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: a W/ prefix does not matter.
+    return any(tag.strip().replace("W/", "", 1) == etag for tag in if_none_match.split(","))
+
+
+def conditional(table: str) -> Callable[[Handler], Handler]:
+    """Tag a GET handler's replies with ``table``'s ETag and answer 304 to a matching ``If-None-Match``.
+
+    The handler always runs, so a missing resource is still a 404 (even for
+    ``If-None-Match: *``); only a successful reply carries the tag or is
+    swapped for the 304.
+    """
+
+    def wrap(handler: Handler) -> Handler:
+        @functools.wraps(handler)
+        def handle(app: "LimsApp", request: Request):
+            # Read the version before the data: a write in between yields a
+            # body newer than its tag, which only costs the next caller a 200.
+            etag = app.etag(table)
+            status, payload = handler(app, request)
+            if status != 200:
+                return status, payload
+            if _none_match(request.headers.get("If-None-Match"), etag):
+                return 304, None, {"ETag": etag}
+            return status, payload, {"ETag": etag}
+
+        return handle
+
+    return wrap
+
+
+# Handlers
+
+
+def login(app: LimsApp, request: Request):
+    body = request.json()
+    if not isinstance(body, dict) or not isinstance(body.get("username"), str) or not isinstance(body.get("password"), str):
+        raise BadRequest("username and password are required")
+    user = app.store.authenticate(body["username"], body["password"])
+    if user is None:
+        raise NotFound("invalid credentials")
+    data = {
+        "access_token": app.issue_token(user),
+        "expires_in": app.token_ttl,
+        "user": {"id": user["id"], "name": user["name"], "roles": user["roles"]},
+    }
+    return 200, {"data": data}
+
+
+def list_users(app: LimsApp, request: Request):
+    return _listing(app, request, "users", app.store.list_users)
+
+
+def create_user(app: LimsApp, request: Request):
+    return 201, {"data": app.store.create_user(request.json())}
+
+
+def get_user(app: LimsApp, request: Request):
+    return 200, app.store.get_user(_int_arg(request, "id"))
+
+
+def update_user(app: LimsApp, request: Request):
+    return 200, {"data": app.store.update_user(_int_arg(request, "id"), request.json())}
+
+
+def _delete(app: LimsApp, request: Request, table: str, key: Any, delete_one: Callable[[Any], Dict[str, Any]]):
+    """Delete one row; with ``?mode=cascade|restrict`` go through :meth:`Store.delete` instead.
+
+    Returns the deleted row and extra reply fields: a cascade reports the
+    dependents it removed as ``cascaded``.
+    """
+    mode = request.query.get("mode")
+    if mode is None:
+        return delete_one(key), {}
+    record, removed = app.store.delete(table, key, mode)
+    return record, ({"cascaded": removed} if mode == CASCADE else {})
+
+
+def delete_user(app: LimsApp, request: Request):
+    user, extra = _delete(app, request, "users", _int_arg(request, "id"), app.store.delete_user)
+    return 200, {"deleted": True, "id": user["id"], **extra}
+
+
+@conditional("clients")
+def list_clients(app: LimsApp, request: Request):
+    return _listing(app, request, "clients", app.store.list_clients)
+
+
+def create_client(app: LimsApp, request: Request):
+    return 201, {"data": [app.store.create_client(request.json())]}
+
+
+@conditional("clients")
+def get_client(app: LimsApp, request: Request):
+    return 200, {"data": [app.store.get_client(request.args["client_code"])]}
+
+
+def list_samples(app: LimsApp, request: Request):
+    return _listing(app, request, "samples", app.store.list_samples)
+
+
+def create_sample(app: LimsApp, request: Request):
+    return 201, {"data": app.store.create_sample(request.json())}
+
+
+def create_samples(app: LimsApp, request: Request):
+    return 200, {"data": app.store.create_samples(_batch(request))}
+
+
+def get_sample(app: LimsApp, request: Request):
+    return 200, {"data": app.store.get_sample(_int_arg(request, "sample_number"))}
+
+
+def update_sample(app: LimsApp, request: Request):
+    return 200, {"data": app.store.update_sample(_int_arg(request, "sample_number"), request.json())}
+
+
+def delete_sample(app: LimsApp, request: Request):
+    sample, extra = _delete(app, request, "samples", _int_arg(request, "sample_number"), app.store.delete_sample)
+    return 200, {"deleted": True, "sample_number": sample["sample_number"], **extra}
+
+
+def list_analysis(app: LimsApp, request: Request):
+    return _listing(app, request, "analysis", app.store.list_analysis)
+
+
+def create_analysis(app: LimsApp, request: Request):
+    return 201, {"data": app.store.create_analysis(request.json())}
+
+
+def get_analysis(app: LimsApp, request: Request):
+    return 200, {"data": app.store.get_analysis(_int_arg(request, "analysis_number"))}
+
+
+def list_results(app: LimsApp, request: Request):
+    return _listing(app, request, "results", app.store.list_results)
+
+
+def create_result(app: LimsApp, request: Request):
+    return 201, {"data": app.store.create_result(request.json())}
+
+
+def create_results(app: LimsApp, request: Request):
+    return 200, {"data": app.store.create_results(_batch(request))}
+
+
+def get_result(app: LimsApp, request: Request):
+    return 200, {"data": app.store.get_result(_int_arg(request, "result_number"))}
+
+
+def update_result(app: LimsApp, request: Request):
+    return 200, {"data": app.store.update_result(_int_arg(request, "result_number"), request.json())}
+
+
+def delete_result(app: LimsApp, request: Request):
+    result, extra = _delete(app, request, "results", _int_arg(request, "result_number"), app.store.delete_result)
+    return 200, {"data": {"deleted": True, "analysis_number": result["analysis_number"], **extra}}
+
+
+def list_trials(app: LimsApp, request: Request):
+    return _listing(app, request, "trials", app.store.list_trials)
+
+
+def create_trial(app: LimsApp, request: Request):
+    return 201, {"data": app.store.create_trial(request.json())}
+
+
+def get_trial(app: LimsApp, request: Request):
+    return 200, {"data": app.store.get_trial(_int_arg(request, "trial_number"))}
+
+
+def update_trial(app: LimsApp, request: Request):
+    return 200, {"data": app.store.update_trial(_int_arg(request, "trial_number"), request.json())}
+
+
+def delete_trial(app: LimsApp, request: Request):
+    trial = app.store.delete_trial(_int_arg(request, "trial_number"))
+    return 200, {"deleted": True, "trial_number": trial["trial_number"]}
+
+
+DEFAULT_SEARCH_SIZE = 10
+MAX_SEARCH_SIZE = 100
+
+
+def search(app: LimsApp, request: Request):
+    """``GET /search?q=&in=samples,results&limit=``: ranked ``{"type", "score", "record"}`` hits."""
+    text = request.query.get("q", "").strip()
+    if not text:
+        raise BadRequest("q is required")
+    tables = request.query.get("in", ",".join(TEXT_FIELDS)).split(",")
+    unknown = set(tables) - set(TEXT_FIELDS)
+    if unknown:
+        raise BadRequest(f"cannot search {', '.join(sorted(unknown))}")
+    try:
+        limit = int(request.query.get("limit", DEFAULT_SEARCH_SIZE))
+    except ValueError:
+        raise BadRequest("limit must be an integer")
+    if not 1 <= limit <= MAX_SEARCH_SIZE:
+        raise BadRequest(f"limit must be between 1 and {MAX_SEARCH_SIZE}")
+    hits = app.store.search(text, tables, limit)
+    return 200, {"data": [{"type": table, "score": round(score, 4), "record": record} for table, record, score in hits]}
+
+
+ROUTES: List[Tuple[str, str, Handler]] = [
+    ("POST", routes.LOGIN, login),
+    ("GET", routes.USERS, list_users),
+    ("POST", routes.USERS, create_user),
+    ("GET", routes.USER, get_user),
+    ("PATCH", routes.USER, update_user),
+    ("DELETE", routes.USER, delete_user),
+    ("GET", routes.CLIENTS, list_clients),
+    ("POST", routes.CLIENTS, create_client),
+    ("GET", routes.CLIENT, get_client),
+    ("GET", routes.SAMPLES, list_samples),
+    ("POST", routes.SAMPLES, create_sample),
+    ("POST", routes.SAMPLES_BATCH, create_samples),
+    ("GET", routes.SAMPLE, get_sample),
+    ("PATCH", routes.SAMPLE, update_sample),
+    ("DELETE", routes.SAMPLE, delete_sample),
+    ("GET", routes.ANALYSIS_LIST, list_analysis),
+    ("POST", routes.ANALYSIS_LIST, create_analysis),
+    ("GET", routes.ANALYSIS, get_analysis),
+    ("GET", routes.RESULTS, list_results),
+    ("POST", routes.RESULTS, create_result),
+    ("POST", routes.RESULTS_BATCH, create_results),
+    ("GET", routes.RESULT, get_result),
+    ("PATCH", routes.RESULT, update_result),
+    ("DELETE", routes.RESULT, delete_result),
+    ("GET", routes.TRIALS, list_trials),
+    ("POST", routes.TRIALS, create_trial),
+    ("GET", routes.TRIAL, get_trial),
+    ("PATCH", routes.TRIAL, update_trial),
+    ("DELETE", routes.TRIAL, delete_trial),
+    ("GET", routes.SEARCH, search),
+]
@@ -0,0 +1,179 @@
+"""Fault and latency injection for the stand-in server.
+
+:class:`Faults` maps route templates, optionally per method, to a
+:class:`FaultProfile`. Before a matching request reaches its handler the
+app:
+
+1. waits for a delay drawn from the profile's latency distribution
+   (:class:`Fixed`, :class:`Normal` or :class:`LongTail`);
+2. with probability ``reset_rate`` drops the connection without replying
+   (raises :class:`ConnectionResetError`, which the transports turn into
+   a reset);
+3. otherwise picks an injected status from ``errors`` (e.g.
+   ``{503: 0.02, 429: 0.05}``), answering it instead of running the
+   handler; 429 and 503 carry ``Retry-After``.
+
+A profile with ``drip=(chunk_size, interval)`` also slows down the body
+of whatever reply goes out, sending ``chunk_size`` bytes per ``interval``.
+
+Profiles can be described as JSON, which ``python -m lims.standin --faults``
+loads through :meth:`Faults.from_spec`::
+
+    {
+      "GET /results/{result_number}": {"latency": {"long_tail": [0.01, 0.5]}, "errors": {"503": 0.05}},
+      "/samples": {"latency": 0.02, "reset_rate": 0.01, "drip": [256, 0.005]}
+    }
+"""
+
+import math
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# Standard normal quantile of the 99th percentile.
+_Z99 = 2.3263478740408408
+
+
+class Latency(ABC):
+    @abstractmethod
+    def sample(self, rng: random.Random) -> float:
+        """One delay, in seconds."""
+
+
+class Fixed(Latency):
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+class Normal(Latency):
+    """Gaussian delay, clipped at zero."""
+
+    def __init__(self, mean: float, stddev: float):
+        self.mean = mean
+        self.stddev = stddev
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, rng.gauss(self.mean, self.stddev))
+
+
+class LongTail(Latency):
+    """Log-normal delay given by its median and 99th percentile, optionally capped at ``max``."""
+
+    def __init__(self, median: float, p99: float, max: Optional[float] = None):
+        self.median = median
+        self.p99 = p99
+        self.max = max
+        self._mu = math.log(median)
+        self._sigma = math.log(p99 / median) / _Z99
+
+    def sample(self, rng: random.Random) -> float:
+        delay = rng.lognormvariate(self._mu, self._sigma)
+        return delay if self.max is None else min(delay, self.max)
+
+
+class FaultProfile:
+    def __init__(
+        self,
+        latency: Union[float, Latency] = 0.0,
+        errors: Optional[Dict[int, float]] = None,
+        reset_rate: float = 0.0,
+        drip: Optional[Tuple[int, float]] = None,
+        retry_after: int = 1,
+    ):
+        self.latency = latency if isinstance(latency, Latency) else Fixed(latency)
+        self.errors = dict(errors or {})
+        if sum(self.errors.values()) + reset_rate > 1:
+            raise ValueError("error and reset probabilities add up to more than 1")
+        self.reset_rate = reset_rate
+        self.drip = drip
+        self.retry_after = retry_after
+
+    def draw(self, rng: random.Random) -> Tuple[float, Optional[int]]:
+        """Return ``(delay, outcome)``: ``outcome`` is ``0`` for a reset, a status to inject, or ``None``."""
+        delay = self.latency.sample(rng)
+        roll = rng.random()
+        if roll < self.reset_rate:
+            return delay, 0
+        roll -= self.reset_rate
+        for status, probability in self.errors.items():
+            if roll < probability:
+                return delay, status
+            roll -= probability
+        return delay, None
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "FaultProfile":
+        return cls(
+            latency=_latency(spec.get("latency", 0.0)),
+            errors={int(status): float(p) for status, p in spec.get("errors", {}).items()},
+            reset_rate=float(spec.get("reset_rate", 0.0)),
+            drip=tuple(spec["drip"]) if "drip" in spec else None,
+            retry_after=int(spec.get("retry_after", 1)),
+        )
+
+
+def _latency(spec: Any) -> Latency:
+    if isinstance(spec, (int, float)):
+        return Fixed(float(spec))
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise ValueError(f"invalid latency: {spec!r}")
+    (kind, params), = spec.items()
+    params = params if isinstance(params, list) else [params]
+    kinds = {"fixed": Fixed, "normal": Normal, "long_tail": LongTail}
+    if kind not in kinds:
+        raise ValueError(f"unknown latency distribution: {kind}")
+    return kinds[kind](*params)
+
+
+def drip(chunks: Iterable[bytes], size: int, interval: float) -> Iterator[bytes]:
+    """Re-send ``chunks`` as ``size``-byte pieces, one every ``interval`` seconds."""
+    for chunk in chunks:
+        for start in range(0, len(chunk), size):
+            time.sleep(interval)
+            yield chunk[start:start + size]
+
+
+class Faults:
+    """Per-route fault profiles; ``method=None`` applies a profile to every method of the route."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.profiles: Dict[Tuple[Optional[str], str], FaultProfile] = {}
+        self.injected: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Dict[str, Any]], seed: Optional[int] = None) -> "Faults":
+        """Build from ``{"[METHOD ]/route/template": profile spec}``; see the module docstring."""
+        faults = cls(seed)
+        for target, profile in spec.items():
+            method, _, route = target.rpartition(" ")
+            faults.set(route, FaultProfile.from_spec(profile), method.upper() or None)
+        return faults
+
+    def set(self, route: str, profile: FaultProfile, method: Optional[str] = None) -> None:
+        self.profiles[(method, route)] = profile
+
+    def clear(self, route: Optional[str] = None) -> None:
+        if route is None:
+            self.profiles.clear()
+            return
+        for key in [key for key in self.profiles if key[1] == route]:
+            del self.profiles[key]
+
+    def match(self, method: str, route: str) -> Optional[FaultProfile]:
+        return self.profiles.get((method, route)) or self.profiles.get((None, route))
+
+    def draw(self, profile: FaultProfile) -> Tuple[float, Optional[int]]:
+        """:meth:`FaultProfile.draw` from the shared, optionally seeded, generator; counts what it injects."""
+        with self._lock:
+            delay, outcome = profile.draw(self.rng)
+            if outcome is not None:
+                name = "reset" if outcome == 0 else str(outcome)
+                self.injected[name] = self.injected.get(name, 0) + 1
+        return delay, outcome
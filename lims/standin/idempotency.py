@@ -0,0 +1,81 @@
+"""Idempotency-key table for replaying create requests.
+
+The first request carrying a given key runs; its reply is kept for ``ttl``
+seconds (at most ``maxsize`` keys, oldest dropped first) and any later
+request with the same key gets that reply back instead of running again.
+A request that arrives while the first is still running waits for it.
+Replies the caller does not want kept (server errors) free the key again,
+so a retry after a 500 is executed afresh. Reusing a key for a different
+request body is rejected.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from lims.standin.store import Unprocessable
+
+T = TypeVar("T")
+
+
+class _Slot(Generic[T]):
+    __slots__ = ("fingerprint", "done", "value", "expires_at")
+
+    def __init__(self, fingerprint: Hashable):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.value: Optional[T] = None
+        self.expires_at = float("inf")
+
+
+class IdempotencyTable(Generic[T]):
+    def __init__(self, maxsize: int = 10000, ttl: float = 24 * 3600, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._slots: "OrderedDict[Hashable, _Slot[T]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.replays = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def run(
+        self, key: Hashable, fingerprint: Hashable, produce: Callable[[], T], keep: Callable[[T], bool]
+    ) -> Tuple[T, bool]:
+        """Return ``(value, replayed)``: the kept value for ``key``, or ``produce()`` run once."""
+        while True:
+            with self._lock:
+                slot = self._slots.get(key)
+                if slot is not None and slot.expires_at <= self.clock():
+                    del self._slots[key]
+                    slot = None
+                owner = slot is None
+                if owner:
+                    slot = self._slots[key] = _Slot(fingerprint)
+                    while len(self._slots) > self.maxsize:
+                        self._slots.popitem(last=False)
+            if slot.fingerprint != fingerprint:
+                raise Unprocessable("idempotency key reused with a different request")
+            if not owner:
+                slot.done.wait()
+                if slot.value is None:
+                    # The first request was not kept: run this one afresh.
+                    continue
+                with self._lock:
+                    self.replays += 1
+                return slot.value, True
+
+            value: Optional[T] = None
+            try:
+                value = produce()
+                return value, False
+            finally:
+                with self._lock:
+                    if value is not None and keep(value):
+                        slot.value = value
+                        slot.expires_at = self.clock() + self.ttl
+                    elif self._slots.get(key) is slot:
+                        del self._slots[key]
+                slot.done.set()
@@ -0,0 +1,254 @@
+"""Secondary index structures for the stand-in store.
+
+Writers to different rows of one table may update the same index at
+once, so each index guards its own mutations (and the reads that must
+see its list and dict agree) with a short internal lock.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class OrderedIndex:
+    """Primary keys kept in creation order for keyset pagination.
+
+    Each key is filed under a monotonically assigned integer ``seq`` (the
+    primary key itself for numbered resources), so appends are O(1) and a
+    page after a given ``seq`` is a bisect plus a slice: O(log n + page size)
+    no matter how deep into the collection it starts.
+    """
+
+    def __init__(self):
+        self._seqs: List[int] = []
+        self._keys: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._seqs)
+
+    def add(self, seq: int, key: Any) -> None:
+        with self._lock:
+            if not self._seqs or seq > self._seqs[-1]:
+                self._seqs.append(seq)
+            else:
+                bisect.insort(self._seqs, seq)
+            self._keys[seq] = key
+
+    def remove(self, seq: int) -> None:
+        with self._lock:
+            index = bisect.bisect_left(self._seqs, seq)
+            if index < len(self._seqs) and self._seqs[index] == seq:
+                del self._seqs[index]
+                del self._keys[seq]
+
+    def page(self, after: Optional[int], limit: int) -> Tuple[List[Any], Optional[int]]:
+        """Return up to ``limit`` keys filed after ``after`` and the seq to resume from.
+
+        The resume seq is ``None`` once the end of the index is reached.
+        """
+        with self._lock:
+            start = 0 if after is None else bisect.bisect_right(self._seqs, after)
+            seqs = self._seqs[start:start + limit]
+            more = start + limit < len(self._seqs)
+        keys = self._keys
+        # A concurrent delete may drop a key between the slice and the lookup.
+        found = [key for key in map(keys.get, seqs) if key is not None]
+        return found, (seqs[-1] if seqs and more else None)
+
+
+class HashIndex:
+    """Primary keys grouped by the value of one field: equality lookups in O(1 + k).
+
+    Each value's keys are an :class:`OrderedIndex` of their own, so they
+    come out in creation order and a scan can resume after a cursor key
+    with a bisect instead of re-reading every match.
+    """
+
+    def __init__(self):
+        self._keys: Dict[Any, OrderedIndex] = {}
+        self._lock = threading.Lock()
+
+    def add(self, value: Any, key: int) -> None:
+        with self._lock:
+            keys = self._keys.get(value)
+            if keys is None:
+                keys = self._keys[value] = OrderedIndex()
+            keys.add(key, key)
+
+    def remove(self, value: Any, key: int) -> None:
+        with self._lock:
+            keys = self._keys.get(value)
+            if keys is not None:
+                keys.remove(key)
+                if not len(keys):
+                    del self._keys[value]
+
+    def count(self, value: Any) -> int:
+        keys = self._keys.get(value)
+        return 0 if keys is None else len(keys)
+
+    def find(self, value: Any) -> List[Any]:
+        """Every key with ``value``, in creation order."""
+        keys = self._keys.get(value)
+        return [] if keys is None else keys.page(None, len(keys) + 1)[0]
+
+    def page(self, value: Any, after: Optional[int], limit: int) -> Tuple[List[Any], Optional[int]]:
+        """Up to ``limit`` keys with ``value`` after key ``after``; paged like :meth:`OrderedIndex.page`."""
+        keys = self._keys.get(value)
+        return ([], None) if keys is None else keys.page(after, limit)
+
+
+class SortedIndex:
+    """``(value, key)`` pairs kept in value order for range scans.
+
+    A range is located with two bisects and read as a slice, so counting it
+    is O(log n) and fetching it O(log n + k).
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[Any, Any]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, value: Any, key: Any) -> None:
+        entry = (value, key)
+        with self._lock:
+            if not self._entries or entry > self._entries[-1]:
+                self._entries.append(entry)
+            else:
+                bisect.insort(self._entries, entry)
+
+    def remove(self, value: Any, key: Any) -> None:
+        entry = (value, key)
+        with self._lock:
+            index = bisect.bisect_left(self._entries, entry)
+            if index < len(self._entries) and self._entries[index] == entry:
+                del self._entries[index]
+
+    def _bounds(self, low: Optional[Any], high: Optional[Any]) -> Tuple[int, int]:
+        # ``(value,)`` sorts before every ``(value, key)``, so both bounds land
+        # on the first entry with that value: ``low`` is inclusive, ``high`` not.
+        start = 0 if low is None else bisect.bisect_left(self._entries, (low,))
+        end = len(self._entries) if high is None else bisect.bisect_left(self._entries, (high,))
+        return start, max(start, end)
+
+    def count(self, low: Optional[Any] = None, high: Optional[Any] = None) -> int:
+        with self._lock:
+            start, end = self._bounds(low, high)
+        return end - start
+
+    def find(self, low: Optional[Any] = None, high: Optional[Any] = None) -> List[Any]:
+        """Keys whose value is in ``[low, high)``; ``None`` leaves that end open."""
+        with self._lock:
+            start, end = self._bounds(low, high)
+            entries = self._entries[start:end]
+        return [key for _, key in entries]
+
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of ``text`` with accents removed, so ``Microbiológico`` matches ``microbiologico``."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return _WORD.findall("".join(char for char in folded if not unicodedata.combining(char)))
+
+
+class InvertedIndex:
+    """Full-text index: term -> {key: occurrences}, ranked with BM25.
+
+    Terms are also kept in a sorted list, so a prefix query (``micro*``)
+    expands to its terms with two bisects. Documents are replaced or
+    removed as a whole with :meth:`add` and :meth:`remove`.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Any, int]] = {}
+        self._terms: List[str] = []
+        self._documents: Dict[Any, Dict[str, int]] = {}
+        self._lengths: Dict[Any, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, key: Any, text: str) -> None:
+        counts: Dict[str, int] = {}
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0) + 1
+        with self._lock:
+            self._remove(key)
+            self._add(key, counts)
+
+    def _add(self, key: Any, counts: Dict[str, int]) -> None:
+        for term, count in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            postings[key] = count
+        self._documents[key] = counts
+        self._lengths[key] = sum(counts.values())
+        self._total_length += self._lengths[key]
+
+    def remove(self, key: Any) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: Any) -> None:
+        counts = self._documents.pop(key, None)
+        if counts is None:
+            return
+        self._total_length -= self._lengths.pop(key)
+        for term in counts:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def expand(self, prefix: str) -> List[str]:
+        """Every indexed term starting with ``prefix``."""
+        with self._lock:
+            start = bisect.bisect_left(self._terms, prefix)
+            end = bisect.bisect_left(self._terms, prefix + "\U0010ffff")
+            return self._terms[start:end]
+
+    def _terms_of(self, query: str) -> Iterable[str]:
+        for word in query.split():
+            prefix = word.endswith("*")
+            for term in tokenize(word):
+                yield from self.expand(term) if prefix else (term,)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Any, float]]:
+        """The ``limit`` best ``(key, score)`` pairs for ``query``, best first.
+
+        Query words are OR-ed; documents matching more (and rarer) words
+        score higher. A word ending in ``*`` matches every term it prefixes.
+        """
+        documents = len(self._documents)
+        if not documents:
+            return []
+        average = self._total_length / documents
+        scores: Dict[Any, float] = {}
+        for term in set(self._terms_of(query)):
+            # Snapshot: writers may change the postings while we read them.
+            postings = list(self._postings.get(term, {}).items())
+            idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, count in postings:
+                length = self._lengths.get(key, average)
+                norm = count + self.K1 * (1 - self.B + self.B * length / average)
+                scores[key] = scores.get(key, 0.0) + idf * count * (self.K1 + 1) / norm
+        # Stable: equal scores keep the order in which documents were first matched.
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
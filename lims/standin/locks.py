@@ -0,0 +1,42 @@
+"""Sharded write locks for the stand-in store.
+
+Every lockable namespace (a table's primary keys, or a unique secondary key
+such as usernames) is split into ``shards`` re-entrant locks, and a key is
+guarded by the shard its hash falls into. Writers touching different keys
+almost never share a shard, so they run in parallel; writers touching the
+same key always do, so they serialise.
+
+:meth:`ShardedLocks.hold` takes a set of ``(namespace, key)`` slots in one
+global order (namespace order first, then shard number). A writer may hold
+more locks later only if they all come after the ones it already holds;
+the store's cascades rely on this, descending from parent to child tables.
+"""
+
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+DEFAULT_SHARDS = 64
+
+Slot = Tuple[str, Any]
+
+
+class ShardedLocks:
+    def __init__(self, namespaces: Sequence[str], shards: int = DEFAULT_SHARDS):
+        self.shards = shards
+        self._rank = {namespace: rank for rank, namespace in enumerate(namespaces)}
+        self._locks: List[List[threading.RLock]] = [
+            [threading.RLock() for _ in range(shards)] for _ in namespaces
+        ]
+
+    def shard(self, namespace: str, key: Any) -> Tuple[int, int]:
+        """Position of ``key``'s lock in the global order."""
+        return self._rank[namespace], hash(key) % self.shards
+
+    @contextmanager
+    def hold(self, slots: Iterable[Slot]) -> Iterator[None]:
+        """Hold the locks guarding ``slots``, acquired in the global order."""
+        with ExitStack() as stack:
+            for rank, shard in sorted({self.shard(namespace, key) for namespace, key in slots}):
+                stack.enter_context(self._locks[rank][shard])
+            yield
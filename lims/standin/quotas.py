@@ -0,0 +1,70 @@
+"""Per-user request quotas for the stand-in server, as the LIMS gateway enforces them.
+
+Every caller (the ``sub`` of its bearer token, or ``anonymous``) gets a
+token bucket of ``rate`` requests per second with bursts of ``burst``, and
+one more per route template listed in ``limits``. A request that finds any
+of its buckets empty is answered ``429 Too Many Requests`` with a
+``Retry-After`` (whole seconds) telling when a token will be available;
+rejected requests do not spend tokens.
+
+The buckets are :class:`lims.ratelimit.TokenBucket`, the same ones the
+client's :class:`~lims.ratelimit.RateLimiter` uses, so a client configured
+with the server's quota stays just under it.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lims.ratelimit import Limit, TokenBucket
+
+ANONYMOUS = "anonymous"
+
+
+class Quotas:
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        limits: Optional[Dict[str, Limit]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.limits = dict(limits or {})
+        self.clock = clock
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, List[float]]) -> "Quotas":
+        """Build from ``{"*": [rate, burst], "/route/template": [rate, burst]}``; ``burst`` may be left out."""
+        limits = {route: (float(limit[0]), float(limit[1]) if len(limit) > 1 else None) for route, limit in spec.items()}
+        rate, burst = limits.pop("*", (None, None))
+        return cls(rate, burst, limits)
+
+    def _bucket(self, caller: str, route: Optional[str], rate: float, burst: Optional[float]) -> TokenBucket:
+        bucket = self._buckets.get((caller, route))
+        if bucket is None:
+            bucket = self._buckets[(caller, route)] = TokenBucket(rate, burst, self.clock)
+        return bucket
+
+    def check(self, caller: str, route: str) -> Optional[int]:
+        """Spend a token from each of the caller's buckets for ``route``; or return the ``Retry-After``."""
+        with self._lock:
+            buckets = []
+            if self.rate is not None:
+                buckets.append(self._bucket(caller, None, self.rate, self.burst))
+            if route in self.limits:
+                buckets.append(self._bucket(caller, route, *self.limits[route]))
+            wait = max((bucket.available_in() for bucket in buckets), default=0.0)
+            if wait > 0:
+                self.rejected[caller] = self.rejected.get(caller, 0) + 1
+                return max(1, math.ceil(wait))
+            for bucket in buckets:
+                bucket.try_acquire()
+            self.admitted += 1
+            return None
@@ -0,0 +1,103 @@
+"""Serve a :class:`~lims.standin.app.LimsApp` over real HTTP.
+
+Built on :mod:`http.server` only. Connections are HTTP/1.1 keep-alive so a
+pooled client reuses them, and every connection gets its own thread.
+"""
+
+import socket
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from lims.standin.app import REASONS, LimsApp
+
+
+class LimsRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer the status line, headers and body into one write per reply and
+    # send it immediately; separate small writes stall on delayed ACKs.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    server: "LimsHTTPServer"
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            reply = self.server.app.handle(
+                self.command, url.path, dict(parse_qsl(url.query)), self.headers, body
+            )
+        except ConnectionResetError:
+            self._reset()
+            return
+        self.send_response(reply.status, REASONS.get(reply.status))
+        for name, value in reply.headers.items():
+            self.send_header(name, value)
+        if isinstance(reply.body, bytes):
+            self.end_headers()
+            self.wfile.write(reply.body)
+            return
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in reply.body:
+            if chunk:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _reset(self) -> None:
+        """Drop the connection with a TCP RST instead of a reply."""
+        self.close_connection = True
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.connection.close()
+
+    do_GET = do_POST = do_PATCH = do_DELETE = do_PUT = _dispatch
+
+    def log_message(self, format, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class LimsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], app: LimsApp, verbose: bool = False):
+        super().__init__(address, LimsRequestHandler)
+        self.app = app
+        self.verbose = verbose
+
+
+class StandInServer:
+    """Run the stand-in on a background thread for the duration of a ``with`` block.
+
+    Port 0 picks a free port; the bound address is available as ``url``.
+    """
+
+    def __init__(self, app: Optional[LimsApp] = None, host: str = "127.0.0.1", port: int = 0):
+        self.app = app or LimsApp()
+        self.httpd = LimsHTTPServer((host, port), self.app)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
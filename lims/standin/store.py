@@ -0,0 +1,751 @@
+"""In-memory storage behind the stand-in LIMS server.
+
+Every collection is a dict keyed by its primary key (``id``, ``client_code``,
+``sample_number``, ``analysis_number``, ``result_number``, ``trial_number``),
+so lookups, updates and deletes are O(1). Records are plain dicts that are
+never mutated in place: an update stores a new dict, which lets readers hand
+records straight to the JSON encoder without copying them.
+
+Samples, results and trials also keep secondary indexes (see
+:mod:`lims.standin.indexes`) on the fields the list endpoints filter by:
+hash indexes for keys and sorted indexes for dates. Sample descriptions
+and observations and result texts feed an inverted index for search.
+
+Writers lock single rows, not tables: see :class:`Store` and
+:mod:`lims.standin.locks`.
+"""
+
+import functools
+import heapq
+import itertools
+import secrets
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lims.standin.indexes import HashIndex, InvertedIndex, OrderedIndex, SortedIndex
+from lims.standin.locks import ShardedLocks
+
+
+class StoreError(Exception):
+    """Base class for errors that map onto an HTTP status."""
+
+    status = 500
+
+
+class BadRequest(StoreError):
+    status = 400
+
+
+class Unauthorized(StoreError):
+    status = 401
+
+
+class NotFound(StoreError):
+    status = 404
+
+
+class Conflict(StoreError):
+    status = 409
+
+
+class Unprocessable(StoreError):
+    status = 422
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_str(value: Any) -> bool:
+    return isinstance(value, str) and value != ""
+
+
+def _is_key(value: Any) -> bool:
+    return _is_int(value) or _is_str(value)
+
+
+def timestamp(value: str) -> float:
+    """POSIX time of an ISO 8601 date or datetime; values without an offset are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _is_date(value: Any) -> bool:
+    if not _is_str(value):
+        return False
+    try:
+        timestamp(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_roles(value: Any) -> bool:
+    return isinstance(value, list) and all(_is_str(role) for role in value)
+
+
+Schema = Dict[str, Callable[[Any], bool]]
+
+USER_SCHEMA: Schema = {"name": _is_str, "username": _is_str, "password": _is_str, "roles": _is_roles}
+USER_PATCH: Schema = {"name": _is_str, "username": _is_str, "password": _is_str, "roles": _is_roles}
+
+CLIENT_SCHEMA: Schema = {"name": _is_str}
+CLIENT_OPTIONAL: Schema = {"contact": _is_str, "phoneNumber": _is_int, "email": _is_str, "addres": _is_str}
+
+SAMPLE_SCHEMA: Schema = {
+    "client_code": _is_key,
+    "entry_date": _is_date,
+    "description": _is_str,
+    "sampling_date": _is_date,
+    "observations": _is_str,
+    "analysis_quantity": _is_int,
+}
+SAMPLE_PATCH: Schema = {
+    "entry_date": _is_date,
+    "description": _is_str,
+    "sampling_date": _is_date,
+    "observations": _is_str,
+    "analysis_quantity": _is_int,
+}
+
+ANALYSIS_SCHEMA: Schema = {
+    "id_user": _is_int,
+    "sample_number": _is_int,
+    "client_code": _is_key,
+    "sow_date": _is_date,
+    "type_analysis": _is_str,
+}
+
+RESULT_SCHEMA: Schema = {
+    "analysis_number": _is_int,
+    "sample_number": _is_int,
+    "id_user": _is_int,
+    "client_code": _is_key,
+    "result_date": _is_date,
+    "result": _is_str,
+}
+RESULT_PATCH: Schema = {"result_date": _is_date, "result": _is_str}
+
+TRIAL_SCHEMA: Schema = {
+    "analysis_number": _is_int,
+    "sample_number": _is_int,
+    "result_number": _is_int,
+    "emission_date": _is_date,
+}
+TRIAL_OPTIONAL: Schema = {"id_role": _is_int, "id_user": _is_int, "client_code": _is_key}
+TRIAL_PATCH: Schema = {"emission_date": _is_date}
+
+
+def validate(body: Any, required: Schema, optional: Optional[Schema] = None) -> Dict[str, Any]:
+    """Check a create body: every required field present and well-typed."""
+    if not isinstance(body, dict):
+        raise BadRequest("body must be a JSON object")
+    optional = optional or {}
+    unknown = set(body) - set(required) - set(optional)
+    if unknown:
+        raise BadRequest(f"unknown fields: {', '.join(sorted(unknown))}")
+    for field, check in required.items():
+        if field not in body:
+            raise BadRequest(f"missing field: {field}")
+        if not check(body[field]):
+            raise BadRequest(f"invalid field: {field}")
+    for field, check in optional.items():
+        if field in body and not check(body[field]):
+            raise BadRequest(f"invalid field: {field}")
+    return body
+
+
+def validate_patch(body: Any, allowed: Schema) -> Dict[str, Any]:
+    """Check a PATCH body: non-empty and made only of known, well-typed fields."""
+    if not isinstance(body, dict) or not body:
+        raise BadRequest("body must be a non-empty JSON object")
+    return validate(body, {}, allowed)
+
+
+TABLES = ("users", "clients", "samples", "analysis", "results", "trials")
+
+# Filters accepted by the list endpoints: equality on keys, ranges on dates.
+KEY_FILTERS = {
+    "samples": ("client_code",),
+    "results": ("client_code", "analysis_number"),
+    "trials": ("client_code", "analysis_number"),
+}
+DATE_FILTERS = {
+    "samples": ("entry_date", "sampling_date"),
+    "results": ("result_date",),
+    "trials": ("emission_date",),
+}
+
+ROW_NAMES = {
+    "users": "user",
+    "clients": "client",
+    "samples": "sample",
+    "analysis": "analysis",
+    "results": "result",
+    "trials": "trial",
+}
+
+# Foreign keys that make a row depend on another: table -> field -> referenced
+# table (by primary key). Creates check every one of them, and deletes follow
+# every one of them back through a reverse index, so no column can dangle.
+FOREIGN_KEYS = {
+    "samples": {"client_code": "clients"},
+    "analysis": {"sample_number": "samples", "client_code": "clients", "id_user": "users"},
+    "results": {"analysis_number": "analysis", "sample_number": "samples", "client_code": "clients", "id_user": "users"},
+    "trials": {
+        "analysis_number": "analysis",
+        "sample_number": "samples",
+        "result_number": "results",
+        "client_code": "clients",
+        "id_user": "users",
+    },
+}
+
+
+# Lock namespaces in acquisition order: a unique name before the row it
+# names, and parent tables before the tables that reference them.
+LOCK_NAMESPACES = ("usernames", "users", "client_names", "clients", "samples", "analysis", "results", "trials")
+
+# DELETE modes: remove every dependent row too, or refuse while there are any.
+CASCADE = "cascade"
+RESTRICT = "restrict"
+DELETE_MODES = (CASCADE, RESTRICT)
+
+# Free-text fields behind GET /search.
+TEXT_FIELDS = {
+    "samples": ("description", "observations"),
+    "results": ("result",),
+}
+
+DateRange = Tuple[Optional[float], Optional[float]]
+
+
+_PRIMARY_KEYS = {"samples": "sample_number", "results": "result_number", "trials": "trial_number"}
+
+
+# Keys read per step when a key-index scan has no page size to go by.
+QUERY_CHUNK = 1024
+
+
+def _sorted_after(index: SortedIndex, bounds: DateRange, after: Optional[Any]) -> List[Any]:
+    # Numbered resources are filed in creation order under their own key.
+    return sorted(key for key in index.find(*bounds) if after is None or key > after)
+
+
+def _within(value: float, bounds: DateRange) -> bool:
+    low, high = bounds
+    return (low is None or value >= low) and (high is None or value < high)
+
+
+class Store:
+    """Dict-indexed collections for every LIMS resource.
+
+    Writers lock the rows they touch through the sharded ``locks``: an
+    update or delete holds its row's primary key, a create holds the rows
+    its foreign keys point at (so none of them can be deleted before the
+    insert; for tenant-scoped rows this includes the ``client_code``) and
+    then its new key, and usernames and client names are locked as unique
+    keys of their own. Writers to different rows, even of the same table,
+    run in parallel. Readers take no lock and rely on records being
+    replaced rather than mutated.
+    """
+
+    def __init__(self):
+        self.locks = ShardedLocks(LOCK_NAMESPACES)
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self.passwords: Dict[int, str] = {}
+        self.clients: Dict[Any, Dict[str, Any]] = {}
+        self.samples: Dict[int, Dict[str, Any]] = {}
+        self.analysis: Dict[int, Dict[str, Any]] = {}
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.trials: Dict[int, Dict[str, Any]] = {}
+        # Secondary unique keys.
+        self.user_by_username: Dict[str, int] = {}
+        self.client_by_name: Dict[str, Any] = {}
+        self.result_by_analysis: Dict[int, int] = {}
+        self._ids = {name: itertools.count(1) for name in TABLES}
+        # Creation order per collection, for paging.
+        self.order = {name: OrderedIndex() for name in TABLES}
+        # Secondary indexes behind the list filters; dates are filed by timestamp.
+        self.key_indexes = {table: {field: HashIndex() for field in fields} for table, fields in KEY_FILTERS.items()}
+        self.date_indexes = {table: {field: SortedIndex() for field in fields} for table, fields in DATE_FILTERS.items()}
+        self.text_indexes = {table: InvertedIndex() for table in TEXT_FIELDS}
+        # Reverse references (child table -> field -> parent key -> child keys) for deletes.
+        self.referrers = {table: {field: HashIndex() for field in fields} for table, fields in FOREIGN_KEYS.items()}
+        # Bumped on every write to a collection; ETags are derived from it.
+        # The random epoch keeps a restarted store from reusing old versions.
+        self.epoch = secrets.token_hex(4)
+        self.versions = dict.fromkeys(TABLES, 0)
+        self._versions_lock = threading.Lock()
+
+    @contextmanager
+    def _holding(self, table: str, key: Any, username: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Hold the lock of row ``key`` of ``table`` and yield the row as it stands under it.
+
+        A user's current username is locked with it, and ``username`` too
+        when renaming; if the username changes before the locks are taken,
+        they are taken again.
+        """
+        records = getattr(self, table)
+        while True:
+            seen = self._get(records, key, ROW_NAMES[table])
+            slots = [(table, key)]
+            if table == "users":
+                slots += [("usernames", name) for name in (seen["username"], username) if name is not None]
+            with self.locks.hold(slots):
+                record = self._get(records, key, ROW_NAMES[table])
+                if table != "users" or record["username"] == seen["username"]:
+                    yield record
+                    return
+
+    @contextmanager
+    def _referencing(self, table: str, record: Dict[str, Any]) -> Iterator[None]:
+        """Hold the rows ``record``'s foreign keys point at, once they are known to exist."""
+        parents = [(parent, record[field]) for field, parent in FOREIGN_KEYS[table].items() if field in record]
+        with self.locks.hold(parents):
+            self._check_references(table, record)
+            yield
+
+    def _check_references(self, table: str, record: Dict[str, Any]) -> None:
+        """Raise :class:`Conflict` unless every foreign key of ``record`` exists; one dict probe each."""
+        for field, parent in FOREIGN_KEYS[table].items():
+            if field in record and record[field] not in getattr(self, parent):
+                raise Conflict(f"{ROW_NAMES[parent]} {record[field]} does not exist")
+
+    def _changed(self, table: str) -> None:
+        with self._versions_lock:
+            self.versions[table] += 1
+
+    def _next_id(self, table: str) -> int:
+        return next(self._ids[table])
+
+    def _index(self, table: str, key: Any, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        """Move ``key`` in the secondary indexes of ``table`` from ``old``'s values to ``new``'s."""
+        hashed = itertools.chain(self.key_indexes.get(table, {}).items(), self.referrers.get(table, {}).items())
+        for field, index in hashed:
+            before, after = (old or {}).get(field), (new or {}).get(field)
+            if before != after:
+                if old is not None:
+                    index.remove(before, key)
+                if new is not None:
+                    index.add(after, key)
+        for field, index in self.date_indexes.get(table, {}).items():
+            before, after = (old or {}).get(field), (new or {}).get(field)
+            if before != after:
+                if old is not None:
+                    index.remove(timestamp(before), key)
+                if new is not None:
+                    index.add(timestamp(after), key)
+        fields = TEXT_FIELDS.get(table, ())
+        if any((old or {}).get(field) != (new or {}).get(field) for field in fields):
+            if new is None:
+                self.text_indexes[table].remove(key)
+            else:
+                self.text_indexes[table].add(key, " ".join(new[field] for field in fields))
+
+    def _create_many(
+        self, table: str, items: List[Any], create: Callable[[Any], Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Validate and apply ``items`` in order; one outcome per item.
+
+        Each item either succeeds (``status`` 201 with its ``data``) or fails
+        on its own (``status`` 400/409 with an ``error``); items after a
+        failure are still applied, and see the effects of earlier ones.
+        Each item locks only its own rows, so other writers may interleave.
+        """
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append({"status": 201, "data": create(item)})
+            except StoreError as exc:
+                outcomes.append({"status": exc.status, "error": str(exc)})
+        return outcomes
+
+    @staticmethod
+    def _get(table: Dict[Any, Dict[str, Any]], key: Any, what: str) -> Dict[str, Any]:
+        record = table.get(key)
+        if record is None:
+            raise NotFound(f"{what} {key} not found")
+        return record
+
+    def page(self, table: str, limit: int, after: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Up to ``limit`` records of ``table`` in creation order after position ``after``.
+
+        Returns the records and the position to pass as ``after`` for the
+        next page, or ``None`` after the last page.
+        """
+        keys, resume = self.order[table].page(after, limit)
+        records = getattr(self, table)
+        return [record for record in map(records.get, keys) if record is not None], resume
+
+    def query(
+        self,
+        table: str,
+        equal: Dict[str, Any],
+        ranges: Dict[str, DateRange],
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Records of ``table`` matching every filter, in creation order; paged like :meth:`page`.
+
+        ``equal`` maps key fields to a value and ``ranges`` maps date fields
+        to ``[from, to)`` timestamps (``None`` leaves an end open). Only the
+        most selective filter is read from its index and the rest are
+        checked on its candidates. A key index holds its matches in creation
+        order, so a page seeks past ``after`` with a bisect and reads only
+        about a page of them, O(log k + page size); a date range is read
+        whole and sorted, O(log n + k log k). At least one filter is
+        required.
+        """
+        key_indexes, date_indexes = self.key_indexes[table], self.date_indexes[table]
+        scans: List[Tuple[int, Callable[[], Iterable[Any]]]] = [
+            (key_indexes[field].count(value), functools.partial(self._seek, key_indexes[field], value, after, limit))
+            for field, value in equal.items()
+        ]
+        scans += [
+            (date_indexes[field].count(*bounds), functools.partial(_sorted_after, date_indexes[field], bounds, after))
+            for field, bounds in ranges.items()
+        ]
+        _, scan = min(scans, key=lambda scan: scan[0])
+        keys = scan()
+        records = getattr(self, table)
+        found: List[Dict[str, Any]] = []
+        resume = None
+        for key in keys:
+            record = records.get(key)
+            if record is None or any(record[field] != value for field, value in equal.items()):
+                continue
+            if any(not _within(timestamp(record[field]), bounds) for field, bounds in ranges.items()):
+                continue
+            if limit is not None and len(found) == limit:
+                resume = found[-1][_PRIMARY_KEYS[table]]
+                break
+            found.append(record)
+        return found, resume
+
+    @staticmethod
+    def _seek(index: HashIndex, value: Any, after: Optional[int], limit: Optional[int]) -> Iterator[Any]:
+        """Keys with ``value`` after ``after`` in creation order, read from ``index`` a page at a time."""
+        chunk = QUERY_CHUNK if limit is None else limit + 1
+        while True:
+            keys, after = index.page(value, after, chunk)
+            yield from keys
+            if after is None:
+                return
+
+    def dependents(self, table: str, key: Any) -> List[Tuple[str, Any]]:
+        """``(table, key)`` of every row referencing ``key`` of ``table`` directly; O(1 + k)."""
+        return [
+            (child, child_key)
+            for child, fields in FOREIGN_KEYS.items()
+            for field, parent in fields.items()
+            if parent == table
+            for child_key in self.referrers[child][field].find(key)
+        ]
+
+    def delete(self, table: str, key: Any, mode: str) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+        """Delete a row of ``table`` with its dependents (``cascade``) or only if it has none (``restrict``).
+
+        Returns the deleted row and the keys of the dependents removed with
+        it, per table. Only the dependent rows are visited, through the
+        reverse references; nothing is scanned. A cascade locks one table
+        at a time, parents first: the rows of a level are locked before
+        their own dependents are looked up, so no new dependent can appear.
+        """
+        if mode not in DELETE_MODES:
+            raise BadRequest(f"mode must be one of: {', '.join(DELETE_MODES)}")
+        deleters = {
+            "users": self.delete_user,
+            "samples": self.delete_sample,
+            "analysis": self.delete_analysis,
+            "results": self.delete_result,
+            "trials": self.delete_trial,
+        }
+        with self._holding(table, key) as record, ExitStack() as stack:
+            if mode == RESTRICT:
+                blocking = self.dependents(table, key)
+                if blocking:
+                    child, child_key = blocking[0]
+                    raise Conflict(f"{ROW_NAMES[table]} {key} is referenced by {ROW_NAMES[child]} {child_key}")
+                return deleters[table](key), {}
+            # Children always come after their parents in TABLES; dicts as ordered sets.
+            levels: Dict[str, Dict[Any, None]] = {table: {key: None}}
+            for level in TABLES[TABLES.index(table):]:
+                if level not in levels:
+                    continue
+                if level != table:
+                    stack.enter_context(self.locks.hold((level, row) for row in levels[level]))
+                    # Rows deleted by another writer before we got their locks.
+                    rows = getattr(self, level)
+                    levels[level] = {row: None for row in levels[level] if row in rows}
+                for row in levels[level]:
+                    for child, child_key in self.dependents(level, row):
+                        levels.setdefault(child, {})[child_key] = None
+            removed: Dict[str, List[Any]] = {}
+            for level in reversed(TABLES):
+                for row in levels.get(level, ()):
+                    deleters[level](row)
+                    if level != table:
+                        removed.setdefault(level, []).append(row)
+        for keys in removed.values():
+            keys.sort()
+        return record, removed
+
+    def search(
+        self, text: str, tables: Iterable[str] = tuple(TEXT_FIELDS), limit: int = 10
+    ) -> List[Tuple[str, Dict[str, Any], float]]:
+        """The ``limit`` best ``(table, record, score)`` matches for ``text`` across ``tables``, best first."""
+        hits = []
+        for table in tables:
+            records = getattr(self, table)
+            for key, score in self.text_indexes[table].search(text, limit):
+                record = records.get(key)
+                if record is not None:
+                    hits.append((table, record, score))
+        return heapq.nlargest(limit, hits, key=lambda hit: hit[2])
+
+    # Users
+
+    def list_users(self) -> List[Dict[str, Any]]:
+        return list(self.users.values())
+
+    def get_user(self, user_id: int) -> Dict[str, Any]:
+        return self._get(self.users, user_id, "user")
+
+    def create_user(self, body: Any) -> Dict[str, Any]:
+        validate(body, USER_SCHEMA)
+        # Anyone else touching the new user has to lock its username first.
+        with self.locks.hold([("usernames", body["username"])]):
+            if body["username"] in self.user_by_username:
+                raise Conflict(f"username {body['username']} already exists")
+            user_id = self._next_id("users")
+            user = {"id": user_id, "name": body["name"], "roles": list(body["roles"]), "username": body["username"]}
+            self.users[user_id] = user
+            self.passwords[user_id] = body["password"]
+            self.user_by_username[user["username"]] = user_id
+            self.order["users"].add(user_id, user_id)
+            self._changed("users")
+        return user
+
+    def update_user(self, user_id: int, body: Any) -> Dict[str, Any]:
+        validate_patch(body, USER_PATCH)
+        with self._holding("users", user_id, body.get("username")) as user:
+            username = body.get("username", user["username"])
+            if username != user["username"]:
+                if username in self.user_by_username:
+                    raise Conflict(f"username {username} already exists")
+                del self.user_by_username[user["username"]]
+                self.user_by_username[username] = user_id
+            changes = {k: v for k, v in body.items() if k != "password"}
+            if "password" in body:
+                self.passwords[user_id] = body["password"]
+            user = {**user, **changes}
+            self.users[user_id] = user
+            self._changed("users")
+        return user
+
+    def delete_user(self, user_id: int) -> Dict[str, Any]:
+        with self._holding("users", user_id) as user:
+            del self.users[user_id]
+            del self.passwords[user_id]
+            self.order["users"].remove(user_id)
+            self._changed("users")
+            del self.user_by_username[user["username"]]
+        return user
+
+    def authenticate(self, username: Any, password: Any) -> Optional[Dict[str, Any]]:
+        user_id = self.user_by_username.get(username)
+        if user_id is None or self.passwords.get(user_id) != password:
+            return None
+        return self.users.get(user_id)
+
+    # Clients
+
+    def list_clients(self) -> List[Dict[str, Any]]:
+        return list(self.clients.values())
+
+    def get_client(self, client_code: Any) -> Dict[str, Any]:
+        return self._get(self.clients, client_code, "client")
+
+    def create_client(self, body: Any) -> Dict[str, Any]:
+        validate(body, CLIENT_SCHEMA, CLIENT_OPTIONAL)
+        with self.locks.hold([("client_names", body["name"])]):
+            if body["name"] in self.client_by_name:
+                raise Conflict(f"client {body['name']} already exists")
+            seq = self._next_id("clients")
+            client_code = f"C-{seq:03d}"
+            client = {
+                "client_code": client_code,
+                "name": body["name"],
+                "phoneNumber": body.get("phoneNumber", 0),
+                "email": body.get("email", ""),
+                "addres": body.get("addres", "N/A"),
+            }
+            self.clients[client_code] = client
+            self.client_by_name[client["name"]] = client_code
+            self.order["clients"].add(seq, client_code)
+            self._changed("clients")
+        return client
+
+    # Samples
+
+    def list_samples(self) -> List[Dict[str, Any]]:
+        return list(self.samples.values())
+
+    def get_sample(self, sample_number: int) -> Dict[str, Any]:
+        return self._get(self.samples, sample_number, "sample")
+
+    def create_sample(self, body: Any) -> Dict[str, Any]:
+        validate(body, SAMPLE_SCHEMA)
+        with self._referencing("samples", body):
+            sample_number = self._next_id("samples")
+            with self.locks.hold([("samples", sample_number)]):
+                sample = {"sample_number": sample_number, **body}
+                self.samples[sample_number] = sample
+                self.order["samples"].add(sample_number, sample_number)
+                self._index("samples", sample_number, None, sample)
+                self._changed("samples")
+        return sample
+
+    def create_samples(self, items: List[Any]) -> List[Dict[str, Any]]:
+        return self._create_many("samples", items, self.create_sample)
+
+    def update_sample(self, sample_number: int, body: Any) -> Dict[str, Any]:
+        validate_patch(body, SAMPLE_PATCH)
+        with self._holding("samples", sample_number) as old:
+            sample = {**old, **body}
+            self.samples[sample_number] = sample
+            self._index("samples", sample_number, old, sample)
+            self._changed("samples")
+        return sample
+
+    def delete_sample(self, sample_number: int) -> Dict[str, Any]:
+        with self._holding("samples", sample_number) as sample:
+            del self.samples[sample_number]
+            self.order["samples"].remove(sample_number)
+            self._index("samples", sample_number, sample, None)
+            self._changed("samples")
+        return sample
+
+    # Analysis
+
+    def list_analysis(self) -> List[Dict[str, Any]]:
+        return list(self.analysis.values())
+
+    def get_analysis(self, analysis_number: int) -> Dict[str, Any]:
+        return self._get(self.analysis, analysis_number, "analysis")
+
+    def create_analysis(self, body: Any) -> Dict[str, Any]:
+        validate(body, ANALYSIS_SCHEMA)
+        with self._referencing("analysis", body):
+            analysis_number = self._next_id("analysis")
+            with self.locks.hold([("analysis", analysis_number)]):
+                analysis = {"analysis_number": analysis_number, **body}
+                self.analysis[analysis_number] = analysis
+                self.order["analysis"].add(analysis_number, analysis_number)
+                self._index("analysis", analysis_number, None, analysis)
+                self._changed("analysis")
+        return analysis
+
+    def delete_analysis(self, analysis_number: int) -> Dict[str, Any]:
+        with self._holding("analysis", analysis_number) as analysis:
+            del self.analysis[analysis_number]
+            self.order["analysis"].remove(analysis_number)
+            self._index("analysis", analysis_number, analysis, None)
+            self._changed("analysis")
+        return analysis
+
+    # Results
+
+    def list_results(self) -> List[Dict[str, Any]]:
+        return list(self.results.values())
+
+    def get_result(self, result_number: int) -> Dict[str, Any]:
+        return self._get(self.results, result_number, "result")
+
+    def create_result(self, body: Any) -> Dict[str, Any]:
+        validate(body, RESULT_SCHEMA)
+        with self._referencing("results", body):
+            if body["analysis_number"] in self.result_by_analysis:
+                raise Conflict(f"analysis {body['analysis_number']} already has a result")
+            result_number = self._next_id("results")
+            with self.locks.hold([("results", result_number)]):
+                result = {"result_number": result_number, **body}
+                self.results[result_number] = result
+                self.order["results"].add(result_number, result_number)
+                self._index("results", result_number, None, result)
+                self.result_by_analysis[result["analysis_number"]] = result_number
+                self._changed("results")
+        return result
+
+    def create_results(self, items: List[Any]) -> List[Dict[str, Any]]:
+        return self._create_many("results", items, self.create_result)
+
+    def update_result(self, result_number: int, body: Any) -> Dict[str, Any]:
+        validate_patch(body, RESULT_PATCH)
+        with self._holding("results", result_number) as old:
+            result = {**old, **body}
+            self.results[result_number] = result
+            self._index("results", result_number, old, result)
+            self._changed("results")
+        return result
+
+    def delete_result(self, result_number: int) -> Dict[str, Any]:
+        with self._holding("results", result_number) as result:
+            del self.results[result_number]
+            self.order["results"].remove(result_number)
+            self._index("results", result_number, result, None)
+            del self.result_by_analysis[result["analysis_number"]]
+            self._changed("results")
+        return result
+
+    # Trials
+
+    def list_trials(self) -> List[Dict[str, Any]]:
+        return list(self.trials.values())
+
+    def get_trial(self, trial_number: int) -> Dict[str, Any]:
+        return self._get(self.trials, trial_number, "trial")
+
+    def create_trial(self, body: Any) -> Dict[str, Any]:
+        validate(body, TRIAL_SCHEMA, TRIAL_OPTIONAL)
+        with self._referencing("trials", body):
+            result = self.results[body["result_number"]]
+            trial_number = self._next_id("trials")
+            with self.locks.hold([("trials", trial_number)]):
+                trial = {
+                    "trial_number": trial_number,
+                    "analysis_number": body["analysis_number"],
+                    "sample_number": body["sample_number"],
+                    "result_number": body["result_number"],
+                    "id_role": body.get("id_role", 1),
+                    "id_user": body.get("id_user", result["id_user"]),
+                    "client_code": body.get("client_code", result["client_code"]),
+                    "emission_date": body["emission_date"],
+                }
+                self.trials[trial_number] = trial
+                self.order["trials"].add(trial_number, trial_number)
+                self._index("trials", trial_number, None, trial)
+                self._changed("trials")
+        return trial
+
+    def update_trial(self, trial_number: int, body: Any) -> Dict[str, Any]:
+        validate_patch(body, TRIAL_PATCH)
+        with self._holding("trials", trial_number) as old:
+            trial = {**old, **body}
+            self.trials[trial_number] = trial
+            self._index("trials", trial_number, old, trial)
+            self._changed("trials")
+        return trial
+
+    def delete_trial(self, trial_number: int) -> Dict[str, Any]:
+        with self._holding("trials", trial_number) as trial:
+            del self.trials[trial_number]
+            self.order["trials"].remove(trial_number)
+            self._index("trials", trial_number, trial, None)
+            self._changed("trials")
+        return trial
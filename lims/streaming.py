@@ -0,0 +1,107 @@
+"""Incremental parsing of ``{"data": [...]}`` list responses.
+
+:class:`DataStream` walks the response body chunk by chunk and yields the
+elements of the top-level ``data`` array one at a time, keeping only the
+not-yet-parsed tail of the body in memory. Memory use is bounded by the
+largest single record plus one chunk, however long the list is. Other
+top-level keys (before or after ``data``) are collected into ``meta``,
+which is complete once iteration has finished.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]}" + _WHITESPACE
+
+
+class DataStream:
+    def __init__(self, chunks: Iterable[bytes], key: str = "data"):
+        self.key = key
+        self.meta: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._records = self._parse()
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._records
+
+    def __next__(self) -> Any:
+        return next(self._records)
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was already parsed."""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._text.decode(b"", final=True)
+        else:
+            text = self._text.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("unexpected end of JSON body")
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self._pos}, got {self._buffer[self._pos]!r}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk ("1" of "1.5e3"), so it is
+            # only complete once a delimiter follows it.
+            partial = end == len(self._buffer) or (
+                isinstance(value, (int, float)) and self._buffer[end] not in _DELIMITERS
+            )
+            if partial and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _parse(self) -> Iterator[Any]:
+        self._expect("{")
+        while self._peek() != "}":
+            key = self._value()
+            self._expect(":")
+            if key == self.key and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._peek() == ",":
+                            self._pos += 1
+                            continue
+                        self._expect("]")
+                        break
+            else:
+                self.meta[key] = self._value()
+            if self._peek() == ",":
+                self._pos += 1
+        self._pos += 1
+
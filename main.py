@@ -0,0 +1,118 @@
+"""Load driver for the LIMS API.
+
+Examples::
+
+    # 32 virtual users for 30 s against the in-process stand-in
+    python main.py --users 32 --duration 30
+
+    # 500 req/s against a running server
+    python main.py --url http://localhost:8000 --rps 500 \\
+        --mix get_sample=60,create_result=20,update_trial=10,login=10
+
+    # 4 worker processes sharing 2000 req/s, interim report every 5 s
+    python main.py --url http://localhost:8000 --rps 2000 --processes 4 --interval 5
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import List, Tuple
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.aio import AsyncLimsClient
+from lims.load import (
+    OPERATIONS,
+    Fixture,
+    LoadStats,
+    Operation,
+    WorkerSpec,
+    add_spare_analysis,
+    expected_rate,
+    parse_mix,
+    run_distributed,
+    run_load,
+    seed,
+    spare_for,
+)
+from lims.standin import LimsApp
+
+DEFAULT_MIX = "get_sample=60,create_result=20,update_trial=10,login=10"
+IN_PROCESS_URL = "http://lims.in-process"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="LIMS base URL; without it an in-process stand-in is used")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted operations, from: {', '.join(sorted(OPERATIONS))}")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--users", type=int, help="closed model: number of concurrent virtual users")
+    mode.add_argument("--rps", type=float, help="open model: target requests per second")
+    parser.add_argument("--concurrency", type=int, default=64, help="max calls in flight (and pool size)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--seed-size", type=int, default=100, help="samples/results/trials to create first")
+    parser.add_argument(
+        "--spare", type=int, help="analyses reserved for POST /results (default: sized to the run's rate and duration)"
+    )
+    parser.add_argument("--random-seed", type=int, help="make the operation sequence reproducible")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes, each with its own event loop")
+    parser.add_argument("--interval", type=float, help="print an interim report every INTERVAL seconds")
+    return parser
+
+
+def print_snapshot(stats: LoadStats) -> None:
+    print(f"--- interim ---\n{stats.report()}\n", file=sys.stderr, flush=True)
+
+
+def make_client(args: argparse.Namespace) -> LimsClient:
+    if args.url:
+        return LimsClient(args.url, pool_maxsize=args.concurrency)
+    client = LimsClient(IN_PROCESS_URL, pool_maxsize=args.concurrency)
+    mount(client.session, LimsApp(), IN_PROCESS_URL)
+    return client
+
+
+def make_fixture(client: LimsClient, args: argparse.Namespace, mix: List[Tuple[Operation, float]]) -> Fixture:
+    fixture = seed(client, args.seed_size, args.spare or 0)
+    if args.spare is None:
+        rate = expected_rate(fixture, args.users, args.rps, shared_cpu=not args.url)
+        add_spare_analysis(client, fixture, spare_for(mix, args.duration, rate))
+    return fixture
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.users is None and args.rps is None:
+        args.users = 16
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.processes > 1:
+        spec = WorkerSpec(
+            args.url, args.mix, args.duration, args.users, args.rps, args.concurrency,
+            args.interval, args.seed_size, args.spare, args.random_seed,
+        )
+        # A shared server is seeded once; in-process stand-ins seed themselves.
+        fixture = make_fixture(make_client(args), args, mix) if args.url else None
+        stats = run_distributed(spec, args.processes, fixture, on_snapshot=print_snapshot)
+        print(stats.report())
+        return
+
+    client = make_client(args)
+    fixture = make_fixture(client, args, mix)
+    aclient = AsyncLimsClient(client, concurrency=args.concurrency)
+    try:
+        stats = asyncio.run(run_load(
+            aclient, fixture, mix, args.duration, users=args.users, rps=args.rps, seed_value=args.random_seed,
+            interval=args.interval, on_interval=print_snapshot,
+        ))
+    finally:
+        aclient.close()
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import asyncio
+import time
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.aio import ENDPOINT_METHODS, AsyncLimsClient
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestAsyncClient(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        client = LimsClient(BASE_URL, pool_maxsize=8)
+        mount(client.session, self.app, BASE_URL)
+        self.aclient = AsyncLimsClient(client, concurrency=8)
+        store = self.app.store
+        client_code = store.create_client({"name": "ACME"})["client_code"]
+        self.sample_numbers = [
+            store.create_sample({
+                "client_code": client_code,
+                "entry_date": "2025-12-16T10:00:00Z",
+                "description": f"Muestra {i}",
+                "sampling_date": "2025-12-15T08:00:00Z",
+                "observations": "Sin observaciones",
+                "analysis_quantity": 1
+            })["sample_number"]
+            for i in range(20)
+        ]
+
+    def tearDown(self):
+        self.aclient.close()
+
+    # Endpoint 16 - GET /samples/:sample_number como corrutina
+    def test_get_sample(self):
+        response = asyncio.run(self.aclient.get_sample(self.sample_numbers[0]))
+
+        assert response.status_code == 200
+        self.assertEqual(response.json()["data"]["description"], "Muestra 0")
+
+    # Los generadores síncronos (pages) no se exponen como corrutinas
+    def test_generators_are_not_wrapped(self):
+        self.assertNotIn("pages", ENDPOINT_METHODS)
+        self.assertFalse(hasattr(self.aclient, "pages"))
+
+    # GET /samples/:sample_number en paralelo – orden de entrada y 404 por id
+    def test_gather_many_keeps_order_and_collects_errors(self):
+        ids = [self.sample_numbers[3], 999, self.sample_numbers[0], 998]
+
+        gathered = asyncio.run(self.aclient.samples.gather_many(ids))
+
+        self.assertEqual([outcome.id for outcome in gathered.outcomes], ids)
+        self.assertEqual(
+            [value and value["description"] for value in gathered.values],
+            ["Muestra 3", None, "Muestra 0", None]
+        )
+        self.assertEqual({key: outcome.status for key, outcome in gathered.errors.items()}, {999: 404, 998: 404})
+
+    # El límite de concurrencia acota las llamadas en vuelo
+    def test_concurrency_limit(self):
+        in_flight = []
+        peak = []
+        get_sample = self.app.store.get_sample
+
+        def slow_get_sample(sample_number):
+            in_flight.append(sample_number)
+            peak.append(len(in_flight))
+            time.sleep(0.02)
+            in_flight.remove(sample_number)
+            return get_sample(sample_number)
+
+        self.app.store.get_sample = slow_get_sample
+
+        started = time.perf_counter()
+        gathered = asyncio.run(self.aclient.samples.gather_many(self.sample_numbers, limit=4))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(gathered.errors, {})
+        self.assertLessEqual(max(peak), 4)
+        self.assertLess(elapsed, len(self.sample_numbers) * 0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,136 +1,130 @@
 import unittest
-from unittest.mock import patch, Mock
-import requests
+from unittest.mock import patch
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
 
 
 class TestAnalysis(unittest.TestCase):
 
-    @patch("requests.post")
-    def test_post_analysis(self, mock_post):
-        request_body = {
-            "id_user": 1,
-            "sample_number": 10,
-            "client_code": 999,
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.client_code = self.client.create_client({"name": "ACME", "contact": "Juan"}).json()["data"][0]["client_code"]
+        self.user_id = self.client.create_user({
+            "name": "Analista",
+            "username": "analista",
+            "password": "secret",
+            "roles": ["Analyst"]
+        }).json()["data"]["id"]
+        self.sample_number = self.client.create_sample({
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Agua de pozo",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        }).json()["data"]["sample_number"]
+        self.analysis = self.client.create_analysis(self.analysis_body()).json()["data"]
+
+    def analysis_body(self):
+        return {
+            "id_user": self.user_id,
+            "sample_number": self.sample_number,
+            "client_code": self.client_code,
             "sow_date": "2025-12-16T10:00:00Z",
-            "type_analysis": "string"
+            "type_analysis": "Microbiológico"
         }
 
-        mock_data = {
-            "data": {
-                "analysis_number": 123,
-                "id_user": 1,
-                "sample_number": 10,
-                "client_code": 999,
-                "sow_date": "2025-12-16T10:00:00Z",
-                "type_analysis": "string"
-            }
-        }
-
-        mock_post.return_value = Mock()
-        mock_post.return_value.json.return_value = mock_data
-        mock_post.return_value.status_code = 201
+    def test_post_analysis(self):
+        request_body = {**self.analysis_body(), "type_analysis": "Fisicoquímico"}
 
-        response = requests.post("/analysis", json=request_body)
+        response = self.client.create_analysis(request_body)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
-        assert response is not None
-        assert response.status_code == 201
-
-    @patch("requests.get")
-    def test_get_analysis(self, mock_get):
-        # Firma: GET /analysis devuelve data como objeto :contentReference[oaicite:9]{index=9}
-        mock_data = {
+        expected = {
             "data": {
-                "analysis_number": 123,
-                "id_user": 1,
-                "sample_number": 10,
-                "client_code": 999,
+                "analysis_number": body["data"]["analysis_number"],
+                "id_user": self.user_id,
+                "sample_number": self.sample_number,
+                "client_code": self.client_code,
                 "sow_date": "2025-12-16T10:00:00Z",
-                "type_analysis": "string"
+                "type_analysis": "Fisicoquímico"
             }
         }
 
-        mock_get.return_value = Mock()
-        mock_get.return_value.json.return_value = mock_data
-        mock_get.return_value.status_code = 200
+        self.assertEqual(body, expected)
+        assert response is not None
+        assert response.status_code == 201
 
-        response = requests.get("/analysis")
+    def test_get_analysis(self):
+        # GET /analysis devuelve la lista completa dentro de data
+        expected = {"data": [self.analysis]}
+
+        response = self.client.get_analysis_list()
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
         assert response is not None
         assert response.status_code == 200
 
-    @patch("requests.get")
-    def test_get_analysis_by_number(self, mock_get):
-        analysis_number = 123
+    def test_get_analysis_by_number(self):
+        analysis_number = self.analysis["analysis_number"]
 
-        mock_data = {
+        expected = {
             "data": {
                 "analysis_number": analysis_number,
-                "id_user": 1,
-                "sample_number": 10,
-                "client_code": 999,
+                "id_user": self.user_id,
+                "sample_number": self.sample_number,
+                "client_code": self.client_code,
                 "sow_date": "2025-12-16T10:00:00Z",
-                "type_analysis": "string"
+                "type_analysis": "Microbiológico"
             }
         }
 
-        mock_get.return_value = Mock()
-        mock_get.return_value.json.return_value = mock_data
-        mock_get.return_value.status_code = 200
-
-        response = requests.get(f"/analysis/{analysis_number}")
+        response = self.client.get_analysis(analysis_number)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
         assert response is not None
         assert response.status_code == 200
 
     # POST /analysis – body inválido
-    @patch("requests.post")
-    def test_post_analysis_bad_request(self, mock_post):
-        mock_post.return_value = Mock(status_code=400)
-
-        response = requests.post("/analysis", json={})
+    def test_post_analysis_bad_request(self):
+        response = self.client.create_analysis({})
 
         assert response is not None
         assert response.status_code == 400
 
 
     # POST /analysis – conflicto (por ejemplo muestra inexistente o duplicado)
-    @patch("requests.post")
-    def test_post_analysis_conflict(self, mock_post):
-        mock_post.return_value = Mock(status_code=409)
-
-        response = requests.post("/analysis", json={})
+    def test_post_analysis_conflict(self):
+        response = self.client.create_analysis({**self.analysis_body(), "sample_number": 999})
 
         assert response is not None
         assert response.status_code == 409
 
 
     # GET /analysis – error interno
-    @patch("requests.get")
-    def test_get_analysis_server_error(self, mock_get):
-        mock_get.return_value = Mock(status_code=500)
-
-        response = requests.get("/analysis")
+    def test_get_analysis_server_error(self):
+        with patch.object(self.app.store, "list_analysis", side_effect=RuntimeError("db down")):
+            response = self.client.get_analysis_list()
 
         assert response is not None
         assert response.status_code == 500
 
 
     # GET /analysis/:analysis_number – no encontrado
-    @patch("requests.get")
-    def test_get_analysis_by_number_not_found(self, mock_get):
-        mock_get.return_value = Mock(status_code=404)
-
-        response = requests.get("/analysis/999")
+    def test_get_analysis_by_number_not_found(self):
+        response = self.client.get_analysis(999)
 
         assert response is not None
         assert response.status_code == 404
 
 
-    if __name__ == "__main__":
-        unittest.main()
+if __name__ == "__main__":
+    unittest.main()
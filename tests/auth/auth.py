@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.auth import AuthenticationError
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestTokenProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp(require_auth=True)
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.app.store.create_user({"name": "Admin", "username": "admin", "password": "secret", "roles": ["Admin"]})
+
+    def tearDown(self):
+        self.client.close()
+
+    # Sin token – 401
+    def test_requires_token(self):
+        response = self.client.get_users()
+
+        assert response.status_code == 401
+
+    # Token malformado con caracteres no ASCII – 401, no 500
+    def test_malformed_token(self):
+        response = self.client.session.get(f"{BASE_URL}/users", headers={"Authorization": "Bearer a.b.é"})
+
+        self.assertEqual(response.status_code, 401)
+
+    # Un solo /login para muchas llamadas
+    def test_token_is_reused(self):
+        provider = self.client.authenticate("admin", "secret")
+
+        for _ in range(10):
+            assert self.client.get_users().status_code == 200
+
+        self.assertEqual(provider.stats(), {"hits": 9, "misses": 1, "refreshes": 0, "logins": 1})
+
+    # Llamadas concurrentes sin token – un único /login
+    def test_concurrent_misses_are_coalesced(self):
+        provider = self.client.authenticate("admin", "secret")
+        barrier = threading.Barrier(16)
+        tokens = []
+
+        def worker():
+            barrier.wait()
+            tokens.append(provider.get_token())
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(tokens)), 1)
+        self.assertEqual(provider.logins, 1)
+
+    # asyncio – un único /login
+    def test_async_misses_are_coalesced(self):
+        provider = self.client.authenticate("admin", "secret")
+
+        async def main():
+            return await asyncio.gather(*(provider.aget_token() for _ in range(50)))
+
+        tokens = asyncio.run(main())
+
+        self.assertEqual(len(set(tokens)), 1)
+        self.assertEqual(provider.logins, 1)
+
+    # Renovación proactiva antes de expires_in
+    def test_background_refresh(self):
+        self.app.token_ttl = 1
+        provider = self.client.authenticate("admin", "secret", refresh_margin=0.9)
+        provider.get_token()
+
+        time.sleep(0.7)
+
+        self.assertEqual(provider.refreshes, 1)
+        self.assertEqual(provider.logins, 2)
+        assert self.client.get_users().status_code == 200
+
+    # Credenciales inválidas
+    def test_login_fail(self):
+        provider = self.client.authenticate("admin", "wrong")
+
+        with self.assertRaises(AuthenticationError) as ctx:
+            provider.get_token()
+
+        self.assertEqual(ctx.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
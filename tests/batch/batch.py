@@ -0,0 +1,148 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.batch import BatchWriter
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class CountingApp(LimsApp):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def handle(self, *args, **kwargs):
+        self.calls += 1
+        return super().handle(*args, **kwargs)
+
+
+class TestBatchCreate(unittest.TestCase):
+
+    def setUp(self):
+        self.app = CountingApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.client_code = self.app.store.create_client({"name": "ACME"})["client_code"]
+        self.sample = {
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 2
+        }
+
+    def _seed_analyses(self, count):
+        """A user, a sample and ``count`` analyses of it, for results to reference."""
+        store = self.app.store
+        id_user = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})["id"]
+        sample_number = store.create_sample(self.sample)["sample_number"]
+        for _ in range(count):
+            store.create_analysis({
+                "id_user": id_user,
+                "sample_number": sample_number,
+                "client_code": self.sample["client_code"],
+                "sow_date": "2025-12-17T09:00:00Z",
+                "type_analysis": "Microbiológico"
+            })
+
+    def _result(self, analysis_number):
+        return {
+            "analysis_number": analysis_number,
+            "sample_number": 1,
+            "id_user": 1,
+            "client_code": self.client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
+        }
+
+    # POST /samples:batch – estado por elemento
+    def test_create_samples(self):
+        response = self.client.create_samples([
+            self.sample,
+            {**self.sample, "analysis_quantity": "dos"},
+            {**self.sample, "client_code": "C-999"},
+            {**self.sample, "description": "Muestra de suelo"},
+        ])
+
+        assert response.status_code == 200
+        outcomes = response.json()["data"]
+        self.assertEqual([outcome["status"] for outcome in outcomes], [201, 400, 409, 201])
+        self.assertEqual([outcome["data"]["sample_number"] for outcome in outcomes if outcome["status"] == 201], [1, 2])
+        self.assertEqual(len(self.client.get_samples().json()["data"]), 2)
+
+    # POST /results:batch – 409 por resultado duplicado dentro del mismo lote
+    def test_create_results_conflict(self):
+        self._seed_analyses(2)
+        outcomes = self.client.create_results([self._result(1), self._result(2), self._result(1)]).json()["data"]
+
+        self.assertEqual([outcome["status"] for outcome in outcomes], [201, 201, 409])
+        self.assertIn("already has a result", outcomes[2]["error"])
+
+    # POST /samples:batch – cuerpo inválido
+    def test_bad_batch_body(self):
+        assert self.client.create_samples([]).status_code == 400
+        assert self.client.create_samples({"data": [self.sample]}).status_code == 400
+        assert self.client.create_samples([self.sample] * 1001).status_code == 400
+
+    def test_writer_batches_by_size(self):
+        with BatchWriter(self.client.create_samples, max_batch=10, max_delay=60) as writer:
+            futures = [writer.submit({**self.sample, "description": f"Muestra {i}"}) for i in range(25)]
+            writer.flush()
+            sent = self.app.calls
+
+        self.assertEqual(sent, 3)
+        self.assertEqual(writer.batches, 3)
+        self.assertEqual([future.result()["data"]["sample_number"] for future in futures], list(range(1, 26)))
+
+    def test_writer_flushes_after_delay(self):
+        with BatchWriter(self.client.create_samples, max_batch=100, max_delay=0.02) as writer:
+            future = writer.submit(self.sample)
+            self.assertEqual(future.result(timeout=2)["status"], 201)
+            writer.submit(self.sample).result(timeout=2)
+
+        self.assertEqual(self.app.calls, 2)
+
+    # POST /samples:batch – error de red en todos los futuros del lote
+    def test_writer_failed_batch(self):
+        with patch.object(self.client.session, "request", side_effect=requests.ConnectionError("connection reset")):
+            with BatchWriter(self.client.create_samples, max_batch=2, max_delay=60) as writer:
+                futures = [writer.submit(self.sample) for _ in range(2)]
+                for future in futures:
+                    with self.assertRaises(requests.ConnectionError):
+                        future.result(timeout=2)
+
+    # POST /samples:batch – respuesta con menos resultados que elementos
+    def test_writer_short_reply(self):
+        def send(items):
+            response = self.client.create_samples(items)
+            response._content = json.dumps({"data": response.json()["data"][:1]}).encode()
+            return response
+
+        with BatchWriter(send, max_batch=3, max_delay=60) as writer:
+            futures = [writer.submit(self.sample) for _ in range(3)]
+
+        self.assertEqual(futures[0].result(timeout=2)["status"], 201)
+        for future in futures[1:]:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=2)
+
+    def test_writer_closed(self):
+        self._seed_analyses(2)
+        writer = BatchWriter(self.client.create_results)
+        future = writer.submit(self._result(1))
+        writer.close()
+
+        self.assertEqual(future.result(timeout=0)["status"], 201)
+        with self.assertRaises(RuntimeError):
+            writer.submit(self._result(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, CircuitOpenError
+from lims.standin import LimsApp
+from lims.standin.faults import FaultProfile
+
+BASE_URL = "http://lims.test"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.clock = FakeClock()
+        self.breakers = CircuitBreakers(minimum_calls=4, window=4, open_duration=10, half_open_calls=2, clock=self.clock)
+        self.transitions = []
+        self.breakers.on_transition(lambda route, old, new: self.transitions.append((route, old, new)))
+        self.client = LimsClient(BASE_URL, breakers=self.breakers)
+        mount(self.client.session, self.app, BASE_URL)
+
+    def _fail_results(self):
+        self.app.faults.set(routes.RESULT, FaultProfile(errors={500: 1.0}))
+
+    # GET /results/{n} – 500 continuos abren el circuito
+    def test_opens_on_failure_rate(self):
+        self._fail_results()
+        statuses = [self.client.get_result(n).status_code for n in range(1, 5)]
+
+        self.assertEqual(statuses, [500] * 4)
+        self.assertEqual(self.breakers.states(), {routes.RESULT: OPEN})
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.client.get_result(1)
+        self.assertEqual(raised.exception.route, routes.RESULT)
+        self.assertEqual(self.breakers.get(routes.RESULT).rejected, 1)
+        # Otras rutas siguen cerradas
+        assert self.client.get_samples().status_code == 200
+        self.assertEqual(self.breakers.get(routes.SAMPLES).state, CLOSED)
+
+    def test_stays_closed_below_threshold(self):
+        self.app.faults.set(routes.RESULT, FaultProfile(errors={500: 1.0}))
+        self.client.get_result(1)
+        self.app.faults.clear()
+        for n in range(2, 8):
+            self.client.get_result(n)
+
+        self.assertEqual(self.breakers.get(routes.RESULT).state, CLOSED)
+        self.assertEqual(self.transitions, [])
+
+    def test_half_open_then_closed(self):
+        self._fail_results()
+        for n in range(4):
+            self.client.get_result(n)
+        self.app.faults.clear()
+        self.clock.now = 11
+
+        self.client.get_result(1)
+        self.assertEqual(self.breakers.get(routes.RESULT).state, HALF_OPEN)
+        self.client.get_result(1)
+
+        self.assertEqual(self.transitions, [
+            (routes.RESULT, CLOSED, OPEN),
+            (routes.RESULT, OPEN, HALF_OPEN),
+            (routes.RESULT, HALF_OPEN, CLOSED),
+        ])
+
+    def test_half_open_then_open_again(self):
+        self._fail_results()
+        for n in range(4):
+            self.client.get_result(n)
+        self.clock.now = 11
+        for n in range(2):
+            self.client.get_result(n)
+
+        self.assertEqual(self.breakers.get(routes.RESULT).state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_result(1)
+
+    def test_half_open_limits_trial_calls(self):
+        breaker = self.breakers.get(routes.ANALYSIS)
+        for _ in range(4):
+            breaker.record(True, 0.0)
+        self.clock.now = 11
+        breaker.acquire()
+        breaker.acquire()
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.acquire()
+
+    # GET /analysis/{n} – llamadas lentas abren el circuito
+    def test_opens_on_slow_calls(self):
+        breakers = CircuitBreakers(minimum_calls=2, window=2, slow_call_duration=0.01, slow_call_rate_threshold=0.5)
+        self.client.breakers = breakers
+        self.app.faults.set(routes.ANALYSIS, FaultProfile(latency=0.02))
+        for _ in range(2):
+            assert self.client.get_analysis(1).status_code == 404
+
+        self.assertEqual(breakers.get(routes.ANALYSIS).state, OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.cache import EntityCache
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestEntityCache(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.clock = FakeClock()
+        self.cache = EntityCache(maxsize=3, ttl=30, negative_ttl=2, clock=self.clock)
+        self.client = LimsClient(BASE_URL, cache=self.cache)
+        mount(self.client.session, self.app, BASE_URL)
+        client_code = self.app.store.create_client({"name": "ACME"})["client_code"]
+        self.sample = {
+            "client_code": client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 2
+        }
+        self.sample_number = self.app.store.create_sample(self.sample)["sample_number"]
+
+    def test_hit_after_first_get(self):
+        first = self.client.get_sample(self.sample_number)
+        with patch.object(self.app.store, "get_sample", side_effect=RuntimeError("db down")):
+            second = self.client.get_sample(self.sample_number)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertTrue(second.from_cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.hit_ratio, 0.5)
+
+    def test_expires_after_ttl(self):
+        self.client.get_sample(self.sample_number)
+        self.clock.now = 31
+        response = self.client.get_sample(self.sample_number)
+
+        self.assertFalse(getattr(response, "from_cache", False))
+        self.assertEqual(self.cache.expirations, 1)
+
+    # PATCH /samples/{n} – la caché se actualiza con la respuesta
+    def test_patch_writes_through(self):
+        self.client.get_sample(self.sample_number)
+        self.client.update_sample(self.sample_number, {"description": "Muestra de suelo"})
+        with patch.object(self.app.store, "get_sample", side_effect=RuntimeError("db down")):
+            response = self.client.get_sample(self.sample_number)
+
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.json()["data"]["description"], "Muestra de suelo")
+
+    # DELETE /samples/{n} – la entrada se invalida
+    def test_delete_evicts(self):
+        self.client.get_sample(self.sample_number)
+        self.client.delete_sample(self.sample_number)
+        response = self.client.get_sample(self.sample_number)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(getattr(response, "from_cache", False))
+        self.assertEqual(self.cache.invalidations, 1)
+
+    # GET /samples/{n} – 404 cacheado brevemente
+    def test_negative_entry(self):
+        self.client.get_sample(99)
+        self.assertEqual(self.client.get_sample(99).status_code, 404)
+        self.assertEqual(self.cache.negative_hits, 1)
+
+        self.clock.now = 3
+        self.client.get_sample(99)
+        self.assertEqual(self.cache.negative_hits, 1)
+
+    # POST /samples – descarta el 404 cacheado del nuevo número
+    def test_create_drops_negative_entry(self):
+        next_number = self.sample_number + 1
+        self.client.get_sample(next_number)
+        created = self.client.create_sample(self.sample).json()["data"]
+        response = self.client.get_sample(next_number)
+
+        self.assertEqual(created["sample_number"], next_number)
+        self.assertEqual(response.status_code, 200)
+
+    def test_lru_eviction(self):
+        for description in ("a", "b", "c"):
+            self.app.store.create_sample({**self.sample, "description": description})
+        for number in (1, 2, 3):
+            self.client.get_sample(number)
+        self.client.get_sample(1)
+        self.client.get_sample(4)
+
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertIsNotNone(self.cache.get("/samples/{sample_number}", 1))
+        self.assertIsNone(self.cache.get("/samples/{sample_number}", 2))
+
+    # GET /samples/{n} – 500 no se cachea
+    def test_server_error_not_cached(self):
+        with patch.object(self.app.store, "get_sample", side_effect=RuntimeError("db down")):
+            self.assertEqual(self.client.get_sample(self.sample_number).status_code, 500)
+        self.assertEqual(self.client.get_sample(self.sample_number).status_code, 200)
+        self.assertEqual(len(self.cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
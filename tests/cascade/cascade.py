@@ -0,0 +1,186 @@
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.cache import EntityCache
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestCascadeDelete(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        store = self.app.store
+        self.client_code = store.create_client({"name": "ACME"})["client_code"]
+        self.users = [
+            store.create_user({"name": name, "username": name, "password": "pw", "roles": ["lab"]})["id"]
+            for name in ("ana", "beto")
+        ]
+        # Two samples, each with two analyses; every analysis has a result and a trial.
+        self.samples = []
+        self.trials = []
+        for i in range(2):
+            sample = store.create_sample({
+                "client_code": self.client_code,
+                "entry_date": "2025-12-16T10:00:00Z",
+                "description": f"Muestra {i}",
+                "sampling_date": "2025-12-15T08:00:00Z",
+                "observations": "Sin observaciones",
+                "analysis_quantity": 2
+            })
+            self.samples.append(sample["sample_number"])
+            for id_user in self.users:
+                analysis = store.create_analysis({
+                    "id_user": id_user,
+                    "sample_number": sample["sample_number"],
+                    "client_code": self.client_code,
+                    "sow_date": "2025-12-17T09:00:00Z",
+                    "type_analysis": "Microbiológico"
+                })
+                result = store.create_result({
+                    "analysis_number": analysis["analysis_number"],
+                    "sample_number": sample["sample_number"],
+                    "id_user": id_user,
+                    "client_code": self.client_code,
+                    "result_date": "2025-12-18T10:00:00Z",
+                    "result": "Apto para consumo"
+                })
+                self.trials.append(store.create_trial({
+                    "analysis_number": analysis["analysis_number"],
+                    "sample_number": sample["sample_number"],
+                    "result_number": result["result_number"],
+                    "emission_date": "2025-12-19T10:00:00Z"
+                }))
+
+    def _counts(self):
+        store = self.app.store
+        return len(store.samples), len(store.analysis), len(store.results), len(store.trials)
+
+    def test_dependents(self):
+        self.assertEqual(
+            self.app.store.dependents("samples", self.samples[0]),
+            [("analysis", 1), ("analysis", 2), ("results", 1), ("results", 2), ("trials", 1), ("trials", 2)],
+        )
+        self.assertEqual(
+            sorted(self.app.store.dependents("users", self.users[1])),
+            [("analysis", 2), ("analysis", 4), ("results", 2), ("results", 4), ("trials", 2), ("trials", 4)],
+        )
+
+    # DELETE /samples/{n}?mode=cascade – borra análisis, resultados y ensayos de la muestra
+    def test_cascade_sample(self):
+        response = self.client.delete_sample(self.samples[0], mode="cascade")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["cascaded"], {"analysis": [1, 2], "results": [1, 2], "trials": [1, 2]})
+        self.assertEqual(self._counts(), (1, 2, 2, 2))
+        self.assertEqual(
+            self.app.store.dependents("samples", self.samples[1]),
+            [("analysis", 3), ("analysis", 4), ("results", 3), ("results", 4), ("trials", 3), ("trials", 4)],
+        )
+        self.assertEqual(self.app.store.result_by_analysis, {3: 3, 4: 4})
+
+    # DELETE /samples/{n}?mode=restrict – 409 mientras tenga análisis
+    def test_restrict_sample(self):
+        response = self.client.delete_sample(self.samples[0], mode="restrict")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertIn("analysis 1", response.json()["error"])
+        self.assertEqual(self._counts(), (2, 4, 4, 4))
+
+    def test_restrict_without_dependents(self):
+        sample = self.app.store.create_sample({
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Sin análisis",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 0
+        })
+        response = self.client.delete_sample(sample["sample_number"], mode="restrict")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("cascaded", response.json())
+
+    # DELETE /samples/{n} – resultados que apuntan a la muestra solo por su sample_number
+    def test_direct_sample_references(self):
+        store = self.app.store
+        sample = store.create_sample({
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Referida directamente",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 0
+        })["sample_number"]
+        analysis = store.create_analysis({
+            "id_user": self.users[0],
+            "sample_number": self.samples[0],
+            "client_code": self.client_code,
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Fisicoquímico"
+        })["analysis_number"]
+        result = store.create_result({
+            "analysis_number": analysis,
+            "sample_number": sample,
+            "id_user": self.users[0],
+            "client_code": self.client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
+        })["result_number"]
+
+        restricted = self.client.delete_sample(sample, mode="restrict")
+        self.assertEqual(restricted.status_code, 409)
+        self.assertIn(f"result {result}", restricted.json()["error"])
+
+        cascaded = self.client.delete_sample(sample, mode="cascade")
+        self.assertEqual(cascaded.json()["cascaded"], {"results": [result]})
+        self.assertNotIn(result, store.results)
+        self.assertIn(analysis, store.analysis)
+
+    # DELETE /results/{n}?mode=cascade – borra sus ensayos
+    def test_cascade_result(self):
+        response = self.client.delete_result(1, mode="cascade")
+
+        self.assertEqual(response.json()["data"]["cascaded"], {"trials": [1]})
+        self.assertEqual(self._counts(), (2, 4, 3, 3))
+        assert self.client.delete_result(2, mode="restrict").status_code == 409
+
+    # DELETE /users/{id}?mode=cascade – borra todo lo que firmó el usuario
+    def test_cascade_user(self):
+        response = self.client.delete_user(self.users[0], mode="cascade")
+
+        self.assertEqual(response.json()["cascaded"], {"analysis": [1, 3], "results": [1, 3], "trials": [1, 3]})
+        self.assertEqual(self._counts(), (2, 2, 2, 2))
+        assert self.client.delete_user(self.users[1], mode="restrict").status_code == 409
+
+    # Sin mode se mantiene el borrado de una sola fila
+    def test_default_mode_deletes_only_the_row(self):
+        assert self.client.delete_sample(self.samples[0]).status_code == 200
+
+        self.assertEqual(self._counts(), (1, 4, 4, 4))
+
+    # DELETE /samples/{n}?mode=todo – modo inválido
+    def test_invalid_mode(self):
+        self.assertEqual(self.client.delete_sample(self.samples[0], mode="todo").status_code, 400)
+
+    # DELETE /samples/999?mode=cascade
+    def test_cascade_not_found(self):
+        self.assertEqual(self.client.delete_sample(999, mode="cascade").status_code, 404)
+
+    def test_cascade_invalidates_cache(self):
+        client = LimsClient(BASE_URL, cache=EntityCache())
+        mount(client.session, self.app, BASE_URL)
+        assert client.get_result(1).status_code == 200
+        assert client.get_trial(1).status_code == 200
+
+        client.delete_sample(self.samples[0], mode="cascade")
+        self.assertEqual(client.get_result(1).status_code, 404)
+        self.assertEqual(client.get_trial(1).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,32 @@
 import unittest
-from unittest.mock import patch, Mock
-import requests
+from unittest.mock import patch
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
 
 
 class TestClients(unittest.TestCase):
 
-    @patch("requests.get")
-    def test_get_clients(self, mock_get):
-        mock_data = {
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.acme = self.client.create_client({
+            "name": "ACME",
+            "contact": "Juan",
+            "phoneNumber": 123456,
+            "email": "acme@test.com",
+            "addres": "Montevideo"
+        }).json()["data"][0]
+
+    def test_get_clients(self):
+        expected = {
             "data": [
                 {
-                    "client_code": "C-001",
+                    "client_code": self.acme["client_code"],
                     "name": "ACME",
                     "phoneNumber": 123456,
                     "email": "acme@test.com",
@@ -19,51 +35,41 @@ class TestClients(unittest.TestCase):
             ]
         }
 
-        mock_get.return_value = Mock()
-        mock_get.return_value.json.return_value = mock_data
-        mock_get.return_value.status_code = 200
-
-        response = requests.get("/clients")
+        response = self.client.get_clients()
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
         assert response is not None
         assert response.status_code == 200
 
-    @patch("requests.post")
-    def test_post_clients(self, mock_post):
-        # Firma: POST /clients body {name, contact} :contentReference[oaicite:4]{index=4}
+    def test_post_clients(self):
+        # Firma: POST /clients body {name, contact}
         request_body = {"name": "Nuevo Cliente", "contact": "Juan"}
 
-        # Firma muestra response como lista dentro de data (aunque sea raro) :contentReference[oaicite:5]{index=5}
-        mock_data = {
+        response = self.client.create_client(request_body)
+        body = response.json()
+
+        # Firma muestra response como lista dentro de data (aunque sea raro)
+        expected = {
             "data": [
                 {
-                    "client_code": "C-999",
+                    "client_code": body["data"][0]["client_code"],
                     "name": "Nuevo Cliente",
                     "phoneNumber": 0,
-                    "email": "nuevo@test.com",
+                    "email": "",
                     "addres": "N/A"
                 }
             ]
         }
 
-        mock_post.return_value = Mock()
-        mock_post.return_value.json.return_value = mock_data
-        mock_post.return_value.status_code = 201
-
-        response = requests.post("/clients", json=request_body)
-        body = response.json()
-
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
         assert response is not None
         assert response.status_code == 201
 
-    @patch("requests.get")
-    def test_get_client_by_code(self, mock_get):
-        client_code = "C-001"
+    def test_get_client_by_code(self):
+        client_code = self.acme["client_code"]
 
-        mock_data = {
+        expected = {
             "data": [
                 {
                     "client_code": client_code,
@@ -75,55 +81,40 @@ class TestClients(unittest.TestCase):
             ]
         }
 
-        mock_get.return_value = Mock()
-        mock_get.return_value.json.return_value = mock_data
-        mock_get.return_value.status_code = 200
-
-        response = requests.get(f"/client/{client_code}")
+        response = self.client.get_client(client_code)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
         assert response is not None
         assert response.status_code == 200
 
     # ========= SAD PATHS – CLIENTS =========
 
     # GET /clients – error interno
-    @patch("requests.get")
-    def test_get_clients_server_error(self, mock_get):
-        mock_get.return_value = Mock(status_code=500)
-
-        response = requests.get("/clients")
+    def test_get_clients_server_error(self):
+        with patch.object(self.app.store, "list_clients", side_effect=RuntimeError("db down")):
+            response = self.client.get_clients()
 
         assert response is not None
         assert response.status_code == 500
 
     # POST /clients – body inválido
-    @patch("requests.post")
-    def test_post_clients_bad_request(self, mock_post):
-        mock_post.return_value = Mock(status_code=400)
-
-        response = requests.post("/clients", json={})
+    def test_post_clients_bad_request(self):
+        response = self.client.create_client({})
 
         assert response is not None
         assert response.status_code == 400
 
     # POST /clients – conflicto (cliente duplicado)
-    @patch("requests.post")
-    def test_post_clients_conflict(self, mock_post):
-        mock_post.return_value = Mock(status_code=409)
-
-        response = requests.post("/clients", json={})
+    def test_post_clients_conflict(self):
+        response = self.client.create_client({"name": "ACME", "contact": "Pedro"})
 
         assert response is not None
         assert response.status_code == 409
 
     # GET /client/:client_code – cliente inexistente
-    @patch("requests.get")
-    def test_get_client_by_code_not_found(self, mock_get):
-        mock_get.return_value = Mock(status_code=404)
-
-        response = requests.get("/client/C-999")
+    def test_get_client_by_code_not_found(self):
+        response = self.client.get_client("C-999")
 
         assert response is not None
         assert response.status_code == 404
@@ -131,4 +122,3 @@ class TestClients(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
-
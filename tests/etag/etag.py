@@ -0,0 +1,87 @@
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.cache import ConditionalCache
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestETag(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.conditional = ConditionalCache()
+        self.client = LimsClient(BASE_URL, conditional=self.conditional)
+        mount(self.client.session, self.app, BASE_URL)
+        self.client_code = self.app.store.create_client({"name": "ACME"})["client_code"]
+
+    def test_strong_etag_and_304(self):
+        first = self.client.session.get(BASE_URL + "/clients")
+        etag = first.headers["ETag"]
+        second = self.client.session.get(BASE_URL + "/clients", headers={"If-None-Match": etag})
+
+        self.assertFalse(etag.startswith("W/"))
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(second.headers["ETag"], etag)
+
+    # POST /clients – el ETag cambia con cada escritura
+    def test_etag_changes_on_write(self):
+        etag = self.client.session.get(BASE_URL + "/clients").headers["ETag"]
+        self.app.store.create_client({"name": "Globex"})
+        response = self.client.session.get(BASE_URL + "/clients", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_client_replays_decoded_body(self):
+        first = self.client.get_clients()
+        self.assertEqual(self.conditional.decodes, 1)
+        second = self.client.get_clients()
+        third = self.client.get_clients()
+
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), first.json())
+        self.assertIs(third.json(), second.json())
+        self.assertIs(first.json(), second.json())
+        self.assertEqual((self.conditional.modified, self.conditional.not_modified, self.conditional.decodes), (1, 2, 1))
+
+    def test_client_sees_changes(self):
+        self.client.get_client(self.client_code)
+        self.client.create_client({"name": "Globex"})
+        response = self.client.get_clients()
+
+        self.assertFalse(getattr(response, "from_cache", False))
+        self.assertEqual([c["name"] for c in response.json()["data"]], ["ACME", "Globex"])
+
+    def test_validators_per_url(self):
+        self.client.get_clients(limit=1)
+        self.client.get_clients()
+        response = self.client.get_clients(limit=1)
+
+        self.assertEqual(len(self.conditional), 2)
+        self.assertEqual(response.json()["data"][0]["name"], "ACME")
+        self.assertIn("next_cursor", response.json())
+
+    # GET /client/{code} – 404 no guarda validador
+    def test_not_found_not_validated(self):
+        response = self.client.get_client("C-999")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(self.conditional), 0)
+
+    # GET /client/{code} con If-None-Match: * – 404 si no existe, 304 si existe
+    def test_wildcard_needs_existing_resource(self):
+        missing = self.client.session.get(BASE_URL + "/client/C-999", headers={"If-None-Match": "*"})
+        existing = self.client.session.get(BASE_URL + f"/client/{self.client_code}", headers={"If-None-Match": "*"})
+
+        self.assertEqual(missing.status_code, 404)
+        self.assertNotIn("ETag", missing.headers)
+        self.assertEqual(existing.status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import random
+import statistics
+import time
+import unittest
+
+import requests
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.retry import Retrier, RetryPolicy
+from lims.standin import LimsApp, StandInServer
+from lims.standin.faults import FaultProfile, Faults, LongTail, Normal
+
+BASE_URL = "http://lims.test"
+
+
+class TestFaults(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp(faults=Faults(seed=42))
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+
+    def test_latency_distributions(self):
+        rng = random.Random(1)
+        normal = [Normal(0.05, 0.01).sample(rng) for _ in range(5000)]
+        tail = sorted(LongTail(0.01, 0.5).sample(rng) for _ in range(20000))
+
+        self.assertAlmostEqual(statistics.mean(normal), 0.05, delta=0.002)
+        self.assertAlmostEqual(tail[len(tail) // 2], 0.01, delta=0.002)
+        self.assertAlmostEqual(tail[int(len(tail) * 0.99)], 0.5, delta=0.1)
+        self.assertTrue(all(delay >= 0 for delay in normal))
+
+    # GET /samples – 500/503/429 inyectados según su probabilidad
+    def test_probabilistic_errors(self):
+        self.app.faults.set(routes.SAMPLES, FaultProfile(errors={500: 0.1, 503: 0.2, 429: 0.3}, retry_after=2))
+        responses = [self.client.get_samples() for _ in range(2000)]
+        counts = {status: sum(r.status_code == status for r in responses) for status in (200, 429, 500, 503)}
+
+        self.assertAlmostEqual(counts[500] / 2000, 0.1, delta=0.03)
+        self.assertAlmostEqual(counts[503] / 2000, 0.2, delta=0.03)
+        self.assertAlmostEqual(counts[429] / 2000, 0.3, delta=0.03)
+        self.assertEqual(self.app.faults.injected["503"], counts[503])
+        throttled = next(r for r in responses if r.status_code == 429)
+        self.assertEqual(throttled.headers["Retry-After"], "2")
+
+    # POST /samples no se ve afectado por un perfil de GET
+    def test_profile_per_method(self):
+        faults = Faults.from_spec({"GET /clients": {"errors": {"500": 1.0}}})
+        self.app.faults.profiles = faults.profiles
+
+        assert self.client.create_client({"name": "ACME"}).status_code == 201
+        assert self.client.get_clients().status_code == 500
+
+    # Conexión reiniciada – el cliente ve ConnectionError y el reintento la absorbe
+    def test_connection_reset(self):
+        self.app.faults.set(routes.USERS, FaultProfile(reset_rate=1.0))
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get_users()
+
+        self.app.faults.set(routes.USERS, FaultProfile(reset_rate=0.5))
+        self.client.retrier = Retrier(RetryPolicy(max_attempts=10), sleep=lambda _: None)
+        statuses = [self.client.get_users().status_code for _ in range(20)]
+
+        self.assertEqual(statuses, [200] * 20)
+        self.assertGreater(self.client.retrier.stats[routes.USERS].recovered, 0)
+
+    def test_slow_drip_body(self):
+        self.app.store.create_client({"name": "ACME"})
+        self.app.faults.set(routes.CLIENTS, FaultProfile(drip=(16, 0.01)))
+
+        started = time.perf_counter()
+        response = self.client.get_clients()
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(response.json()["data"][0]["name"], "ACME")
+        self.assertGreaterEqual(elapsed, 0.01 * (len(response.content) // 16))
+
+    def test_spec_validation(self):
+        with self.assertRaises(ValueError):
+            Faults.from_spec({"/samples": {"latency": {"pareto": 1}}})
+        with self.assertRaises(ValueError):
+            Faults.from_spec({"/samples": {"errors": {"500": 0.8}, "reset_rate": 0.5}})
+        faults = Faults.from_spec({"/samples": {"latency": {"long_tail": [0.01, 0.2]}, "drip": [64, 0.001]}})
+        profile = faults.match("GET", routes.SAMPLES)
+        self.assertIsInstance(profile.latency, LongTail)
+        self.assertEqual(profile.drip, (64, 0.001))
+
+
+class TestFaultsOverHTTP(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.client = LimsClient(self.server.url, timeout=(1, 0.2))
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_reset_over_socket(self):
+        self.server.app.faults.set(routes.SAMPLES, FaultProfile(reset_rate=1.0))
+
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get_samples()
+        self.server.app.faults.clear()
+        assert self.client.get_samples().status_code == 200
+
+    # Latencia por encima del timeout de lectura del cliente
+    def test_latency_hits_read_timeout(self):
+        self.server.app.faults.set(routes.SAMPLES, FaultProfile(latency=0.5))
+
+        with self.assertRaises(requests.Timeout):
+            self.client.get_samples()
+
+    def test_slow_drip_chunked(self):
+        self.server.app.store.create_client({"name": "ACME"})
+        self.server.app.faults.set(routes.CLIENT, FaultProfile(drip=(8, 0.005)))
+
+        response = self.client.get_client("C-001")
+
+        self.assertEqual(response.headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(response.json()["data"][0]["name"], "ACME")
+
+
+if __name__ == "__main__":
+    unittest.main()
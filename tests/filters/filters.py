@@ -0,0 +1,183 @@
+import unittest
+from datetime import datetime, timezone
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.standin import LimsApp
+from lims.standin.indexes import HashIndex, SortedIndex
+
+BASE_URL = "http://lims.test"
+
+
+class TestIndexes(unittest.TestCase):
+
+    def test_hash_index(self):
+        index = HashIndex()
+        for key, value in enumerate("abab"):
+            index.add(value, key)
+        index.remove("a", 2)
+        index.remove("z", 1)
+
+        self.assertEqual(index.find("a"), [0])
+        self.assertEqual(index.find("b"), [1, 3])
+        self.assertEqual(index.count("z"), 0)
+
+    def test_hash_index_pages_after_a_key(self):
+        index = HashIndex()
+        for key in (7, 2, 9, 4, 12):
+            index.add("a", key)
+
+        self.assertEqual(index.find("a"), [2, 4, 7, 9, 12])
+        self.assertEqual(index.page("a", 4, 2), ([7, 9], 9))
+        self.assertEqual(index.page("a", 9, 2), ([12], None))
+        self.assertEqual(index.page("z", None, 2), ([], None))
+
+    def test_sorted_index_ranges(self):
+        index = SortedIndex()
+        for key, value in enumerate([5, 1, 3, 3, 9]):
+            index.add(value, key)
+        index.remove(9, 4)
+
+        self.assertEqual(index.find(), [1, 2, 3, 0])
+        self.assertEqual(index.find(3, 5), [2, 3])
+        self.assertEqual(index.count(3, 5), 2)
+        self.assertEqual(index.find(low=4), [0])
+        self.assertEqual(index.find(high=3), [1])
+        self.assertEqual(index.find(6, 2), [])
+
+
+class TestFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        store = self.app.store
+        self.user_id = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})["id"]
+        self.codes = [store.create_client({"name": name})["client_code"] for name in ("ACME", "Globex")]
+        self.samples = [
+            store.create_sample({
+                "client_code": self.codes[day % 2],
+                "entry_date": f"2025-12-{day:02d}T10:00:00Z",
+                "description": f"Muestra {day}",
+                "sampling_date": f"2025-12-{day:02d}T08:00:00Z",
+                "observations": "Sin observaciones",
+                "analysis_quantity": 1
+            })
+            for day in range(1, 21)
+        ]
+        self.results = []
+        for sample in self.samples[:10]:
+            analysis = store.create_analysis({
+                "id_user": self.user_id,
+                "sample_number": sample["sample_number"],
+                "client_code": sample["client_code"],
+                "sow_date": "2025-12-17T09:00:00Z",
+                "type_analysis": "Microbiológico"
+            })
+            self.results.append(store.create_result({
+                "analysis_number": analysis["analysis_number"],
+                "sample_number": sample["sample_number"],
+                "id_user": self.user_id,
+                "client_code": sample["client_code"],
+                "result_date": sample["entry_date"],
+                "result": "Apto para consumo"
+            }))
+
+    def _numbers(self, response, key="sample_number"):
+        assert response.status_code == 200
+        return [record[key] for record in response.json()["data"]]
+
+    # GET /samples?client_code=
+    def test_filter_by_client_code(self):
+        numbers = self._numbers(self.client.get_samples(client_code=self.codes[0]))
+
+        self.assertEqual(numbers, [s["sample_number"] for s in self.samples if s["client_code"] == self.codes[0]])
+
+    # GET /samples?entry_date_from=&entry_date_to= – desde inclusivo, hasta exclusivo
+    def test_filter_by_date_range(self):
+        numbers = self._numbers(self.client.get_samples(entry_date_from="2025-12-05", entry_date_to="2025-12-08T10:00:00Z"))
+
+        self.assertEqual(numbers, [5, 6, 7])
+
+    def test_combined_filters(self):
+        numbers = self._numbers(self.client.get_samples(
+            client_code=self.codes[1],
+            sampling_date_from=datetime(2025, 12, 10, tzinfo=timezone.utc),
+        ))
+
+        self.assertEqual(numbers, [11, 13, 15, 17, 19])
+
+    # GET /samples?entry_date_from= con desplazamiento horario
+    def test_dates_compare_as_instants(self):
+        numbers = self._numbers(self.client.get_samples(entry_date_from="2025-12-19T07:00:00-03:00"))
+
+        self.assertEqual(numbers, [19, 20])
+
+    # GET /results?analysis_number=
+    def test_results_by_analysis_number(self):
+        result = self.results[3]
+        numbers = self._numbers(self.client.get_results(analysis_number=result["analysis_number"]), "result_number")
+
+        self.assertEqual(numbers, [result["result_number"]])
+
+    # GET /trials?emission_date_from=&client_code=
+    def test_trials_filters(self):
+        for result in self.results:
+            self.app.store.create_trial({
+                "analysis_number": result["analysis_number"],
+                "sample_number": result["sample_number"],
+                "result_number": result["result_number"],
+                "emission_date": result["result_date"]
+            })
+        response = self.client.get_trials(client_code=self.codes[0], emission_date_to="2025-12-05")
+
+        self.assertEqual(self._numbers(response, "trial_number"), [2, 4])
+
+    # GET /results?result_date_from= con paginación
+    def test_filtered_pages(self):
+        pages = list(self.client.pages(routes.RESULTS, limit=3, result_date_from="2025-12-03"))
+
+        self.assertEqual([[r["result_number"] for r in page] for page in pages], [[3, 4, 5], [6, 7, 8], [9, 10]])
+
+    # GET /samples?client_code= con paginación – cada página sigue desde el cursor
+    def test_key_filter_pages_seek_from_cursor(self):
+        pages = list(self.client.pages(routes.SAMPLES, limit=3, client_code=self.codes[1]))
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 1])
+        self.assertEqual([s["sample_number"] for page in pages for s in page], list(range(1, 21, 2)))
+        index = self.app.store.key_indexes["samples"]["client_code"]
+        self.assertEqual(index.page(self.codes[1], 15, 2), ([17, 19], None))
+
+    def test_iter_with_filters(self):
+        numbers = [sample["sample_number"] for sample in self.client.iter_samples(client_code=self.codes[0])]
+
+        self.assertEqual(numbers, list(range(2, 21, 2)))
+
+    # PATCH /samples/{n} y DELETE /samples/{n} – los índices siguen a los cambios
+    def test_indexes_follow_writes(self):
+        assert self.client.update_sample(1, {"entry_date": "2026-01-15T10:00:00Z"}).status_code == 200
+        assert self.client.delete_sample(2).status_code == 200
+
+        self.assertEqual(self._numbers(self.client.get_samples(entry_date_from="2026-01-01")), [1])
+        self.assertEqual(self._numbers(self.client.get_samples(entry_date_to="2025-12-04")), [3])
+        self.assertNotIn(2, self._numbers(self.client.get_samples(client_code=self.codes[0])))
+
+    def test_no_matches(self):
+        self.assertEqual(self._numbers(self.client.get_samples(client_code="C-999")), [])
+        self.assertEqual(self._numbers(self.client.get_samples(entry_date_from="2030-01-01")), [])
+
+    # GET /samples?entry_date_from=ayer – fecha inválida
+    def test_invalid_date(self):
+        response = self.client.get_samples(entry_date_from="ayer")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("entry_date_from", response.json()["error"])
+
+    # GET /results?analysis_number=abc – número inválido
+    def test_invalid_number(self):
+        self.assertEqual(self.client.get_results(analysis_number="abc").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import random
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.retry import Retrier
+from lims.standin import LimsApp
+from lims.standin.idempotency import IdempotencyTable
+
+BASE_URL = "http://lims.test"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestIdempotency(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.app = LimsApp(idempotency=IdempotencyTable(maxsize=2, ttl=60, clock=self.clock))
+        self.client = LimsClient(BASE_URL, pool_maxsize=8)
+        mount(self.client.session, self.app, BASE_URL)
+        client_code = self.app.store.create_client({"name": "ACME"})["client_code"]
+        self.sample = {
+            "client_code": client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 2
+        }
+
+    def _post(self, key, body=None, route=routes.SAMPLES):
+        return self.client._request("POST", route, json=body or self.sample, headers={"Idempotency-Key": key})
+
+    def test_replays_first_response(self):
+        first = self._post("k-1")
+        second = self._post("k-1")
+
+        assert first.status_code == second.status_code == 201
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers["Idempotent-Replayed"], "true")
+        self.assertNotIn("Idempotent-Replayed", first.headers)
+        self.assertEqual(len(self.app.store.samples), 1)
+        self.assertEqual(self.app.idempotency.replays, 1)
+
+    # POST /samples – misma clave con otro cuerpo
+    def test_key_reused_with_other_body(self):
+        self._post("k-1")
+        response = self._post("k-1", {**self.sample, "description": "Otra"})
+
+        assert response.status_code == 422
+        self.assertEqual(len(self.app.store.samples), 1)
+
+    # POST /results – el 409 también se guarda y se repite
+    def test_conflict_replayed(self):
+        # The user, sample and analysis the result refers to.
+        store = self.app.store
+        store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})
+        store.create_sample(self.sample)
+        store.create_analysis({
+            "id_user": 1,
+            "sample_number": 1,
+            "client_code": self.sample["client_code"],
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico"
+        })
+        result = {
+            "analysis_number": 1,
+            "sample_number": 1,
+            "id_user": 1,
+            "client_code": self.sample["client_code"],
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
+        }
+        self.app.store.create_result(result)
+
+        first = self._post("k-2", result, routes.RESULTS)
+        second = self._post("k-2", result, routes.RESULTS)
+
+        assert first.status_code == second.status_code == 409
+        self.assertEqual(second.headers["Idempotent-Replayed"], "true")
+
+    # POST /samples – un 500 no se guarda: el reintento se ejecuta
+    def test_server_error_not_kept(self):
+        self.client.retrier = Retrier(sleep=lambda _: None, rng=random.Random(1))
+        create_sample = self.app.store.create_sample
+        failures = [RuntimeError("db down")]
+
+        def flaky(body):
+            if failures:
+                raise failures.pop()
+            return create_sample(body)
+
+        with patch.object(self.app.store, "create_sample", side_effect=flaky):
+            response = self.client.create_sample(self.sample)
+
+        assert response.status_code == 201
+        self.assertEqual(len(self.app.store.samples), 1)
+
+    def test_expiry_and_bound(self):
+        self._post("k-1")
+        self.clock.now = 61
+        self._post("k-1")
+        self.assertEqual(len(self.app.store.samples), 2)
+
+        self._post("k-2")
+        self._post("k-3")
+        self._post("k-1")
+        self.assertEqual(len(self.app.idempotency), 2)
+        self.assertEqual(len(self.app.store.samples), 5)
+
+    def test_concurrent_duplicates_run_once(self):
+        create_sample = self.app.store.create_sample
+
+        def slow(body):
+            time.sleep(0.05)
+            return create_sample(body)
+
+        with patch.object(self.app.store, "create_sample", side_effect=slow):
+            with ThreadPoolExecutor(8) as pool:
+                responses = list(pool.map(lambda _: self._post("k-9"), range(8)))
+
+        self.assertEqual({response.status_code for response in responses}, {201})
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(len(self.app.store.samples), 1)
+
+    def test_client_generates_keys(self):
+        first = self.client.create_sample(self.sample)
+        second = self.client.create_sample(self.sample)
+
+        keys = {first.request.headers["Idempotency-Key"], second.request.headers["Idempotency-Key"]}
+        self.assertEqual(len(keys), 2)
+        self.assertEqual(len(self.app.store.samples), 2)
+        self.assertNotIn("Idempotency-Key", self.client.login("ana", "pw").request.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
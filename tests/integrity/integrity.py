@@ -0,0 +1,128 @@
+import threading
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import Conflict, LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestReferentialIntegrity(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        store = self.app.store
+        self.client_code = store.create_client({"name": "ACME"})["client_code"]
+        self.id_user = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})["id"]
+        self.sample_number = store.create_sample(self.sample_body())["sample_number"]
+        self.analysis_number = store.create_analysis(self.analysis_body())["analysis_number"]
+
+    def sample_body(self):
+        return {
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        }
+
+    def analysis_body(self):
+        return {
+            "id_user": self.id_user,
+            "sample_number": self.sample_number,
+            "client_code": self.client_code,
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico"
+        }
+
+    def result_body(self):
+        return {
+            "analysis_number": self.analysis_number,
+            "sample_number": self.sample_number,
+            "id_user": self.id_user,
+            "client_code": self.client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
+        }
+
+    # POST /analysis – cliente o usuario inexistente
+    def test_analysis_foreign_keys(self):
+        for field, value in (("client_code", "C-999"), ("id_user", 999), ("sample_number", 999)):
+            response = self.client.create_analysis({**self.analysis_body(), field: value})
+            self.assertEqual(response.status_code, 409, field)
+            self.assertIn(f"{value} does not exist", response.json()["error"])
+
+    # POST /results – análisis, muestra, cliente o usuario inexistente
+    def test_result_foreign_keys(self):
+        for field, value in (("analysis_number", 999), ("sample_number", 999), ("client_code", "C-999"), ("id_user", 999)):
+            self.assertEqual(self.client.create_result({**self.result_body(), field: value}).status_code, 409, field)
+        self.assertEqual(self.client.create_result(self.result_body()).status_code, 201)
+
+    # POST /trials – análisis o muestra inexistente, y usuario opcional inexistente
+    def test_trial_foreign_keys(self):
+        result_number = self.app.store.create_result(self.result_body())["result_number"]
+        trial = {
+            "analysis_number": self.analysis_number,
+            "sample_number": self.sample_number,
+            "result_number": result_number,
+            "emission_date": "2025-12-19T10:00:00Z"
+        }
+        for field, value in (("analysis_number", 999), ("sample_number", 999), ("id_user", 999)):
+            self.assertEqual(self.client.create_trial({**trial, field: value}).status_code, 409, field)
+        self.assertEqual(self.client.create_trial(trial).status_code, 201)
+
+    # POST /users – nombre de usuario repetido
+    def test_unique_username(self):
+        response = self.client.create_user({"name": "Otra Ana", "username": "ana", "password": "x", "roles": []})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(len(self.app.store.users), 1)
+
+    def test_create_racing_cascade_leaves_no_orphans(self):
+        store = self.app.store
+        started = threading.Barrier(5)
+        created = []
+
+        def create():
+            started.wait()
+            for _ in range(200):
+                try:
+                    created.append(store.create_analysis(self.analysis_body())["analysis_number"])
+                except Conflict:
+                    return
+
+        def delete():
+            started.wait()
+            store.delete("samples", self.sample_number, "cascade")
+
+        threads = [threading.Thread(target=create) for _ in range(4)] + [threading.Thread(target=delete)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertNotIn(self.sample_number, store.samples)
+        orphans = [a for a in store.analysis.values() if a["sample_number"] == self.sample_number]
+        self.assertEqual(orphans, [])
+        self.assertEqual(store.dependents("samples", self.sample_number), [])
+
+    def test_unrelated_rows_do_not_block(self):
+        store = self.app.store
+        done = threading.Event()
+
+        def create_user():
+            store.create_user({"name": "Beto", "username": "beto", "password": "pw", "roles": []})
+            done.set()
+
+        # A writer holding a sample does not stop a user from being created.
+        with store.locks.hold([("samples", self.sample_number)]):
+            threading.Thread(target=create_user).start()
+            self.assertTrue(done.wait(timeout=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import math
+import queue
+import random
+import unittest
+from unittest.mock import patch
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.aio import AsyncLimsClient
+from lims.histogram import Histogram
+from lims.load import LoadStats, WorkerSpec, _worker, parse_mix, run_distributed, run_load, seed, spare_for
+from lims.standin import LimsApp
+from lims.standin.faults import FaultProfile
+
+BASE_URL = "http://lims.test"
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_percentiles_within_precision(self):
+        rng = random.Random(7)
+        values = sorted(int(rng.lognormvariate(8, 1.5)) for _ in range(20000))
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 90, 99, 99.9):
+            exact = values[math.ceil(len(values) * percent / 100) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent), exact, delta=exact / 1000 + 1)
+
+        self.assertEqual(histogram.count, len(values))
+        self.assertEqual((histogram.min, histogram.max), (values[0], values[-1]))
+
+    def test_merge_equals_single_histogram(self):
+        left, right, both = Histogram(), Histogram(), Histogram()
+        for value in range(0, 100000, 7):
+            (left if value % 2 else right).record(value)
+            both.record(value)
+
+        merged = Histogram.merged([left, right])
+
+        self.assertEqual(merged.counts, both.counts)
+        self.assertEqual(merged.percentile(99), both.percentile(99))
+
+
+class TestLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        client = LimsClient(BASE_URL, pool_maxsize=4)
+        mount(client.session, self.app, BASE_URL)
+        self.fixture = seed(client, size=5, spare=10)
+        self.aclient = AsyncLimsClient(client, concurrency=4)
+
+    def tearDown(self):
+        self.aclient.close()
+
+    def test_parse_mix(self):
+        mix = parse_mix("get_sample=60,create_result=20,update_trial=10,login=10")
+
+        self.assertEqual([(op.endpoint, weight) for op, weight in mix], [
+            ("GET /samples/{sample_number}", 60.0),
+            ("POST /results", 20.0),
+            ("PATCH /trials/{trial_number}", 10.0),
+            ("POST /login", 10.0),
+        ])
+        with self.assertRaises(ValueError):
+            parse_mix("get_everything=1")
+
+    # Usuarios virtuales – todas las llamadas 2xx
+    def test_virtual_users(self):
+        mix = parse_mix("get_sample=60,create_result=20,update_trial=10,login=10")
+
+        stats = asyncio.run(run_load(self.aclient, self.fixture, mix, duration=0.2, users=4, seed_value=1))
+
+        total = stats.total()
+        self.assertGreater(total.latency.count, 0)
+        self.assertEqual(total.errors, {})
+        self.assertIn("GET /samples/{sample_number}", stats.endpoints)
+
+    # Tasa objetivo – número de llamadas según rps * duración
+    def test_target_rate(self):
+        mix = parse_mix("get_result=1")
+
+        stats = asyncio.run(run_load(self.aclient, self.fixture, mix, duration=0.2, rps=100))
+
+        self.assertEqual(stats.total().latency.count, 20)
+
+    # Ritmo fijo con reportes intermedios – uno por intervalo, no por petición
+    def test_target_rate_snapshots(self):
+        mix = parse_mix("get_result=1")
+        snapshots = []
+
+        asyncio.run(run_load(
+            self.aclient, self.fixture, mix, duration=0.5, rps=100, interval=0.2, on_interval=snapshots.append,
+        ))
+
+        self.assertIn(len(snapshots), (1, 2))
+
+    # POST /results sin análisis libres y POST /analysis con 503 – error del resultado, la carga sigue
+    def test_spare_exhaustion_survives_errors(self):
+        self.fixture.spare_analysis.clear()
+        self.app.faults.set(routes.ANALYSIS_LIST, FaultProfile(errors={503: 1.0}), "POST")
+
+        stats = asyncio.run(run_load(self.aclient, self.fixture, parse_mix("create_result=1"), duration=0.1, users=2))
+
+        self.assertEqual(set(stats.endpoints), {"POST /results"})
+        self.assertEqual(set(stats.total().errors), {"503"})
+
+    def test_spare_sized_to_rate(self):
+        mix = parse_mix("get_sample=60,create_result=20,update_trial=10,login=10")
+
+        self.assertEqual(spare_for(mix, duration=10, rate=500), 1250)
+        self.assertEqual(spare_for(parse_mix("get_sample=1"), duration=10, rate=500), 0)
+
+    # Reparto de análisis libres entre procesos
+    def test_fixture_split(self):
+        parts = self.fixture.split(3)
+
+        self.assertEqual(sorted(a for part in parts for a in part.spare_analysis), sorted(self.fixture.spare_analysis))
+        self.assertTrue(all(part.sample_numbers == self.fixture.sample_numbers for part in parts))
+
+    # --random-seed con varios procesos – una semilla distinta por worker
+    def test_worker_seeds(self):
+        seeds = []
+
+        async def fake_run_load(*args, seed_value=None, **kwargs):
+            seeds.append(seed_value)
+            return LoadStats()
+
+        spec = WorkerSpec(None, "get_sample=1", 0.1, 1, None, 1, None, 1, 1, 42)
+        with patch("lims.load.run_load", fake_run_load):
+            for worker_id in range(2):
+                _worker(worker_id, spec, self.fixture, queue.Queue())
+
+        self.assertEqual(seeds, [42, 43])
+
+    # Varios procesos – histogramas combinados y reportes intermedios
+    def test_distributed(self):
+        spec = WorkerSpec(None, "get_sample=3,create_result=1", 0.6, 4, None, 2, 0.2, 5, 20)
+        snapshots = []
+
+        stats = run_distributed(spec, processes=2, on_snapshot=snapshots.append)
+
+        total = stats.total()
+        self.assertGreater(total.latency.count, 0)
+        self.assertEqual(total.errors, {})
+        self.assertTrue(snapshots)
+        self.assertLessEqual(snapshots[-1].total().latency.count, total.latency.count)
+
+
+if __name__ == "__main__":
+    unittest.main()
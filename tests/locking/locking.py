@@ -0,0 +1,141 @@
+import threading
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp, StoreError
+
+BASE_URL = "http://lims.test"
+WRITERS = 32
+
+
+class TestShardedLocking(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        store = self.app.store
+        self.client_code = store.create_client({"name": "ACME"})["client_code"]
+        self.id_user = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})["id"]
+
+    def sample_body(self, client_code=None):
+        return {
+            "client_code": client_code or self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        }
+
+    def analysis_body(self, sample_number):
+        return {
+            "id_user": self.id_user,
+            "sample_number": sample_number,
+            "client_code": self.client_code,
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico"
+        }
+
+    def _together(self, calls):
+        """Run ``calls`` on one thread each, released at once; their results (or exceptions) in order."""
+        barrier = threading.Barrier(len(calls))
+        outcomes = [None] * len(calls)
+
+        def run(index, call):
+            barrier.wait()
+            try:
+                outcomes[index] = call()
+            except Exception as exc:
+                outcomes[index] = exc
+
+        threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        self.assertFalse(any(thread.is_alive() for thread in threads), "writers deadlocked")
+        return outcomes
+
+    # POST /users concurrentes con el mismo username – un 201 y N-1 409
+    def test_duplicate_users_conflict(self):
+        user = {"name": "Beto", "username": "beto", "password": "pw", "roles": []}
+        responses = self._together([lambda: self.client.create_user(user)] * WRITERS)
+
+        statuses = sorted(response.status_code for response in responses)
+        self.assertEqual(statuses, [201] + [409] * (WRITERS - 1))
+        self.assertEqual([u for u in self.app.store.users.values() if u["username"] == "beto"], [
+            next(r.json()["data"] for r in responses if r.status_code == 201)
+        ])
+
+    # PATCH /users/{id} concurrentes al mismo username – uno solo lo obtiene
+    def test_concurrent_renames_conflict(self):
+        store = self.app.store
+        ids = [
+            store.create_user({"name": f"U{i}", "username": f"u{i}", "password": "pw", "roles": []})["id"]
+            for i in range(8)
+        ]
+        responses = self._together([lambda user_id=user_id: self.client.update_user(user_id, {"username": "beto"})
+                                    for user_id in ids])
+
+        self.assertEqual(sorted(r.status_code for r in responses), [200] + [409] * 7)
+        self.assertEqual(store.get_user(store.user_by_username["beto"])["username"], "beto")
+        self.assertEqual(len(store.user_by_username), len(store.users))
+
+    def test_concurrent_creates_get_distinct_keys(self):
+        store = self.app.store
+        other = store.create_client({"name": "Globex"})["client_code"]
+        before = store.versions["samples"]
+
+        def create(client_code):
+            return [store.create_sample(self.sample_body(client_code))["sample_number"] for _ in range(25)]
+
+        outcomes = self._together([lambda i=i: create(other if i % 2 else self.client_code) for i in range(8)])
+
+        numbers = [number for created in outcomes for number in created]
+        self.assertEqual(len(set(numbers)), 200)
+        self.assertEqual(len(store.samples), 200)
+        self.assertEqual(store.versions["samples"] - before, 200)
+        self.assertEqual(store.key_indexes["samples"]["client_code"].count(other), 100)
+        self.assertEqual(len(store.order["samples"]), 200)
+
+    def test_creates_racing_cascades_leave_no_orphans(self):
+        store = self.app.store
+        samples = [store.create_sample(self.sample_body())["sample_number"] for _ in range(8)]
+
+        def create(sample_number):
+            for _ in range(20):
+                try:
+                    store.create_analysis(self.analysis_body(sample_number))
+                except StoreError:
+                    pass
+
+        def delete(sample_number):
+            store.delete("samples", sample_number, "cascade")
+
+        calls = [lambda n=n: create(n) for n in samples] + [lambda n=n: delete(n) for n in samples[::2]]
+        outcomes = self._together(calls)
+
+        self.assertEqual([o for o in outcomes if isinstance(o, Exception)], [])
+        self.assertTrue(all(a["sample_number"] in store.samples for a in store.analysis.values()))
+        for n in samples[::2]:
+            self.assertEqual(store.dependents("samples", n), [])
+
+    def test_reads_do_not_wait_for_writers(self):
+        store = self.app.store
+        sample_number = store.create_sample(self.sample_body())["sample_number"]
+        done = threading.Event()
+
+        def read():
+            if self.client.get_sample(sample_number).status_code == 200:
+                done.set()
+
+        # A writer holding the sample does not stop it from being read.
+        with store.locks.hold([("samples", sample_number)]):
+            threading.Thread(target=read).start()
+            self.assertTrue(done.wait(timeout=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
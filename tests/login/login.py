@@ -1,61 +1,43 @@
 import unittest
-from unittest.mock import patch, Mock
 
-import requests
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
 
-LOGIN_URL = "/login"
+BASE_URL = "http://lims.test"
 
 class TestLogin(unittest.TestCase):
-    @patch("requests.post")
-    def test_login_ok(self, mock_post):
-        mock_data = {
-            "data": {
-                "access_token": "jwt",
-                "expires_in": 3600,
-                "user": {
-                    "id": 1,
-                    "name": "Admin",
-                    "roles": ["Role"]
-                }
-            },
-            "data": {
-                "access_token": "jwt",
-                "expires_in": 3600,
-                "user": {
-                    "id": 1,
-                    "name": "Admin",
-                    "roles": ["Role"]
-                }
-            }
-        }
-
-        mock_post.return_value = Mock()
-        mock_post.return_value.json.return_value = mock_data
-        mock_post.return_value.status_code = 200
-
-        response = requests.post(
-            LOGIN_URL,
-            json={"username": "string", "password": "string"}
-        )
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.user = self.client.create_user({
+            "name": "Admin",
+            "username": "admin",
+            "password": "secret",
+            "roles": ["Role"]
+        }).json()["data"]
+
+    def test_login_ok(self):
+        response = self.client.login("admin", "secret")
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body["data"]["expires_in"], 3600)
+        self.assertEqual(body["data"]["user"], {
+            "id": self.user["id"],
+            "name": "Admin",
+            "roles": ["Role"]
+        })
+        self.assertEqual(len(body["data"]["access_token"].split(".")), 3)
         assert response is not None
         assert response.status_code == 200
 
-    @patch("requests.post")
-    def test_login_fail(self, mock_post):
-
-        mock_post.return_value = Mock()
-        mock_post.return_value.status_code = 404
+    def test_login_fail(self):
+        response = self.client.login("admin", "wrong")
 
-        response = requests.post(
-            LOGIN_URL,
-            json={"username": "string", "password": "string"}
-        )
         assert response is not None
         assert response.status_code == 404
 
 if __name__ == "__main__":
     unittest.main()
-
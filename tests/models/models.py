@@ -0,0 +1,96 @@
+import pickle
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.models import Analysis, Client, Result, Sample, Trial, User
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestModels(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        store = self.app.store
+        self.user = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["admin", "lab"]})
+        self.customer = store.create_client({"name": "ACME"})
+        self.sample = store.create_sample({
+            "client_code": self.customer["client_code"],
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 2
+        })
+        self.analysis = store.create_analysis({
+            "id_user": self.user["id"],
+            "sample_number": self.sample["sample_number"],
+            "client_code": self.customer["client_code"],
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico"
+        })
+        self.result = store.create_result({
+            "analysis_number": self.analysis["analysis_number"],
+            "sample_number": self.sample["sample_number"],
+            "id_user": self.user["id"],
+            "client_code": self.customer["client_code"],
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
+        })
+        self.trial = store.create_trial({
+            "analysis_number": self.analysis["analysis_number"],
+            "sample_number": self.sample["sample_number"],
+            "result_number": self.result["result_number"],
+            "emission_date": "2025-12-19T10:00:00Z"
+        })
+
+    def test_round_trip(self):
+        responses = [
+            (User, self.client.get_user(self.user["id"]).json()),
+            (Client, self.client.get_client(self.customer["client_code"]).json()["data"][0]),
+            (Sample, self.client.get_sample(self.sample["sample_number"]).json()["data"]),
+            (Analysis, self.client.get_analysis(self.analysis["analysis_number"]).json()["data"]),
+            (Result, self.client.get_result(self.result["result_number"]).json()["data"]),
+            (Trial, self.client.get_trial(self.trial["trial_number"]).json()["data"]),
+        ]
+        for model, body in responses:
+            record = model.from_json(body)
+            self.assertEqual(record.to_json(), body)
+            self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+            self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_immutable(self):
+        sample = Sample.from_json(self.sample)
+
+        with self.assertRaises(AttributeError):
+            sample.description = "Otra"
+        with self.assertRaises(AttributeError):
+            sample.extra = 1
+        updated = sample.replace(description="Otra")
+
+        self.assertEqual(updated.description, "Otra")
+        self.assertEqual(sample.description, "Muestra de agua")
+
+    def test_interned_strings(self):
+        # Two separate decodes give equal but distinct string objects.
+        first, second = (Analysis.from_json(self.client.get_analysis_list().json()["data"][0]) for _ in range(2))
+
+        self.assertIs(first.client_code, second.client_code)
+        self.assertIs(first.type_analysis, second.type_analysis)
+        self.assertEqual(User.from_json(self.user).roles, ("admin", "lab"))
+
+    def test_missing_and_unknown_fields(self):
+        user = User.from_json({"id": 7, "name": "Luis", "token": "x"})
+
+        self.assertIsNone(user.roles)
+        self.assertEqual(user.to_json(), {"id": 7, "name": "Luis", "username": None, "roles": None})
+        with self.assertRaises(TypeError):
+            User(id=1, token="x")
+
+
+if __name__ == "__main__":
+    unittest.main()
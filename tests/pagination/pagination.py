@@ -0,0 +1,86 @@
+import unittest
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        client_code = self.app.store.create_client({"name": "ACME"})["client_code"]
+        self.sample_numbers = [
+            self.app.store.create_sample({
+                "client_code": client_code,
+                "entry_date": "2025-12-16T10:00:00Z",
+                "description": f"Muestra {i}",
+                "sampling_date": "2025-12-15T08:00:00Z",
+                "observations": "Sin observaciones",
+                "analysis_quantity": 1
+            })["sample_number"]
+            for i in range(250)
+        ]
+
+    # GET /samples?limit=&cursor= – recorrido completo
+    def test_cursor_pages(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            response = self.client.get_samples(limit=100, cursor=cursor)
+            assert response.status_code == 200
+            body = response.json()
+            seen += [sample["sample_number"] for sample in body["data"]]
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, self.sample_numbers)
+        self.assertEqual(pages, 3)
+
+    # Borrados entre páginas no desplazan el cursor
+    def test_delete_between_pages(self):
+        body = self.client.get_samples(limit=10).json()
+        self.client.delete_sample(self.sample_numbers[5])
+        self.client.delete_sample(self.sample_numbers[10])
+
+        body = self.client.get_samples(limit=10, cursor=body["next_cursor"]).json()
+
+        self.assertEqual([s["sample_number"] for s in body["data"]], self.sample_numbers[11:21])
+
+    # GET /samples – limit y cursor inválidos
+    def test_bad_page_parameters(self):
+        assert self.client.get_samples(limit=0).status_code == 400
+        assert self.client.get_samples(limit=5000).status_code == 400
+        assert self.client.get_samples(limit=10, cursor="???").status_code == 400
+
+    # Sin limit – respuesta completa sin next_cursor
+    def test_unpaged_listing(self):
+        body = self.client.get_samples().json()
+
+        self.assertEqual(len(body["data"]), 250)
+        self.assertNotIn("next_cursor", body)
+
+    # Iterador de páginas con prefetch
+    def test_client_pages(self):
+        for prefetch in (True, False):
+            pages = list(self.client.pages(routes.SAMPLES, limit=40, prefetch=prefetch))
+
+            self.assertEqual([len(page) for page in pages], [40] * 6 + [10])
+            self.assertEqual([s["sample_number"] for page in pages for s in page], self.sample_numbers)
+
+    def test_client_pages_clients(self):
+        for i in range(3):
+            self.app.store.create_client({"name": f"Cliente {i}"})
+
+        pages = list(self.client.pages(routes.CLIENTS, limit=2))
+
+        self.assertEqual([[c["name"] for c in page] for page in pages], [["ACME", "Cliente 0"], ["Cliente 1", "Cliente 2"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.ratelimit import RateLimiter, TokenBucket
+from lims.standin import LimsApp
+from lims.standin.quotas import Quotas
+
+BASE_URL = "http://lims.test"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(10, burst=5, clock=self.clock)
+        waits = [bucket.reserve() for _ in range(8)]
+
+        self.assertEqual(waits[:5], [0.0] * 5)
+        self.assertEqual([round(wait, 3) for wait in waits[5:]], [0.1, 0.2, 0.3])
+        self.clock.now = 1.0
+        self.assertTrue(bucket.try_acquire())
+
+    def test_try_acquire_does_not_go_into_debt(self):
+        bucket = TokenBucket(2, burst=1, clock=self.clock)
+
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertAlmostEqual(bucket.available_in(), 0.5)
+
+    def test_penalize_and_recover(self):
+        bucket = TokenBucket(10, burst=10, clock=self.clock, increase=0.1)
+        bucket.penalize(2)
+
+        self.assertEqual(bucket.rate, 5)
+        self.assertAlmostEqual(bucket.reserve(), 2.2)
+        for _ in range(3):
+            bucket.reward()
+        self.assertAlmostEqual(bucket.rate, 8)
+        for _ in range(10):
+            bucket.reward()
+        self.assertEqual(bucket.rate, 10)
+
+    def test_rate_never_drops_below_minimum(self):
+        bucket = TokenBucket(16, clock=self.clock)
+        for _ in range(20):
+            bucket.penalize(0)
+
+        self.assertEqual(bucket.rate, 1)
+
+    def test_shared_across_threads(self):
+        bucket = TokenBucket(200, burst=1)
+        started = time.monotonic()
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(10)]) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(time.monotonic() - started, 49 / 200 - 0.02)
+
+    def test_shared_across_tasks(self):
+        bucket = TokenBucket(200, burst=1)
+
+        async def main():
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(50)))
+
+        started = time.monotonic()
+        asyncio.run(main())
+        self.assertGreaterEqual(time.monotonic() - started, 49 / 200 - 0.02)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.app = LimsApp(quotas=Quotas(rate=5, burst=5, limits={routes.RESULTS: (2, 1)}, clock=self.clock))
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+
+    def _limited_client(self, limiter: RateLimiter) -> LimsClient:
+        client = LimsClient(BASE_URL, ratelimiter=limiter)
+        mount(client.session, self.app, BASE_URL)
+        return client
+
+    # GET /samples – por encima de la cuota responde 429 con Retry-After
+    def test_standin_enforces_quota(self):
+        statuses = [self.client.get_samples().status_code for _ in range(7)]
+
+        self.assertEqual(statuses, [200] * 5 + [429] * 2)
+        throttled = self.client.get_samples()
+        self.assertEqual(throttled.headers["Retry-After"], "1")
+        self.assertEqual(self.app.quotas.rejected, {"anonymous": 3})
+        self.clock.now = 1.0
+        assert self.client.get_samples().status_code == 200
+
+    # GET /results – la cuota por ruta se suma a la global
+    def test_standin_route_quota(self):
+        assert self.client.get_results().status_code == 200
+        assert self.client.get_results().status_code == 429
+        assert self.client.get_samples().status_code == 200
+
+    # Cuotas separadas por usuario autenticado
+    def test_quota_per_user(self):
+        for username in ("ana", "beto"):
+            self.app.store.create_user({"name": username, "username": username, "password": "pw", "roles": ["Admin"]})
+        clients = []
+        for username in ("ana", "beto"):
+            client = LimsClient(BASE_URL)
+            mount(client.session, self.app, BASE_URL)
+            client.authenticate(username, "pw")
+            clients.append(client)
+
+        for client in clients:
+            statuses = [client.get_samples().status_code for _ in range(6)]
+            self.assertEqual(statuses, [200] * 5 + [429])
+        self.assertEqual(sorted(self.app.quotas.rejected.values()), [1, 1])
+        self.assertNotIn("anonymous", self.app.quotas.rejected)
+
+    # Token malformado – cuenta contra la cuota anónima
+    def test_malformed_token_is_anonymous(self):
+        response = self.client.session.get(f"{BASE_URL}/samples", headers={"Authorization": "Bearer a.b.é"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.app.quotas.admitted, 1)
+
+    def test_from_spec(self):
+        quotas = Quotas.from_spec({"*": [10, 20], routes.TRIALS: [2]})
+
+        self.assertEqual((quotas.rate, quotas.burst), (10, 20))
+        self.assertEqual(quotas.limits, {routes.TRIALS: (2, None)})
+
+    def test_limiter_stays_under_quota(self):
+        limiter = RateLimiter(rate=5, burst=5, limits={routes.RESULTS: (2, 1)}, clock=self.clock, sleep=self.clock.sleep)
+        client = self._limited_client(limiter)
+        statuses = [client.get_results().status_code for _ in range(10)]
+
+        self.assertEqual(statuses, [200] * 10)
+        self.assertEqual(limiter.throttled, {})
+        self.assertAlmostEqual(self.clock.now, 4.5)
+
+    def test_limiter_backs_off_on_429(self):
+        limiter = RateLimiter(rate=50, clock=self.clock, sleep=self.clock.sleep)
+        client = self._limited_client(limiter)
+        statuses = [client.get_samples().status_code for _ in range(8)]
+
+        # The burst of 50 overruns the server's quota of 5 once; the 429 halves
+        # the rate and holds the next call back for Retry-After.
+        self.assertEqual(statuses, [200] * 5 + [429] + [200] * 2)
+        self.assertEqual(limiter.throttled, {routes.SAMPLES: 1})
+        self.assertEqual(limiter.global_bucket.rate, 25 + 2 * 50 * 0.02)
+        self.assertGreaterEqual(self.clock.now, 1.0)
+
+    def test_routes_without_limits_pass(self):
+        limiter = RateLimiter(limits={routes.RESULTS: (1, 1)}, clock=self.clock, sleep=self.clock.sleep)
+
+        self.assertEqual(limiter.buckets(routes.SAMPLES), [])
+        for _ in range(3):
+            limiter.wait(routes.SAMPLES)
+        self.assertEqual(self.clock.now, 0)
+
+    def test_wait_async(self):
+        limiter = RateLimiter(rate=100, burst=1)
+
+        async def main():
+            await asyncio.gather(*(limiter.wait_async(routes.TRIALS) for _ in range(11)))
+
+        started = time.monotonic()
+        asyncio.run(main())
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertAlmostEqual(limiter.waited, sum(n / 100 for n in range(1, 11)), delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.aio import AsyncLimsClient
+from lims.models import Trial
+from lims.resolver import TrialResolver
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class CountingApp(LimsApp):
+    def __init__(self):
+        super().__init__()
+        self.paths = []
+
+    def handle(self, method, path, *args, **kwargs):
+        self.paths.append(path)
+        return super().handle(method, path, *args, **kwargs)
+
+
+class TestTrialResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.app = CountingApp()
+        client = LimsClient(BASE_URL, pool_maxsize=8)
+        mount(client.session, self.app, BASE_URL)
+        self.aclient = AsyncLimsClient(client, concurrency=8)
+        store = self.app.store
+        user = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})
+        client_code = store.create_client({"name": "ACME"})["client_code"]
+        self.trials = []
+        for i in range(3):
+            sample = store.create_sample({
+                "client_code": client_code,
+                "entry_date": "2025-12-16T10:00:00Z",
+                "description": f"Muestra {i}",
+                "sampling_date": "2025-12-15T08:00:00Z",
+                "observations": "Sin observaciones",
+                "analysis_quantity": 1
+            })
+            analysis = store.create_analysis({
+                "id_user": user["id"],
+                "sample_number": sample["sample_number"],
+                "client_code": client_code,
+                "sow_date": "2025-12-17T09:00:00Z",
+                "type_analysis": "Microbiológico"
+            })
+            result = store.create_result({
+                "analysis_number": analysis["analysis_number"],
+                "sample_number": sample["sample_number"],
+                "id_user": user["id"],
+                "client_code": client_code,
+                "result_date": "2025-12-18T10:00:00Z",
+                "result": "Apto para consumo"
+            })
+            for _ in range(2):
+                self.trials.append(store.create_trial({
+                    "analysis_number": analysis["analysis_number"],
+                    "sample_number": sample["sample_number"],
+                    "result_number": result["result_number"],
+                    "emission_date": "2025-12-19T10:00:00Z"
+                }))
+        self.resolver = TrialResolver(self.aclient)
+
+    def tearDown(self):
+        self.aclient.close()
+
+    def test_fetches_each_reference_once(self):
+        resolved = asyncio.run(self.resolver.resolve(self.trials))
+
+        # 3 análisis + 3 muestras + 3 resultados + 1 usuario + 1 cliente
+        self.assertEqual(len(self.app.paths), 11)
+        self.assertEqual(len(set(self.app.paths)), 11)
+        self.assertEqual(self.resolver.fetches, 11)
+        self.assertEqual([row.trial.trial_number for row in resolved], [t["trial_number"] for t in self.trials])
+        first = resolved[0]
+        self.assertEqual(first.sample.description, "Muestra 0")
+        self.assertEqual(first.analysis.type_analysis, "Microbiológico")
+        self.assertEqual(first.result.result, "Apto para consumo")
+        self.assertEqual(first.user.username, "ana")
+        self.assertEqual(first.client.name, "ACME")
+
+    def test_memoises_between_calls(self):
+        asyncio.run(self.resolver.resolve(self.trials[:2]))
+        asyncio.run(self.resolver.resolve([Trial.from_json(trial) for trial in self.trials]))
+
+        self.assertEqual(len(self.app.paths), 11)
+
+    # Referencia inexistente – queda en None
+    def test_missing_reference(self):
+        self.app.store.delete_sample(self.trials[0]["sample_number"])
+
+        resolved = asyncio.run(self.resolver.resolve(self.trials[:2]))
+
+        self.assertEqual([row.sample for row in resolved], [None, None])
+        self.assertIsNotNone(resolved[0].result)
+
+
+if __name__ == "__main__":
+    unittest.main()
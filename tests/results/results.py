@@ -1,241 +1,220 @@
 import unittest
-from unittest.mock import patch, Mock
-import requests
+from unittest.mock import patch
 
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
 
-class TestResultsEndpoints(unittest.TestCase):
+BASE_URL = "http://lims.test"
 
-    # Endpoint 24 - POST /results
-    @patch('requests.post')
-    def test_post_results(self, mock_post_data):
-        request_body = {
-            "analysis_number": "int",
-            "sample_number": "int",
-            "id_user": "int",
-            "client_code": "int",
-            "result_date": "DateTime",
-            "result": "string"
-        }
 
-        mock_data = {
-            "data": {
-                "result_number": "int",
-                "analysis_number": "int",
-                "sample_number": "int",
-                "id_user": "int",
-                "client_code": "int",
-                "result_date": "DateTime",
-                "result": "string"
-            }
+class TestResultsEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.client_code = self.client.create_client({"name": "ACME", "contact": "Juan"}).json()["data"][0]["client_code"]
+        self.user_id = self.client.create_user({
+            "name": "Analista",
+            "username": "analista",
+            "password": "secret",
+            "roles": ["Analyst"]
+        }).json()["data"]["id"]
+        self.sample_number = self.client.create_sample({
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Agua de pozo",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 2
+        }).json()["data"]["sample_number"]
+        self.analysis_numbers = [
+            self.client.create_analysis({
+                "id_user": self.user_id,
+                "sample_number": self.sample_number,
+                "client_code": self.client_code,
+                "sow_date": "2025-12-16T10:00:00Z",
+                "type_analysis": type_analysis
+            }).json()["data"]["analysis_number"]
+            for type_analysis in ("Microbiológico", "Fisicoquímico")
+        ]
+        self.result = self.client.create_result(self.result_body(self.analysis_numbers[0])).json()["data"]
+
+    def result_body(self, analysis_number):
+        return {
+            "analysis_number": analysis_number,
+            "sample_number": self.sample_number,
+            "id_user": self.user_id,
+            "client_code": self.client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
         }
 
-        mock_post_data.return_value = Mock()
-        mock_post_data.return_value.json.return_value = mock_data
-        mock_post_data.return_value.status_code = 201  # si tu API devuelve 200, cambialo a 200
+    # Endpoint 24 - POST /results
+    def test_post_results(self):
+        request_body = self.result_body(self.analysis_numbers[1])
 
-        response = requests.post("/results", json=request_body)
+        response = self.client.create_result(request_body)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        expected = {
+            "data": {
+                "result_number": body["data"]["result_number"],
+                "analysis_number": self.analysis_numbers[1],
+                "sample_number": self.sample_number,
+                "id_user": self.user_id,
+                "client_code": self.client_code,
+                "result_date": "2025-12-18T10:00:00Z",
+                "result": "Apto para consumo"
+            }
+        }
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code in (200, 201)
 
     # Endpoint 25 - GET /results
-    @patch('requests.get')
-    def test_get_results_list(self, mock_get_data):
-        mock_data = {
-            "data": [
-                {
-                    "result_number": "int",
-                    "analysis_number": "int",
-                    "sample_number": "int",
-                    "id_user": "int",
-                    "client_code": "int",
-                    "result_date": "DateTime",
-                    "result": "string"
-                }
-            ]
-        }
-
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
+    def test_get_results_list(self):
+        expected = {"data": [self.result]}
 
-        response = requests.get("/results")
+        response = self.client.get_results()
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 26 - GET /results/:result_number
-    @patch('requests.get')
-    def test_get_result_by_number(self, mock_get_data):
-        result_number = 1
+    def test_get_result_by_number(self):
+        result_number = self.result["result_number"]
 
-        mock_data = {
+        expected = {
             "data": {
-                "result_number": "int",
-                "analysis_number": "int",
-                "sample_number": "int",
-                "id_user": "int",
-                "client_code": "int",
-                "result_date": "DateTime",
-                "result": "string"
+                "result_number": result_number,
+                "analysis_number": self.analysis_numbers[0],
+                "sample_number": self.sample_number,
+                "id_user": self.user_id,
+                "client_code": self.client_code,
+                "result_date": "2025-12-18T10:00:00Z",
+                "result": "Apto para consumo"
             }
         }
 
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
-
-        response = requests.get(f"/results/{result_number}")
+        response = self.client.get_result(result_number)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 27 - PATCH /results/:result_number
-    @patch('requests.patch')
-    def test_patch_result_by_number(self, mock_patch_data):
-        result_number = 1
+    def test_patch_result_by_number(self):
+        result_number = self.result["result_number"]
 
         patch_body = {
-            "result": "string",
-            "result_date": "DateTime"
+            "result": "No apto para consumo",
+            "result_date": "2025-12-19T10:00:00Z"
         }
 
-        mock_data = {
+        expected = {
             "data": {
-                "result_number": "int",
-                "analysis_number": "int",
-                "sample_number": "int",
-                "id_user": "int",
-                "client_code": "int",
-                "result_date": "DateTime",
-                "result": "string"
+                "result_number": result_number,
+                "analysis_number": self.analysis_numbers[0],
+                "sample_number": self.sample_number,
+                "id_user": self.user_id,
+                "client_code": self.client_code,
+                "result_date": "2025-12-19T10:00:00Z",
+                "result": "No apto para consumo"
             }
         }
 
-        mock_patch_data.return_value = Mock()
-        mock_patch_data.return_value.json.return_value = mock_data
-        mock_patch_data.return_value.status_code = 200
-
-        response = requests.patch(f"/results/{result_number}", json=patch_body)
+        response = self.client.update_result(result_number, patch_body)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 28 - DELETE /results/:result_number
-    @patch('requests.delete')
-    def test_delete_result_by_number(self, mock_delete_data):
-        result_number = 1
+    def test_delete_result_by_number(self):
+        result_number = self.result["result_number"]
 
-        mock_data = {
+        expected = {
             "data": {
                 "deleted": True,
-                "analysis_number": "int"
+                "analysis_number": self.analysis_numbers[0]
             }
         }
 
-        mock_delete_data.return_value = Mock()
-        mock_delete_data.return_value.json.return_value = mock_data
-        mock_delete_data.return_value.status_code = 200
-
-        response = requests.delete(f"/results/{result_number}")
+        response = self.client.delete_result(result_number)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
+        assert self.client.get_result(result_number).status_code == 404
 
     # ========= SAD PATHS – RESULTS =========
 
     # GET /results – error interno
-    @patch('requests.get')
-    def test_get_results_server_error(self, mock_get):
-        mock_get.return_value = Mock(status_code=500)
-
-        response = requests.get("/results")
+    def test_get_results_server_error(self):
+        with patch.object(self.app.store, "list_results", side_effect=RuntimeError("db down")):
+            response = self.client.get_results()
 
         assert response is not None
         assert response.status_code == 500
 
     # GET /results/:result_number – resultado inexistente
-    @patch('requests.get')
-    def test_get_result_not_found(self, mock_get):
-        mock_get.return_value = Mock(status_code=404)
-
-        response = requests.get("/results/999")
+    def test_get_result_not_found(self):
+        response = self.client.get_result(999)
 
         assert response is not None
         assert response.status_code == 404
 
     # POST /results – body inválido
-    @patch('requests.post')
-    def test_post_results_bad_request(self, mock_post):
-        mock_post.return_value = Mock(status_code=400)
-
-        response = requests.post("/results", json={})
+    def test_post_results_bad_request(self):
+        response = self.client.create_result({})
 
         assert response is not None
         assert response.status_code == 400
 
     # POST /results – conflicto por duplicado
-    @patch('requests.post')
-    def test_post_results_conflict(self, mock_post):
-        mock_post.return_value = Mock(status_code=409)
-
-        response = requests.post("/results", json={})
+    def test_post_results_conflict(self):
+        response = self.client.create_result(self.result_body(self.analysis_numbers[0]))
 
         assert response is not None
         assert response.status_code == 409
 
     # PATCH /results/:result_number – resultado inexistente
-    @patch('requests.patch')
-    def test_patch_result_not_found(self, mock_patch):
-        mock_patch.return_value = Mock(status_code=404)
-
-        response = requests.patch("/results/999", json={"result": "string"})
+    def test_patch_result_not_found(self):
+        response = self.client.update_result(999, {"result": "Apto para consumo"})
 
         assert response is not None
         assert response.status_code == 404
 
     # PATCH /results/:result_number – body inválido
-    @patch('requests.patch')
-    def test_patch_result_bad_request(self, mock_patch):
-        mock_patch.return_value = Mock(status_code=400)
-
-        response = requests.patch("/results/1", json={})
+    def test_patch_result_bad_request(self):
+        response = self.client.update_result(self.result["result_number"], {})
 
         assert response is not None
         assert response.status_code == 400
 
     # DELETE /results/:result_number – resultado inexistente
-    @patch('requests.delete')
-    def test_delete_result_not_found(self, mock_delete):
-        mock_delete.return_value = Mock(status_code=404)
-
-        response = requests.delete("/results/999")
+    def test_delete_result_not_found(self):
+        response = self.client.delete_result(999)
 
         assert response is not None
         assert response.status_code == 404
 
     # DELETE /results/:result_number – error interno
-    @patch('requests.delete')
-    def test_delete_result_server_error(self, mock_delete):
-        mock_delete.return_value = Mock(status_code=500)
-
-        response = requests.delete("/results/1")
+    def test_delete_result_server_error(self):
+        with patch.object(self.app.store, "delete_result", side_effect=RuntimeError("db down")):
+            response = self.client.delete_result(self.result["result_number"])
 
         assert response is not None
         assert response.status_code == 500
-
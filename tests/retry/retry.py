@@ -0,0 +1,152 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from lims import LimsClient, routes
+from lims.adapter import mount
+from lims.retry import Retrier, RetryBudget, RetryPolicy
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+
+
+class TestRetry(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.sleeps = []
+        self.retrier = Retrier(sleep=self.sleeps.append, rng=random.Random(7))
+        self.client = LimsClient(BASE_URL, retrier=self.retrier)
+        mount(self.client.session, self.app, BASE_URL)
+        client_code = self.app.store.create_client({"name": "ACME"})["client_code"]
+        self.sample = {
+            "client_code": client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 2
+        }
+
+    # GET /samples – 500 transitorio, se recupera al reintentar
+    def test_get_samples_recovers(self):
+        with patch.object(self.app.store, "list_samples", side_effect=[RuntimeError("db down"), []]):
+            response = self.client.get_samples()
+
+        assert response.status_code == 200
+        self.assertEqual(len(self.sleeps), 1)
+        stats = self.retrier.stats[routes.SAMPLES].as_dict()
+        self.assertEqual(stats, {"calls": 1, "retries": 1, "recovered": 1, "exhausted": 0, "budget_denied": 0})
+
+    # GET /users – 500 persistente, se agotan los intentos
+    def test_get_users_exhausted(self):
+        with patch.object(self.app.store, "list_users", side_effect=RuntimeError("db down")) as list_users:
+            response = self.client.get_users()
+
+        assert response.status_code == 500
+        self.assertEqual(list_users.call_count, 3)
+        self.assertEqual(self.retrier.stats[routes.USERS].exhausted, 1)
+
+    # DELETE /results/{n} – 500 transitorio
+    def test_delete_result_retried(self):
+        # The user, sample and analysis the result refers to.
+        store = self.app.store
+        store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})
+        store.create_sample(self.sample)
+        store.create_analysis({
+            "id_user": 1,
+            "sample_number": 1,
+            "client_code": self.sample["client_code"],
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico"
+        })
+        result_number = self.app.store.create_result({
+            "analysis_number": 1,
+            "sample_number": 1,
+            "id_user": 1,
+            "client_code": self.sample["client_code"],
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
+        })["result_number"]
+        delete_result = self.app.store.delete_result
+        failures = [RuntimeError("db down")]
+
+        def flaky(number):
+            if failures:
+                raise failures.pop()
+            return delete_result(number)
+
+        with patch.object(self.app.store, "delete_result", side_effect=flaky):
+            response = self.client.delete_result(result_number)
+
+        assert response.status_code == 200
+        self.assertEqual(self.retrier.stats[routes.RESULT].retries, 1)
+
+    # POST /samples – sin Idempotency-Key no se reintenta
+    def test_post_needs_idempotency_key(self):
+        self.client.idempotency_keys = False
+        with patch.object(self.app.store, "create_sample", side_effect=RuntimeError("db down")) as create_sample:
+            assert self.client.create_sample(self.sample).status_code == 500
+            self.assertEqual(create_sample.call_count, 1)
+
+            response = self.client._request("POST", routes.SAMPLES, json=self.sample, headers={"Idempotency-Key": "k-1"})
+            assert response.status_code == 500
+            self.assertEqual(create_sample.call_count, 4)
+
+            self.client.idempotency_keys = True
+            assert self.client.create_sample(self.sample).status_code == 500
+            self.assertEqual(create_sample.call_count, 7)
+
+    # POST /users y /clients – el servidor no deduplica, no llevan clave ni se reintentan
+    def test_non_deduplicated_creates_not_retried(self):
+        with patch.object(self.app.store, "create_user", side_effect=RuntimeError("db down")) as create_user:
+            response = self.client.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": []})
+
+        assert response.status_code == 500
+        self.assertEqual(create_user.call_count, 1)
+        self.assertNotIn("Idempotency-Key", response.request.headers)
+        with patch.object(self.app.store, "create_client", side_effect=RuntimeError("db down")) as create_client:
+            assert self.client.create_client({"name": "Globex"}).status_code == 500
+        self.assertEqual(create_client.call_count, 1)
+
+    def test_connection_errors_retried(self):
+        request = self.client.session.request
+        outcomes = [requests.ConnectionError("connection reset")]
+
+        def flaky(*args, **kwargs):
+            if outcomes:
+                raise outcomes.pop()
+            return request(*args, **kwargs)
+
+        with patch.object(self.client.session, "request", side_effect=flaky):
+            assert self.client.get_clients().status_code == 200
+
+        with patch.object(self.client.session, "request", side_effect=requests.ConnectionError("refused")):
+            with self.assertRaises(requests.ConnectionError):
+                self.client.get_clients()
+
+    def test_budget_limits_retries(self):
+        self.retrier.budget = RetryBudget(ratio=0, min_per_second=0, capacity=1)
+        with patch.object(self.app.store, "list_samples", side_effect=RuntimeError("db down")) as list_samples:
+            self.client.get_samples()
+            self.client.get_samples()
+
+        self.assertEqual(list_samples.call_count, 3)
+        stats = self.retrier.stats[routes.SAMPLES]
+        self.assertEqual((stats.retries, stats.budget_denied), (1, 2))
+
+    def test_per_route_policy(self):
+        self.retrier.policies[routes.SAMPLES] = RetryPolicy(max_attempts=5, base=0.01, cap=0.5)
+        with patch.object(self.app.store, "list_samples", side_effect=RuntimeError("db down")):
+            self.client.get_samples()
+
+        self.assertEqual(len(self.sleeps), 4)
+        self.assertTrue(all(0.01 <= delay <= 0.5 for delay in self.sleeps))
+        for previous, delay in zip([0.01] + self.sleeps, self.sleeps):
+            self.assertLessEqual(delay, previous * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,216 +1,182 @@
 import unittest
-from unittest.mock import patch, Mock
-import requests
+from unittest.mock import patch
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
 
 
 class TestSamplesEndpoints(unittest.TestCase):
 
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.client_code = self.client.create_client({"name": "ACME", "contact": "Juan"}).json()["data"][0]["client_code"]
+        self.sample = self.client.create_sample({
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Agua de pozo",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 2
+        }).json()["data"]
+
     # Endpoint 14 - POST /samples
-    @patch('requests.post')
-    def test_post_sample(self, mock_post_data):
+    def test_post_sample(self):
         request_body = {
-            "client_code": "string",
-            "entry_date": "DateTime",
-            "description": "string",
-            "sampling_date": "DateTime",
-            "observations": "string",
-            "analysis_quantity": "int"
+            "client_code": self.client_code,
+            "entry_date": "2025-12-17T10:00:00Z",
+            "description": "Leche cruda",
+            "sampling_date": "2025-12-17T07:30:00Z",
+            "observations": "Refrigerada",
+            "analysis_quantity": 3
         }
 
-        mock_data = {
+        response = self.client.create_sample(request_body)
+        body = response.json()
+
+        expected = {
             "data": {
-                "sample_number": "int",
-                "client_code": "string",
-                "entry_date": "DateTime",
-                "description": "string",
-                "sampling_date": "DateTime",
-                "observations": "string",
-                "analysis_quantity": "int"
+                "sample_number": body["data"]["sample_number"],
+                **request_body
             }
         }
-
-        mock_post_data.return_value = Mock()
-        mock_post_data.return_value.json.return_value = mock_data
-        mock_post_data.return_value.status_code = 201  # o 200 según implementación
-
-        response = requests.post("/samples", json=request_body)
-        body = response.json()
-
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code in (200, 201)
 
     # Endpoint 15 - GET /samples
-    @patch('requests.get')
-    def test_get_samples(self, mock_get_data):
-        mock_data = {
-            "data": {
-                "sample_number": "int",
-                "client_code": "string",
-                "entry_date": "DateTime",
-                "description": "string",
-                "sampling_date": "DateTime",
-                "observations": "string",
-                "analysis_quantity": "int"
-            }
-        }
+    def test_get_samples(self):
+        # GET /samples devuelve la lista completa dentro de data
+        expected = {"data": [self.sample]}
 
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
-
-        response = requests.get("/samples")
+        response = self.client.get_samples()
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 16 - GET /samples/:sample_number
-    @patch('requests.get')
-    def test_get_sample_by_number(self, mock_get_data):
-        sample_number = 1
+    def test_get_sample_by_number(self):
+        sample_number = self.sample["sample_number"]
 
-        mock_data = {
+        expected = {
             "data": {
-                "sample_number": "int",
-                "client_code": "string",
-                "entry_date": "DateTime",
-                "description": "string",
-                "sampling_date": "DateTime",
-                "observations": "string",
-                "analysis_quantity": "int"
+                "sample_number": sample_number,
+                "client_code": self.client_code,
+                "entry_date": "2025-12-16T10:00:00Z",
+                "description": "Agua de pozo",
+                "sampling_date": "2025-12-15T08:00:00Z",
+                "observations": "Sin observaciones",
+                "analysis_quantity": 2
             }
         }
 
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
-
-        response = requests.get(f"/samples/{sample_number}")
+        response = self.client.get_sample(sample_number)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 17 - PATCH /samples/:sample_number
-    @patch('requests.patch')
-    def test_patch_sample(self, mock_patch_data):
-        sample_number = 1
+    def test_patch_sample(self):
+        sample_number = self.sample["sample_number"]
 
         patch_body = {
-            "description": "string",
-            "observations": "string"
+            "description": "Agua de red",
+            "observations": "Turbidez leve"
         }
 
-        mock_data = {
+        expected = {
             "data": {
-                "sample_number": "int",
-                "client_code": "string",
-                "entry_date": "DateTime",
-                "description": "string",
-                "sampling_date": "DateTime",
-                "observations": "string",
-                "analysis_quantity": "int"
+                "sample_number": sample_number,
+                "client_code": self.client_code,
+                "entry_date": "2025-12-16T10:00:00Z",
+                "description": "Agua de red",
+                "sampling_date": "2025-12-15T08:00:00Z",
+                "observations": "Turbidez leve",
+                "analysis_quantity": 2
             }
         }
 
-        mock_patch_data.return_value = Mock()
-        mock_patch_data.return_value.json.return_value = mock_data
-        mock_patch_data.return_value.status_code = 200
-
-        response = requests.patch(f"/samples/{sample_number}", json=patch_body)
+        response = self.client.update_sample(sample_number, patch_body)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 18 - DELETE /samples/:sample_number
-    @patch('requests.delete')
-    def test_delete_sample(self, mock_delete_data):
-        sample_number = 1
+    def test_delete_sample(self):
+        sample_number = self.sample["sample_number"]
 
-        mock_data = {
+        expected = {
             "deleted": True,
-            "sample_number": "int"
+            "sample_number": sample_number
         }
 
-        mock_delete_data.return_value = Mock()
-        mock_delete_data.return_value.json.return_value = mock_data
-        mock_delete_data.return_value.status_code = 200
-
-        response = requests.delete(f"/samples/{sample_number}")
+        response = self.client.delete_sample(sample_number)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
+        assert self.client.get_sample(sample_number).status_code == 404
 
     # ========= SAD PATHS – SAMPLES =========
 
     # POST /samples – body inválido
-    @patch("requests.post")
-    def test_post_sample_bad_request(self, mock_post):
-        mock_post.return_value = Mock(status_code=400)
-
-        response = requests.post("/samples", json={})
+    def test_post_sample_bad_request(self):
+        response = self.client.create_sample({})
 
         assert response is not None
         assert response.status_code == 400
 
     # POST /samples – conflicto (por ejemplo cliente inexistente o duplicado)
-    @patch("requests.post")
-    def test_post_sample_conflict(self, mock_post):
-        mock_post.return_value = Mock(status_code=409)
-
-        response = requests.post("/samples", json={})
+    def test_post_sample_conflict(self):
+        response = self.client.create_sample({**self.sample_body(), "client_code": "C-999"})
 
         assert response is not None
         assert response.status_code == 409
 
     # GET /samples – error interno
-    @patch("requests.get")
-    def test_get_samples_server_error(self, mock_get):
-        mock_get.return_value = Mock(status_code=500)
-
-        response = requests.get("/samples")
+    def test_get_samples_server_error(self):
+        with patch.object(self.app.store, "list_samples", side_effect=RuntimeError("db down")):
+            response = self.client.get_samples()
 
         assert response is not None
         assert response.status_code == 500
 
     # GET /samples/:sample_number – no encontrado
-    @patch("requests.get")
-    def test_get_sample_not_found(self, mock_get):
-        mock_get.return_value = Mock(status_code=404)
-
-        response = requests.get("/samples/999")
+    def test_get_sample_not_found(self):
+        response = self.client.get_sample(999)
 
         assert response is not None
         assert response.status_code == 404
 
     # PATCH /samples/:sample_number – body inválido
-    @patch("requests.patch")
-    def test_patch_sample_bad_request(self, mock_patch):
-        mock_patch.return_value = Mock(status_code=400)
-
-        response = requests.patch("/samples/1", json={})
+    def test_patch_sample_bad_request(self):
+        response = self.client.update_sample(self.sample["sample_number"], {})
 
         assert response is not None
         assert response.status_code == 400
 
     # DELETE /samples/:sample_number – no encontrado
-    @patch("requests.delete")
-    def test_delete_sample_not_found(self, mock_delete):
-        mock_delete.return_value = Mock(status_code=404)
-
-        response = requests.delete("/samples/999")
+    def test_delete_sample_not_found(self):
+        response = self.client.delete_sample(999)
 
         assert response is not None
         assert response.status_code == 404
+
+    def sample_body(self):
+        return {k: v for k, v in self.sample.items() if k != "sample_number"}
@@ -0,0 +1,155 @@
+import unittest
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
+from lims.standin.indexes import InvertedIndex, tokenize
+
+BASE_URL = "http://lims.test"
+
+
+class TestInvertedIndex(unittest.TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Análisis MICROBIOLÓGICO, lote 7-B"), ["analisis", "microbiologico", "lote", "7", "b"])
+
+    def test_ranking(self):
+        index = InvertedIndex()
+        index.add(1, "agua potable")
+        index.add(2, "agua turbia, agua")
+        index.add(3, "leche entera")
+
+        self.assertEqual([key for key, _ in index.search("agua")], [2, 1])
+        # The rarer word weighs more than the common one.
+        self.assertEqual(index.search("agua leche", limit=1)[0][0], 3)
+        self.assertEqual(index.search("cerveza"), [])
+
+    def test_prefix(self):
+        index = InvertedIndex()
+        index.add(1, "microbiológico")
+        index.add(2, "micronutrientes")
+        index.add(3, "mineral")
+
+        self.assertEqual(index.expand("micro"), ["microbiologico", "micronutrientes"])
+        self.assertEqual(sorted(key for key, _ in index.search("micro*")), [1, 2])
+        self.assertEqual(index.search("micro"), [])
+
+    def test_replace_and_remove(self):
+        index = InvertedIndex()
+        index.add(1, "agua potable")
+        index.add(1, "leche")
+        index.remove(2)
+
+        self.assertEqual(index.search("agua"), [])
+        self.assertEqual(index.expand("pot"), [])
+        index.remove(1)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.search("leche"), [])
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        store = self.app.store
+        client_code = store.create_client({"name": "ACME"})["client_code"]
+        user_id = store.create_user({"name": "Ana", "username": "ana", "password": "pw", "roles": ["lab"]})["id"]
+        descriptions = [
+            ("Muestra de agua potable", "Sin observaciones"),
+            ("Muestra de leche", "Envase abierto, posible contaminación"),
+            ("Agua de pozo", "Turbidez visible en el agua"),
+        ]
+        self.samples = [
+            store.create_sample({
+                "client_code": client_code,
+                "entry_date": "2025-12-16T10:00:00Z",
+                "description": description,
+                "sampling_date": "2025-12-15T08:00:00Z",
+                "observations": observations,
+                "analysis_quantity": 1
+            })
+            for description, observations in descriptions
+        ]
+        analysis = store.create_analysis({
+            "id_user": user_id,
+            "sample_number": self.samples[1]["sample_number"],
+            "client_code": client_code,
+            "sow_date": "2025-12-17T09:00:00Z",
+            "type_analysis": "Microbiológico"
+        })
+        self.result = store.create_result({
+            "analysis_number": analysis["analysis_number"],
+            "sample_number": self.samples[1]["sample_number"],
+            "id_user": user_id,
+            "client_code": client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "No apto: contaminación bacteriana"
+        })
+
+    def _hits(self, response):
+        assert response.status_code == 200
+        return [(hit["type"], hit["record"].get("result_number") or hit["record"]["sample_number"])
+                for hit in response.json()["data"]]
+
+    # GET /search?q= – descripción y observaciones, mejor coincidencia primero
+    def test_search_samples(self):
+        hits = self._hits(self.client.search("agua"))
+
+        self.assertEqual(hits, [("samples", 3), ("samples", 1)])
+
+    # GET /search?q= – muestras y resultados juntos, sin tildes
+    def test_search_across_types(self):
+        hits = self._hits(self.client.search("contaminacion"))
+
+        self.assertEqual(sorted(hits), [("results", self.result["result_number"]), ("samples", 2)])
+        self.assertEqual(self._hits(self.client.search("contaminacion", types=["results"])),
+                         [("results", self.result["result_number"])])
+
+    # GET /search?q=bacter* – consulta por prefijo
+    def test_prefix_query(self):
+        self.assertEqual(self._hits(self.client.search("bacter*")), [("results", self.result["result_number"])])
+
+    def test_limit(self):
+        response = self.client.search("muestra agua leche", limit=2)
+
+        self.assertEqual(len(response.json()["data"]), 2)
+        scores = [hit["score"] for hit in response.json()["data"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    # POST, PATCH y DELETE mantienen el índice al día
+    def test_index_follows_writes(self):
+        created = self.client.create_sample({
+            "client_code": self.samples[0]["client_code"],
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Queso fresco",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        }).json()["data"]
+        self.assertEqual(self._hits(self.client.search("queso")), [("samples", created["sample_number"])])
+
+        assert self.client.update_sample(created["sample_number"], {"description": "Yogur"}).status_code == 200
+        self.assertEqual(self._hits(self.client.search("queso")), [])
+        self.assertEqual(self._hits(self.client.search("yogur")), [("samples", created["sample_number"])])
+
+        assert self.client.update_result(self.result["result_number"], {"result": "Apto"}).status_code == 200
+        assert self.client.delete_sample(3).status_code == 200
+        self.assertEqual(self._hits(self.client.search("bacteriana pozo")), [])
+
+    # GET /search sin q
+    def test_missing_query(self):
+        self.assertEqual(self.client.search("  ").status_code, 400)
+
+    # GET /search?in=trials – colección no indexada
+    def test_unknown_type(self):
+        self.assertEqual(self.client.search("agua", types=["trials"]).status_code, 400)
+
+    # GET /search?limit=0
+    def test_bad_limit(self):
+        self.assertEqual(self.client.search("agua", limit=0).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import requests
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.aio import AsyncLimsClient
+from lims.singleflight import AsyncSingleFlight, SingleFlight
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
+WAITERS = 8
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        self.flight = SingleFlight()
+        self.client = LimsClient(BASE_URL, pool_maxsize=WAITERS, singleflight=self.flight)
+        mount(self.client.session, self.app, BASE_URL)
+        client_code = self.app.store.create_client({"name": "ACME"})["client_code"]
+        self.sample_number = self.app.store.create_sample({
+            "client_code": client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Muestra de agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        })["sample_number"]
+        self.release = threading.Event()
+        self.store_calls = 0
+
+    def _blocking(self, original):
+        def get(*args):
+            self.store_calls += 1
+            self.release.wait(5)
+            return original(*args)
+        return get
+
+    def _burst(self, call):
+        """Run ``call`` on WAITERS threads, releasing the store once all of them joined the flight."""
+        with ThreadPoolExecutor(WAITERS) as pool:
+            futures = [pool.submit(call) for _ in range(WAITERS)]
+            deadline = time.monotonic() + 5
+            while self.flight.calls < WAITERS and time.monotonic() < deadline:
+                time.sleep(0.001)
+            self.release.set()
+            return [future.exception() or future.result() for future in futures]
+
+    # GET /samples/{n} concurrentes – una sola petición
+    def test_collapses_identical_gets(self):
+        get_sample = self._blocking(self.app.store.get_sample)
+        with patch.object(self.app.store, "get_sample", side_effect=get_sample):
+            responses = self._burst(lambda: self.client.get_sample(self.sample_number))
+
+        self.assertEqual(self.store_calls, 1)
+        self.assertEqual({response.status_code for response in responses}, {200})
+        self.assertEqual(self.flight.stats(), {"calls": WAITERS, "executions": 1, "collapsed": WAITERS - 1})
+
+    # Un error de red llega a todos los que esperaban
+    def test_errors_reach_every_waiter(self):
+        def fail(*args, **kwargs):
+            self.store_calls += 1
+            self.release.wait(5)
+            raise requests.ConnectionError("connection reset")
+
+        with patch.object(self.client.session, "request", side_effect=fail):
+            outcomes = self._burst(lambda: self.client.get_sample(self.sample_number))
+
+        self.assertEqual(self.store_calls, 1)
+        self.assertTrue(all(isinstance(outcome, requests.ConnectionError) for outcome in outcomes))
+
+    def test_distinct_keys_and_writes_not_collapsed(self):
+        self.client.get_sample(self.sample_number)
+        self.client.get_sample(self.sample_number)
+        self.client.get_samples(limit=1)
+        self.client.update_sample(self.sample_number, {"description": "Otra"})
+
+        self.assertEqual(self.flight.stats(), {"calls": 3, "executions": 3, "collapsed": 0})
+
+    def test_async_collapses_identical_gets(self):
+        aclient = AsyncLimsClient(self.client, concurrency=WAITERS, singleflight=AsyncSingleFlight())
+        get_sample = self._blocking(self.app.store.get_sample)
+
+        async def burst():
+            calls = [aclient.get_sample(self.sample_number) for _ in range(WAITERS)]
+            other = aclient.get_sample(999)
+            asyncio.get_running_loop().call_later(0.05, self.release.set)
+            return await asyncio.gather(*calls, other)
+
+        with patch.object(self.app.store, "get_sample", side_effect=get_sample):
+            responses = asyncio.run(burst())
+        aclient.close()
+
+        self.assertEqual(self.store_calls, 2)
+        self.assertEqual([response.status_code for response in responses], [200] * WAITERS + [404])
+        self.assertEqual(aclient.singleflight.collapsed, WAITERS - 1)
+
+    def test_async_errors_reach_every_waiter(self):
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def fail():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def burst():
+            return await asyncio.gather(*(flight.do("key", fail) for _ in range(4)), return_exceptions=True)
+
+        outcomes = asyncio.run(burst())
+
+        self.assertEqual(len(runs), 1)
+        self.assertTrue(all(isinstance(outcome, ValueError) for outcome in outcomes))
+        self.assertEqual(flight.collapsed, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
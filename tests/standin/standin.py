@@ -0,0 +1,53 @@
+import unittest
+
+from lims import LimsClient
+from lims.standin import StandInServer
+
+
+class TestStandInServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.client = LimsClient(self.server.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    # POST /users + POST /login sobre HTTP real
+    def test_create_user_and_login(self):
+        request_body = {"name": "Admin", "username": "admin", "password": "secret", "roles": ["Admin"]}
+
+        response = self.client.create_user(request_body)
+        assert response.status_code == 201
+        user = response.json()["data"]
+
+        response = self.client.login("admin", "secret")
+        body = response.json()
+
+        assert response.status_code == 200
+        self.assertEqual(body["data"]["user"], {"id": user["id"], "name": "Admin", "roles": ["Admin"]})
+        self.assertEqual(body["data"]["expires_in"], 3600)
+        self.assertEqual(len(body["data"]["access_token"].split(".")), 3)
+
+    # POST /samples – cliente inexistente
+    def test_post_sample_unknown_client(self):
+        response = self.client.create_sample({
+            "client_code": "C-404",
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Agua",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        })
+
+        assert response.status_code == 409
+
+    # Ruta desconocida y método no permitido
+    def test_unknown_route_and_method(self):
+        assert self.client.session.get(self.server.url + "/nope").status_code == 404
+        assert self.client.session.put(self.server.url + "/samples").status_code == 405
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp, StandInServer
+from lims.streaming import DataStream
+
+BASE_URL = "http://lims.test"
+
+
+def seed_samples(app, count):
+    client_code = app.store.create_client({"name": "ACME"})["client_code"]
+    for i in range(count):
+        app.store.create_sample({
+            "client_code": client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": f"Muestra {i}",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        })
+
+
+class TestDataStream(unittest.TestCase):
+
+    def test_any_chunking(self):
+        document = {
+            "total": 4,
+            "data": [{"a": 1, "s": "ñandú ✓"}, {"b": [1, 2, {"c": None}]}, -1.5e3, 12345],
+            "next_cursor": "abc"
+        }
+        raw = json.dumps(document, ensure_ascii=False).encode()
+
+        for size in (1, 2, 3, 7, len(raw)):
+            stream = DataStream(raw[i:i + size] for i in range(0, len(raw), size))
+
+            self.assertEqual(list(stream), document["data"])
+            self.assertEqual(stream.meta, {"total": 4, "next_cursor": "abc"})
+
+    def test_truncated_body(self):
+        with self.assertRaises(ValueError):
+            list(DataStream([b'{"data":[{"a":1},']))
+
+
+class TestStreamingClient(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LimsApp()
+        seed_samples(self.app, 500)
+
+    # GET /samples en streaming – proceso
+    def test_iter_samples_in_process(self):
+        client = LimsClient(BASE_URL)
+        mount(client.session, self.app, BASE_URL)
+
+        descriptions = [sample["description"] for sample in client.iter_samples()]
+
+        self.assertEqual(descriptions, [f"Muestra {i}" for i in range(500)])
+
+    # GET /samples en streaming – HTTP chunked
+    def test_iter_samples_over_http(self):
+        with StandInServer(self.app) as server, LimsClient(server.url) as client:
+            self.assertEqual(sum(1 for _ in client.iter_samples()), 500)
+            self.assertEqual(len(client.get_samples().json()["data"]), 500)
+
+    # GET /samples – error interno
+    def test_iter_samples_server_error(self):
+        client = LimsClient(BASE_URL)
+        mount(client.session, self.app, BASE_URL)
+
+        with patch.object(self.app.store, "list_samples", side_effect=RuntimeError("db down")):
+            with self.assertRaises(requests.HTTPError):
+                list(client.iter_samples())
+
+
+if __name__ == "__main__":
+    unittest.main()
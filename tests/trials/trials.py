@@ -1,219 +1,199 @@
 import unittest
-from unittest.mock import patch, Mock
-import requests
+from unittest.mock import patch
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
 
 
 class TestTrialsEndpoints(unittest.TestCase):
 
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.client_code = self.client.create_client({"name": "ACME", "contact": "Juan"}).json()["data"][0]["client_code"]
+        self.user_id = self.client.create_user({
+            "name": "Analista",
+            "username": "analista",
+            "password": "secret",
+            "roles": ["Analyst"]
+        }).json()["data"]["id"]
+        self.sample_number = self.client.create_sample({
+            "client_code": self.client_code,
+            "entry_date": "2025-12-16T10:00:00Z",
+            "description": "Agua de pozo",
+            "sampling_date": "2025-12-15T08:00:00Z",
+            "observations": "Sin observaciones",
+            "analysis_quantity": 1
+        }).json()["data"]["sample_number"]
+        self.analysis_number = self.client.create_analysis({
+            "id_user": self.user_id,
+            "sample_number": self.sample_number,
+            "client_code": self.client_code,
+            "sow_date": "2025-12-16T10:00:00Z",
+            "type_analysis": "Microbiológico"
+        }).json()["data"]["analysis_number"]
+        self.result_number = self.client.create_result({
+            "analysis_number": self.analysis_number,
+            "sample_number": self.sample_number,
+            "id_user": self.user_id,
+            "client_code": self.client_code,
+            "result_date": "2025-12-18T10:00:00Z",
+            "result": "Apto para consumo"
+        }).json()["data"]["result_number"]
+        self.trial = self.client.create_trial(self.trial_body()).json()["data"]
+
+    def trial_body(self):
+        return {
+            "analysis_number": self.analysis_number,
+            "sample_number": self.sample_number,
+            "result_number": self.result_number,
+            "emission_date": "2025-12-19T10:00:00Z"
+        }
+
     # Endpoint 29 - GET /trials
-    @patch('requests.get')
-    def test_get_trials(self, mock_get_data):
-        mock_data = {
+    def test_get_trials(self):
+        expected = {
             "data": [
                 {
-                    "trial_number": "int",
-                    "analysis_number": "int",
-                    "sample_number": "int",
-                    "result_number": "int",
-                    "id_role": "int",
-                    "id_user": "int",
-                    "client_code": "int",
-                    "emission_date": "DateTime"
+                    "trial_number": self.trial["trial_number"],
+                    "analysis_number": self.analysis_number,
+                    "sample_number": self.sample_number,
+                    "result_number": self.result_number,
+                    "id_role": 1,
+                    "id_user": self.user_id,
+                    "client_code": self.client_code,
+                    "emission_date": "2025-12-19T10:00:00Z"
                 }
             ]
         }
 
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
-
-        response = requests.get("/trials")
+        response = self.client.get_trials()
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 30 - POST /trials
-    @patch('requests.post')
-    def test_post_trial(self, mock_post_data):
-        request_body = {
-            "analysis_number": "int",
-            "sample_number": "int",
-            "result_number": "int",
-            "emission_date": "DateTime"
-        }
+    def test_post_trial(self):
+        request_body = {**self.trial_body(), "emission_date": "2025-12-20T10:00:00Z"}
+
+        response = self.client.create_trial(request_body)
+        body = response.json()
 
-        mock_data = {
+        expected = {
             "data": {
-                "trial_number": "int",
-                "analysis_number": "int",
-                "sample_number": "int",
-                "result_number": "int",
-                "id_role": "int",
-                "id_user": "int",
-                "client_code": "int",
-                "emission_date": "DateTime"
+                "trial_number": body["data"]["trial_number"],
+                "analysis_number": self.analysis_number,
+                "sample_number": self.sample_number,
+                "result_number": self.result_number,
+                "id_role": 1,
+                "id_user": self.user_id,
+                "client_code": self.client_code,
+                "emission_date": "2025-12-20T10:00:00Z"
             }
         }
-
-        mock_post_data.return_value = Mock()
-        mock_post_data.return_value.json.return_value = mock_data
-        mock_post_data.return_value.status_code = 201  # o 200 según API
-
-        response = requests.post("/trials", json=request_body)
-        body = response.json()
-
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code in (200, 201)
 
     # Endpoint 31 - GET /trials/:trial_number
-    @patch('requests.get')
-    def test_get_trial_by_number(self, mock_get_data):
-        trial_number = 1
+    def test_get_trial_by_number(self):
+        trial_number = self.trial["trial_number"]
 
-        mock_data = {
-            "data": {
-                "trial_number": "int",
-                "analysis_number": "int",
-                "sample_number": "int",
-                "result_number": "int",
-                "id_role": "int",
-                "id_user": "int",
-                "client_code": "int",
-                "emission_date": "DateTime"
-            }
-        }
-
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
+        expected = {"data": self.trial}
 
-        response = requests.get(f"/trials/{trial_number}")
+        response = self.client.get_trial(trial_number)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 32 - PATCH /trials/:trial_number
-    @patch('requests.patch')
-    def test_patch_trial(self, mock_patch_data):
-        trial_number = 1
+    def test_patch_trial(self):
+        trial_number = self.trial["trial_number"]
 
         patch_body = {
-            "emission_date": "DateTime"
+            "emission_date": "2025-12-22T10:00:00Z"
         }
 
-        mock_data = {
-            "data": {
-                "trial_number": "int",
-                "analysis_number": "int",
-                "sample_number": "int",
-                "result_number": "int",
-                "id_role": "int",
-                "id_user": "int",
-                "client_code": "int",
-                "emission_date": "DateTime"
-            }
-        }
-
-        mock_patch_data.return_value = Mock()
-        mock_patch_data.return_value.json.return_value = mock_data
-        mock_patch_data.return_value.status_code = 200
+        expected = {"data": {**self.trial, "emission_date": "2025-12-22T10:00:00Z"}}
 
-        response = requests.patch(f"/trials/{trial_number}", json=patch_body)
+        response = self.client.update_trial(trial_number, patch_body)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 33 - DELETE /trials/:trial_number
-    @patch('requests.delete')
-    def test_delete_trial(self, mock_delete_data):
-        trial_number = 1
+    def test_delete_trial(self):
+        trial_number = self.trial["trial_number"]
 
-        mock_data = {
+        expected = {
             "deleted": True,
-            "trial_number": "string"
+            "trial_number": trial_number
         }
 
-        mock_delete_data.return_value = Mock()
-        mock_delete_data.return_value.json.return_value = mock_data
-        mock_delete_data.return_value.status_code = 200
-
-        response = requests.delete(f"/trials/{trial_number}")
+        response = self.client.delete_trial(trial_number)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
+        assert self.client.get_trial(trial_number).status_code == 404
 
     # ========= SAD PATHS – TRIALS =========
 
     # GET /trials – error interno
-    @patch("requests.get")
-    def test_get_trials_server_error(self, mock_get):
-        mock_get.return_value = Mock(status_code=500)
-
-        response = requests.get("/trials")
+    def test_get_trials_server_error(self):
+        with patch.object(self.app.store, "list_trials", side_effect=RuntimeError("db down")):
+            response = self.client.get_trials()
 
         assert response is not None
         assert response.status_code == 500
 
     # POST /trials – body inválido
-    @patch("requests.post")
-    def test_post_trial_bad_request(self, mock_post):
-        mock_post.return_value = Mock(status_code=400)
-
-        response = requests.post("/trials", json={})
+    def test_post_trial_bad_request(self):
+        response = self.client.create_trial({})
 
         assert response is not None
         assert response.status_code == 400
 
     # POST /trials – conflicto (relaciones inexistentes)
-    @patch("requests.post")
-    def test_post_trial_conflict(self, mock_post):
-        mock_post.return_value = Mock(status_code=409)
-
-        response = requests.post("/trials", json={})
+    def test_post_trial_conflict(self):
+        response = self.client.create_trial({**self.trial_body(), "result_number": 999})
 
         assert response is not None
         assert response.status_code == 409
 
     # GET /trials/:trial_number – no encontrado
-    @patch("requests.get")
-    def test_get_trial_not_found(self, mock_get):
-        mock_get.return_value = Mock(status_code=404)
-
-        response = requests.get("/trials/999")
+    def test_get_trial_not_found(self):
+        response = self.client.get_trial(999)
 
         assert response is not None
         assert response.status_code == 404
 
     # PATCH /trials/:trial_number – body inválido
-    @patch("requests.patch")
-    def test_patch_trial_bad_request(self, mock_patch):
-        mock_patch.return_value = Mock(status_code=400)
-
-        response = requests.patch("/trials/1", json={})
+    def test_patch_trial_bad_request(self):
+        response = self.client.update_trial(self.trial["trial_number"], {})
 
         assert response is not None
         assert response.status_code == 400
 
     # DELETE /trials/:trial_number – no encontrado
-    @patch("requests.delete")
-    def test_delete_trial_not_found(self, mock_delete):
-        mock_delete.return_value = Mock(status_code=404)
-
-        response = requests.delete("/trials/999")
+    def test_delete_trial_not_found(self):
+        response = self.client.delete_trial(999)
 
         assert response is not None
         assert response.status_code == 404
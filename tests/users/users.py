@@ -1,232 +1,202 @@
 import unittest
-from unittest.mock import patch, Mock
-import requests
+from unittest.mock import patch
+
+from lims import LimsClient
+from lims.adapter import mount
+from lims.standin import LimsApp
+
+BASE_URL = "http://lims.test"
 
 
 class TestUsersEndpoints(unittest.TestCase):
 
+    def setUp(self):
+        self.app = LimsApp()
+        self.client = LimsClient(BASE_URL)
+        mount(self.client.session, self.app, BASE_URL)
+        self.user = self.client.create_user({
+            "name": "Admin",
+            "username": "admin",
+            "password": "secret",
+            "roles": ["Admin"]
+        }).json()["data"]
+
     # Endpoint 2 - GET /users
-    @patch('requests.get')
-    def test_get_users(self, mock_get_data):
-        mock_data = {
+    def test_get_users(self):
+        expected = {
             "data": [
                 {
-                    "username": "string",
-                    "id": "int",
-                    "name": "string",
-                    "roles": ["Role"]
+                    "username": "admin",
+                    "id": self.user["id"],
+                    "name": "Admin",
+                    "roles": ["Admin"]
                 }
             ]
         }
 
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
-
-        response = requests.get("/users")
+        response = self.client.get_users()
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 3 - POST /users
-    @patch('requests.post')
-    def test_post_user(self, mock_post_data):
+    def test_post_user(self):
         request_body = {
-            "name": "string",
-            "username": "string",
-            "password": "string",
-            "roles": ["Role"]
+            "name": "Analista",
+            "username": "analista",
+            "password": "secret",
+            "roles": ["Analyst"]
         }
 
-        mock_data = {
+        response = self.client.create_user(request_body)
+        body = response.json()
+
+        expected = {
             "data": {
-                "id": "int",
-                "name": "string",
-                "roles": ["Role"],
-                "username": "string"
+                "id": body["data"]["id"],
+                "name": "Analista",
+                "roles": ["Analyst"],
+                "username": "analista"
             }
         }
-
-        mock_post_data.return_value = Mock()
-        mock_post_data.return_value.json.return_value = mock_data
-        mock_post_data.return_value.status_code = 201  # o 200 según tu API
-
-        response = requests.post("/users", json=request_body)
-        body = response.json()
-
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code in (200, 201)
 
     # Endpoint 4 - GET /users/:id
-    @patch('requests.get')
-    def test_get_user_by_id(self, mock_get_data):
-        user_id = 1
-
-        mock_data = {
-            "id": "int",
-            "name": "string",
-            "roles": ["Role"],
-            "username": "string"
+    def test_get_user_by_id(self):
+        user_id = self.user["id"]
+
+        expected = {
+            "id": user_id,
+            "name": "Admin",
+            "roles": ["Admin"],
+            "username": "admin"
         }
 
-        mock_get_data.return_value = Mock()
-        mock_get_data.return_value.json.return_value = mock_data
-        mock_get_data.return_value.status_code = 200
-
-        response = requests.get(f"/users/{user_id}")
+        response = self.client.get_user(user_id)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 5 - PATCH /users/:id
-    @patch('requests.patch')
-    def test_patch_user(self, mock_patch_data):
-        user_id = 1
+    def test_patch_user(self):
+        user_id = self.user["id"]
 
         patch_body = {
-            "name": "string",
-            "username": "string",
-            "roles": ["Role"]
+            "name": "Administrador",
+            "username": "root",
+            "roles": ["Admin"]
         }
 
-        mock_data = {
+        expected = {
             "data": {
-                "id": "int",
-                "name": "string",
-                "roles": ["Role"],
-                "username": "string"
+                "id": user_id,
+                "name": "Administrador",
+                "roles": ["Admin"],
+                "username": "root"
             }
         }
 
-        mock_patch_data.return_value = Mock()
-        mock_patch_data.return_value.json.return_value = mock_data
-        mock_patch_data.return_value.status_code = 200
-
-        response = requests.patch(f"/users/{user_id}", json=patch_body)
+        response = self.client.update_user(user_id, patch_body)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 6 - PATCH /users/:id (asignar roles)
-    @patch('requests.patch')
-    def test_patch_user_roles(self, mock_patch_data):
-        user_id = 1
+    def test_patch_user_roles(self):
+        user_id = self.user["id"]
 
-        patch_body = {
-            "roles": ["Role"]
-        }
-
-        mock_data = {
+        expected = {
             "data": {
-                "id": "int",
-                "name": "string",
-                "roles": ["Role"],
-                "username": "string"
+                "id": user_id,
+                "name": "Admin",
+                "roles": ["Admin", "Analyst"],
+                "username": "admin"
             }
         }
 
-        mock_patch_data.return_value = Mock()
-        mock_patch_data.return_value.json.return_value = mock_data
-        mock_patch_data.return_value.status_code = 200
-
-        response = requests.patch(f"/users/{user_id}", json=patch_body)
+        response = self.client.set_user_roles(user_id, ["Admin", "Analyst"])
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
 
     # Endpoint 7 - DELETE /users/:id
-    @patch('requests.delete')
-    def test_delete_user(self, mock_delete_data):
-        user_id = 1
+    def test_delete_user(self):
+        user_id = self.user["id"]
 
-        mock_data = {
+        expected = {
             "deleted": True,
-            "id": "int"
+            "id": user_id
         }
 
-        mock_delete_data.return_value = Mock()
-        mock_delete_data.return_value.json.return_value = mock_data
-        mock_delete_data.return_value.status_code = 200
-
-        response = requests.delete(f"/users/{user_id}")
+        response = self.client.delete_user(user_id)
         body = response.json()
 
-        self.assertEqual(body, mock_data)
+        self.assertEqual(body, expected)
 
         assert response is not None
         assert response.status_code == 200
+        assert self.client.get_user(user_id).status_code == 404
 
 
     # GET /users – error interno
-    @patch("requests.get")
-    def test_get_users_server_error(self, mock_get):
-        mock_get.return_value = Mock(status_code=500)
-
-        response = requests.get("/users")
+    def test_get_users_server_error(self):
+        with patch.object(self.app.store, "list_users", side_effect=RuntimeError("db down")):
+            response = self.client.get_users()
 
         assert response is not None
         assert response.status_code == 500
 
     # POST /users – body inválido
-    @patch("requests.post")
-    def test_post_user_bad_request(self, mock_post):
-        mock_post.return_value = Mock(status_code=400)
-
-        response = requests.post("/users", json={})
+    def test_post_user_bad_request(self):
+        response = self.client.create_user({})
 
         assert response is not None
         assert response.status_code == 400
 
     # POST /users – username duplicado
-    @patch("requests.post")
-    def test_post_user_conflict(self, mock_post):
-        mock_post.return_value = Mock(status_code=409)
-
-        response = requests.post("/users", json={})
+    def test_post_user_conflict(self):
+        response = self.client.create_user({
+            "name": "Otro",
+            "username": "admin",
+            "password": "secret",
+            "roles": ["Role"]
+        })
 
         assert response is not None
         assert response.status_code == 409
 
     # GET /users/:id – usuario inexistente
-    @patch("requests.get")
-    def test_get_user_not_found(self, mock_get):
-        mock_get.return_value = Mock(status_code=404)
-
-        response = requests.get("/users/999")
+    def test_get_user_not_found(self):
+        response = self.client.get_user(999)
 
         assert response is not None
         assert response.status_code == 404
 
     # PATCH /users/:id – body inválido
-    @patch("requests.patch")
-    def test_patch_user_bad_request(self, mock_patch):
-        mock_patch.return_value = Mock(status_code=400)
-
-        response = requests.patch("/users/1", json={})
+    def test_patch_user_bad_request(self):
+        response = self.client.update_user(self.user["id"], {})
 
         assert response is not None
         assert response.status_code == 400
 
     # DELETE /users/:id – usuario inexistente
-    @patch("requests.delete")
-    def test_delete_user_not_found(self, mock_delete):
-        mock_delete.return_value = Mock(status_code=404)
-
-        response = requests.delete("/users/999")
+    def test_delete_user_not_found(self):
+        response = self.client.delete_user(999)
 
         assert response is not None
         assert response.status_code == 404